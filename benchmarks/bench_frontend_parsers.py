@@ -0,0 +1,102 @@
+"""Page record extraction time per frontend parser backend.
+
+Usage: python benchmarks/bench_frontend_parsers.py <source_dir> [--repeat N] [--scale N]
+
+Every .xhtml/.html page under the source directory is read once up
+front; only record extraction is timed. `bs4-sweeps` is the former
+extractor (a BeautifulSoup tree plus five find_all sweeps); the others
+are the single-pass backends of utils.page_parser. `--scale` repeats each
+page's body to simulate large facelets. Records are compared against the
+bs4-sweeps output.
+"""
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from bs4 import BeautifulSoup
+from utils.page_parser import available_parsers, collect_page
+from utils.source_scanner import scan_source_tree
+
+def sweep_record(content):
+    """Page record built like the extractor used to: one tree, five find_all sweeps"""
+    soup = BeautifulSoup(content, 'html.parser')
+    record = {"forms": [], "templates": [], "resources": []}
+    for form in soup.find_all('form'):
+        fields = []
+        for field in form.find_all(['input', 'select', 'textarea']):
+            if field.get('name', ''):
+                fields.append({
+                    "name": field.get('name', ''),
+                    "type": field.get('type', field.name),
+                    "validation": {
+                        'required': field.get('required') is not None,
+                        'pattern': field.get('pattern'),
+                        'minlength': field.get('minlength'),
+                        'maxlength': field.get('maxlength')
+                    }
+                })
+        record["forms"].append({
+            "id": form.get('id', 'unnamed_form'),
+            "action": form.get('action', ''),
+            "method": form.get('method', 'get'),
+            "fields": fields
+        })
+    record["templates"] = [t.get('template') for t in soup.find_all(attrs={'template': True}) if t.get('template')]
+    record["resources"] += [('css', e.get('href')) for e in soup.find_all('link', rel='stylesheet') if e.get('href')]
+    record["resources"] += [('javascript', e.get('src')) for e in soup.find_all('script', src=True) if e.get('src')]
+    record["resources"] += [('image', e.get('src')) for e in soup.find_all('img', src=True) if e.get('src')]
+    return record
+
+def scaled(content, scale):
+    """Repeat the page between its first and last tag to make it larger"""
+    if scale <= 1:
+        return content
+    body_start = content.find('>') + 1
+    body_end = content.rfind('<')
+    if body_start <= 0 or body_end <= body_start:
+        return content * scale
+    return content[:body_start] + content[body_start:body_end] * scale + content[body_end:]
+
+def best_time(extract, pages, repeat):
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for content in pages:
+            extract(content)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("source_dir")
+    parser.add_argument("--repeat", type=int, default=5, help="runs per backend; the fastest is reported")
+    parser.add_argument("--scale", type=int, default=1, help="repeat each page body this many times")
+    args = parser.parse_args()
+
+    pages = []
+    for source_file in scan_source_tree(args.source_dir).pages:
+        with open(source_file.path, 'r', encoding='utf-8') as f:
+            pages.append(scaled(f.read(), args.scale))
+    if not pages:
+        print(f"No pages under {args.source_dir}")
+        return
+
+    megabytes = sum(len(content.encode('utf-8')) for content in pages) / (1024 * 1024)
+    expected = [sweep_record(content) for content in pages]
+    engines = {"bs4-sweeps": sweep_record}
+    engines.update({name: (lambda content, name=name: collect_page(content, name)) for name in available_parsers()})
+
+    print(f"📊 {len(pages)} pages, {megabytes:.2f} MB, best of {args.repeat} runs")
+    baseline = None
+    for name, extract in engines.items():
+        agrees = sum(extract(content) == record for content, record in zip(pages, expected))
+        seconds = best_time(extract, pages, args.repeat)
+        baseline = baseline or seconds
+        print(f"  • {name:<11} {seconds / len(pages) * 1000:8.3f} ms/page  {megabytes / seconds:7.2f} MB/s  "
+              f"{baseline / seconds:4.1f}x  records match: {agrees}/{len(pages)}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,110 @@
+"""Per-file cost of collecting Java facts: separate tree iterations vs one shared visitor walk.
+
+Usage: python benchmarks/bench_java_visitor.py <source_dir> [--repeat N]
+
+Files are parsed once up front; only fact collection is timed. The
+baseline iterates each tree the way the extractors used to (four passes
+for components, one for entities); the visitor engine collects both in a
+single walk. Both must produce identical records.
+"""
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import javalang
+from java_knowledge_extractor import ComponentVisitor, controller_action
+from database_knowledge_extractor import EntityVisitor
+from utils.java_parser import iter_compilation_units
+from utils.java_visitor import walk_compilation_unit
+from utils.source_scanner import scan_source_tree
+
+def iterated_records(file_path, tree):
+    """Component and entity records built with one iteration of the tree per fact group"""
+    package = None
+    class_name = None
+    annotations = set()
+    field_types = set()
+    actions = []
+    invocations = []
+    parameter_types = []
+
+    for _, node in tree:
+        if isinstance(node, javalang.tree.PackageDeclaration):
+            package = node.name
+    for _, node in tree:
+        if isinstance(node, javalang.tree.ClassDeclaration):
+            class_name = node.name
+            annotations.update(annotation.name for annotation in node.annotations)
+        if isinstance(node, javalang.tree.FieldDeclaration):
+            if node.declarators and hasattr(node.type, 'name'):
+                field_types.add(node.type.name)
+    for _, node in tree:
+        if isinstance(node, javalang.tree.MethodDeclaration):
+            action = controller_action(node)
+            if action:
+                actions.append(action)
+    for _, node in tree:
+        if isinstance(node, javalang.tree.MethodInvocation) and node.qualifier:
+            invocations.append(node.qualifier)
+        if isinstance(node, javalang.tree.MethodDeclaration):
+            parameter_types.extend(param.type.name for param in node.parameters if hasattr(param.type, 'name'))
+
+    entities = EntityVisitor(file_path)
+    for _, node in tree:
+        if isinstance(node, javalang.tree.ClassDeclaration):
+            entities.visit_ClassDeclaration(node)
+
+    components = {
+        "file_path": file_path,
+        "package": package,
+        "class_name": class_name,
+        "annotations": sorted(annotations),
+        "field_types": sorted(field_types),
+        "actions": actions,
+        "invocations": invocations,
+        "parameter_types": parameter_types
+    }
+    return components, entities.record()
+
+def visitor_records(file_path, tree):
+    """Component and entity records built in one shared walk"""
+    visitors = [ComponentVisitor(file_path), EntityVisitor(file_path)]
+    walk_compilation_unit(tree, visitors)
+    return tuple(visitor.record() for visitor in visitors)
+
+def time_per_file(collect, trees, repeat):
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for file_path, tree in trees:
+            collect(file_path, tree)
+        best = min(best, time.perf_counter() - start)
+    return best / len(trees)
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("source_dir")
+    parser.add_argument("--repeat", type=int, default=5, help="runs per engine; the fastest is reported")
+    args = parser.parse_args()
+
+    trees = list(iter_compilation_units(scan_source_tree(args.source_dir).java_files))
+    if not trees:
+        print(f"No parseable Java files under {args.source_dir}")
+        return
+
+    for file_path, tree in trees:
+        if iterated_records(file_path, tree) != visitor_records(file_path, tree):
+            raise SystemExit(f"❌ Records differ for {file_path}")
+
+    iterated = time_per_file(iterated_records, trees, args.repeat)
+    visited = time_per_file(visitor_records, trees, args.repeat)
+    print(f"📊 {len(trees)} Java files, best of {args.repeat} runs")
+    print(f"  • Separate iterations: {iterated * 1000:.3f} ms/file")
+    print(f"  • Shared visitor walk: {visited * 1000:.3f} ms/file")
+    print(f"  • Speedup: {iterated / visited:.1f}x")
+
+if __name__ == "__main__":
+    main()
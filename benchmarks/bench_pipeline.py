@@ -0,0 +1,240 @@
+"""End-to-end timings of the extraction, planning and conversion entry points on synthetic projects.
+
+Usage: python benchmarks/bench_pipeline.py [--sizes 10,50,200] [--repeat N] [--llm-latency SECONDS]
+       [--embed] [--json FILE] [--baseline FILE] [--tolerance FRACTION]
+
+For each size a project with that many entities is generated with
+benchmarks/generate_project.py and run through `parse_java_files`
+(components and entities), `extract_frontend_info`, `DocumentExtractor`
+(reading; with `--embed` also embedding into a vector store),
+`MigrationPlanner.analyze_project` and `MigrationManager.convert_project`.
+Graph stages run against a fresh embedded `memory://` store, and the
+converters use a stub LLM that echoes the source after an optional
+delay, so nothing needs Neo4j or an API key. The fastest of `--repeat`
+runs is reported per stage, with the growth exponent between the
+smallest and largest size (1.0 is linear).
+
+`--json` appends the results to a JSON lines file. `--baseline` compares
+against the last record of such a file and exits non-zero if a stage got
+slower than the tolerance allows.
+"""
+import argparse
+import contextlib
+import json
+import math
+import os
+import shutil
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import java_knowledge_extractor
+import database_knowledge_extractor
+from java_knowledge_extractor import KnowledgeGraphBuilder
+from database_knowledge_extractor import DatabaseExtractor
+from frontend_knowledge_extractor import FrontendExtractor, extract_frontend_info
+from document_knowledge_extractor import DocumentExtractor
+from planner import MigrationPlanner
+from migration_manager import MigrationManager
+from utils.graph_store import open_graph_store
+from benchmarks.generate_project import generate_project
+
+STAGES = ["java_components", "java_entities", "frontend", "documents", "planner", "convert"]
+
+# Stages slower than the baseline by less than this are noise, whatever the tolerance
+MIN_REGRESSION_SECONDS = 0.05
+
+class StubResponse:
+    def __init__(self, text):
+        self.text = text
+
+class StubLLM:
+    """Stands in for the Gemini model: answers each prompt with the source it contains, after `latency` seconds"""
+
+    def __init__(self, latency=0.0):
+        self.latency = latency
+        self.calls = 0
+
+    def generate_content(self, prompt):
+        self.calls += 1
+        if self.latency:
+            time.sleep(self.latency)
+        return StubResponse(f"```java\n// Converted by the benchmark stub\n{prompt}\n```")
+
+def run_stages(project_dir, work_dir, uri, llm_latency, embed, verbose):
+    """Run every stage once against a fresh graph store; return {stage: seconds}"""
+    timings = {}
+    devnull = open(os.devnull, "w")
+
+    def quiet():
+        return contextlib.nullcontext() if verbose else contextlib.redirect_stdout(devnull)
+
+    @contextlib.contextmanager
+    def stage(name):
+        with quiet():
+            start = time.perf_counter()
+            yield
+            timings[name] = time.perf_counter() - start
+
+    # Keep the in-memory graph alive between stages
+    store = open_graph_store(uri)
+    try:
+        builder = KnowledgeGraphBuilder(uri=uri)
+        with stage("java_components"):
+            java_knowledge_extractor.parse_java_files(project_dir, builder)
+            builder.flush()
+        with quiet():
+            builder.close()
+
+        db_extractor = DatabaseExtractor(uri, None, None)
+        with stage("java_entities"):
+            database_knowledge_extractor.parse_java_files(project_dir, db_extractor)
+            db_extractor.flush()
+        with quiet():
+            db_extractor.close()
+
+        frontend_extractor = FrontendExtractor(uri, None, None)
+        with stage("frontend"):
+            extract_frontend_info(project_dir, frontend_extractor)
+            frontend_extractor.flush()
+        with quiet():
+            frontend_extractor.close()
+
+        doc_extractor = DocumentExtractor(persist_directory=os.path.join(work_dir, "vector_db"))
+        with stage("documents"):
+            documents = doc_extractor.process_documents(project_dir)
+            if embed:
+                doc_extractor.create_vector_store(documents)
+        with quiet():
+            doc_extractor.close()
+
+        planner = MigrationPlanner(uri, None, None)
+        with stage("planner"):
+            planner.analyze_project()
+        planner.close()
+
+        # Converters read file metadata from the store NEO4J_URI names
+        previous_uri = os.environ.get("NEO4J_URI")
+        os.environ["NEO4J_URI"] = uri
+        try:
+            manager = MigrationManager("", model=StubLLM(llm_latency))
+            with stage("convert"):
+                manager.convert_project(project_dir, os.path.join(work_dir, "converted"))
+        finally:
+            if previous_uri is None:
+                del os.environ["NEO4J_URI"]
+            else:
+                os.environ["NEO4J_URI"] = previous_uri
+    finally:
+        store.close()
+        devnull.close()
+    return timings
+
+def benchmark_size(size, repeat, llm_latency, embed, verbose):
+    """Best time per stage over `repeat` runs on a generated project of `size` entities"""
+    root = tempfile.mkdtemp(prefix=f"bench-pipeline-{size}-")
+    try:
+        project_dir = os.path.join(root, "project")
+        counts = generate_project(project_dir, entities=size)
+        best = {}
+        for run in range(repeat):
+            work_dir = os.path.join(root, f"run-{run}")
+            timings = run_stages(project_dir, work_dir, f"memory://bench-pipeline-{size}-{run}",
+                                 llm_latency, embed, verbose)
+            for name, seconds in timings.items():
+                best[name] = min(best.get(name, float("inf")), seconds)
+        return counts, best
+    finally:
+        shutil.rmtree(root, ignore_errors=True)
+
+def growth_exponent(small_size, small_seconds, large_size, large_seconds):
+    """Slope of time over size on a log-log scale between two sizes"""
+    if small_size == large_size or small_seconds <= 0 or large_seconds <= 0:
+        return None
+    return math.log(large_seconds / small_seconds) / math.log(large_size / small_size)
+
+def load_baseline(path):
+    """Last record of a JSON lines results file, or None"""
+    if not os.path.exists(path):
+        return None
+    record = None
+    with open(path, encoding="utf-8") as f:
+        for line in f:
+            if line.strip():
+                record = json.loads(line)
+    return record
+
+def regressions(results, baseline, tolerance):
+    """[(size, stage, baseline seconds, seconds)] of stages slower than the baseline allows"""
+    slower = []
+    for size, result in results.items():
+        previous = baseline["results"].get(size)
+        if not previous:
+            continue
+        for name, seconds in result["stages"].items():
+            before = previous["stages"].get(name)
+            if before is None:
+                continue
+            if seconds > before * (1 + tolerance) and seconds - before > MIN_REGRESSION_SECONDS:
+                slower.append((size, name, before, seconds))
+    return slower
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", default="10,50,200", help="comma-separated entity counts")
+    parser.add_argument("--repeat", type=int, default=3, help="runs per size; the fastest is reported per stage")
+    parser.add_argument("--llm-latency", type=float, default=0.0, help="seconds the stub LLM takes per call")
+    parser.add_argument("--embed", action="store_true", help="also embed documents into a vector store")
+    parser.add_argument("--json", help="append the results to this JSON lines file")
+    parser.add_argument("--baseline", help="JSON lines file whose last record the results are compared to")
+    parser.add_argument("--tolerance", type=float, default=0.25, help="allowed slowdown against the baseline")
+    parser.add_argument("--verbose", action="store_true", help="show the output of each stage")
+    args = parser.parse_args()
+
+    sizes = sorted({int(size) for size in args.sizes.split(",")})
+    results = {}
+    for size in sizes:
+        try:
+            counts, best = benchmark_size(size, args.repeat, args.llm_latency, args.embed, args.verbose)
+        except ImportError as e:
+            print(f"⚠️  {size} entities: {str(e)}")
+            continue
+        files = sum(counts.values())
+        results[str(size)] = {"files": counts, "stages": {name: round(seconds, 4) for name, seconds in best.items()}}
+        print(f"\n📐 {size} entities ({files} files)")
+        for name in STAGES:
+            if name in best:
+                print(f"    {name:<16} {best[name]:8.3f}s  {best[name] / files * 1000:7.2f} ms/file")
+
+    measured = [size for size in sizes if str(size) in results]
+    if len(measured) > 1:
+        small, large = measured[0], measured[-1]
+        print(f"\n📈 Growth from {small} to {large} entities (1.0 is linear):")
+        for name in STAGES:
+            exponent = growth_exponent(small, results[str(small)]["stages"].get(name, 0),
+                                       large, results[str(large)]["stages"].get(name, 0))
+            if exponent is not None:
+                print(f"    {name:<16} {exponent:5.2f}")
+
+    if args.json:
+        with open(args.json, "a", encoding="utf-8") as f:
+            f.write(json.dumps({"timestamp": time.time(), "repeat": args.repeat,
+                                "llm_latency": args.llm_latency, "results": results}) + "\n")
+
+    if args.baseline:
+        baseline = load_baseline(args.baseline)
+        if baseline is None:
+            print(f"\n⚠️  No baseline in {args.baseline}")
+            return
+        slower = regressions(results, baseline, args.tolerance)
+        if slower:
+            print(f"\n❌ Slower than the baseline by more than {args.tolerance:.0%}:")
+            for size, name, before, seconds in slower:
+                print(f"    {size} entities, {name}: {before:.3f}s → {seconds:.3f}s")
+            sys.exit(1)
+        print(f"\n✅ Within {args.tolerance:.0%} of the baseline")
+
+if __name__ == "__main__":
+    main()
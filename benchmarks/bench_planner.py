@@ -0,0 +1,166 @@
+"""Migration report generation on a large synthetic knowledge graph, with reads issued one at a time or concurrently.
+
+Usage: python benchmarks/bench_planner.py [--components 1000,10000] [--workers 1,7] [--read-latency SECONDS]
+       [--repeat N] [--uri URI] [--json FILE]
+
+For each size a graph is written through the extractors' own builders:
+that many components (a quarter each controllers, services, repositories
+and models) wired with dependencies and controller actions, a JPA entity,
+table and columns per model, and a page with a form, fields, a template
+and resources per controller. `MigrationPlanner.analyze_project` then runs
+with each `--workers` setting (PLANNER_READ_WORKERS), and the fastest of
+`--repeat` runs is reported with the number of graph reads.
+
+The embedded store answers a read in process, and the planner reads it
+one read at a time. `--read-latency` adds a delay to each read, outside
+the store's lock, to stand in for the round trip to a Neo4j server, and
+lets the planner overlap reads as it does for Neo4j. `--uri` runs against a Neo4j server instead; the
+graph is written to it first, so use an empty database.
+"""
+import argparse
+import contextlib
+import json
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from java_knowledge_extractor import KnowledgeGraphBuilder
+from database_knowledge_extractor import DatabaseExtractor
+from frontend_knowledge_extractor import FrontendExtractor
+from planner import MigrationPlanner, REPORT_READS
+from utils.graph_store import GraphStore, open_graph_store
+
+FIELDS = 6
+ACTIONS = 4
+
+class LatentStore(GraphStore):
+    """Wraps a graph store, counting reads and delaying each by `latency` seconds"""
+
+    def __init__(self, store, latency=0.0):
+        self.store = store
+        # With a round trip to wait for, the planner overlaps reads as for Neo4j
+        self.embedded = store.embedded and not latency
+        self.latency = latency
+        self.reads = 0
+
+    def _read(self, name, params):
+        self.reads += 1
+        if self.latency:
+            time.sleep(self.latency)
+        return self.store.read(name, **params)
+
+    def close(self):
+        self.store.close()
+
+def build_graph(uri, user, password, components):
+    """Write a synthetic graph of `components` components and what hangs off them"""
+    per_type = max(1, components // 4)
+    builder = KnowledgeGraphBuilder(uri=uri, user=user, password=password)
+    database = DatabaseExtractor(uri, user, password)
+    frontend = FrontendExtractor(uri, user, password)
+    try:
+        database.add_database_info("postgresql", "src/main/resources/META-INF/persistence.xml")
+        for i in range(per_type):
+            model, repository, service, controller = f"Model{i}", f"Repository{i}", f"Service{i}", f"Resource{i}"
+            builder.add_model(model, "org.example.model", f"src/main/java/org/example/model/{model}.java")
+            builder.add_repository(repository, "org.example.data", f"src/main/java/org/example/data/{repository}.java")
+            builder.add_service(service, "org.example.service", f"src/main/java/org/example/service/{service}.java")
+            builder.add_jakarta_controller(controller, "org.example.rest",
+                                           f"src/main/java/org/example/rest/{controller}.java")
+            builder.add_dependency(repository, model)
+            builder.add_dependency(service, repository)
+            builder.add_dependency(controller, service)
+            if i:
+                builder.add_dependency(service, f"Service{i - 1}")
+                builder.add_dependency(model, f"Model{i - 1}")
+            for action in range(ACTIONS):
+                builder.add_controller_action(controller, f"{controller}Action{action}", "GET", f"/{i}/{action}")
+
+            table = f"model_{i}"
+            variables = [{"name": f"field{f}", "type": "String", "annotations": ["Column"]} for f in range(FIELDS)]
+            methods = [{"name": f"getField{f}", "return_type": "String", "parameters": [], "annotations": []}
+                       for f in range(FIELDS)]
+            database.add_table(table, model)
+            database.add_model_details(model, table, variables, methods)
+            for f in range(FIELDS):
+                database.add_column(table, f"{table}_field{f}", "VARCHAR(255)", ["Column", "NotNull"] if f else ["Id"])
+
+            page, form = f"page{i}", f"form{i}"
+            frontend.add_page(page, f"src/main/webapp/{page}.xhtml", "xhtml")
+            frontend.add_template_relationship(page, "default")
+            frontend.add_form(page, form, f"#{{{controller}.save}}", "post")
+            for f in range(FIELDS):
+                frontend.add_form_field(page, form, f"{form}_field{f}", "text", {"required": "true"})
+            frontend.add_resource_dependency(page, "css", "resources/css/screen.css")
+            frontend.add_resource_dependency(page, "js", f"resources/js/{page}.js")
+    finally:
+        with contextlib.redirect_stdout(open(os.devnull, "w")):
+            builder.close()
+            database.close()
+            frontend.close()
+    return per_type * 4
+
+def time_report(uri, user, password, workers, latency, repeat):
+    """(fastest seconds, reads, report lines) of analyze_project over `repeat` runs"""
+    best = float("inf")
+    reads = 0
+    report = []
+    for _ in range(repeat):
+        planner = MigrationPlanner(uri, user, password, read_workers=workers)
+        planner.store = LatentStore(planner.store, latency)
+        try:
+            start = time.perf_counter()
+            report = planner.analyze_project()
+            best = min(best, time.perf_counter() - start)
+            reads = planner.store.reads
+        finally:
+            planner.close()
+    return best, reads, report
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--components", default="1000,10000", help="comma-separated component counts")
+    parser.add_argument("--workers", default=f"1,{len(REPORT_READS)}",
+                        help="comma-separated read worker counts to compare")
+    parser.add_argument("--read-latency", type=float, default=0.0, help="seconds added to each graph read")
+    parser.add_argument("--repeat", type=int, default=3, help="runs per setting; the fastest is reported")
+    parser.add_argument("--uri", default="", help="Neo4j URI to run against instead of an embedded store")
+    parser.add_argument("--json", help="append the results to this JSON lines file")
+    args = parser.parse_args()
+
+    user = os.getenv("NEO4J_USER", "neo4j")
+    password = os.getenv("NEO4J_PASSWORD", "password")
+    workers = [int(count) for count in args.workers.split(",")]
+    results = {}
+    for size in sorted({int(count) for count in args.components.split(",")}):
+        uri = args.uri or f"memory://bench-planner-{size}"
+        # Keep an embedded graph alive between the planner runs
+        store = open_graph_store(uri, user, password)
+        try:
+            start = time.perf_counter()
+            components = build_graph(uri, user, password, size)
+            print(f"\n📐 {components} components (graph written in {time.perf_counter() - start:.2f}s)")
+
+            timings = {}
+            reports = {}
+            for count in workers:
+                seconds, reads, report = time_report(uri, user, password, count, args.read_latency, args.repeat)
+                timings[count] = {"seconds": round(seconds, 4), "reads": reads}
+                reports[count] = report
+                speedup = timings[workers[0]]["seconds"] / seconds if seconds else 0.0
+                print(f"    {count:>2} read workers  {seconds:8.3f}s  {reads} reads  {speedup:5.2f}x")
+            if len({tuple(report) for report in reports.values()}) > 1:
+                print("⚠️  Reports differ between worker counts")
+            results[str(components)] = timings
+        finally:
+            store.close()
+
+    if args.json:
+        with open(args.json, "a", encoding="utf-8") as f:
+            f.write(json.dumps({"timestamp": time.time(), "read_latency": args.read_latency,
+                                "repeat": args.repeat, "results": results}) + "\n")
+
+if __name__ == "__main__":
+    main()
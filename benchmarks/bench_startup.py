@@ -0,0 +1,94 @@
+"""Startup time of each entry point, measured with `python -X importtime` in a fresh interpreter.
+
+Usage: python benchmarks/bench_startup.py [--repeat N] [--budget SECONDS] [--top N] [--json FILE]
+
+Reports wall time and total import time per entry point plus its
+heaviest direct imports, and exits non-zero if any entry point's best
+wall time exceeds the budget. `--json` appends the results to a file so
+startup time can be tracked across commits.
+"""
+import argparse
+import json
+import os
+import subprocess
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+ENTRY_POINTS = {
+    "planner": "import planner",
+    "query": "import query",
+    "migrator": "import migrator",
+    # An extraction of a project without documentation must not load the
+    # document or embedding stack
+    "extract_knowledge (no docs)": (
+        "import tempfile, extract_knowledge\n"
+        "extract_knowledge.DocumentExtractor().process_documents(tempfile.mkdtemp())"
+    ),
+}
+
+def parse_importtime(stderr):
+    """Return (total import seconds, {direct import of the entry point: cumulative seconds}) from -X importtime output"""
+    total = 0.0
+    direct = {}
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative, name = line[len("import time:"):].split("|")
+        # Nested imports are indented two spaces per level under the module that triggered them
+        depth = (len(name) - len(name.lstrip())) // 2 - 1
+        seconds = int(cumulative) / 1e6
+        if depth == 0:
+            total += seconds
+        elif depth == 1:
+            direct[name.strip()] = seconds
+    return total, direct
+
+def measure(code):
+    start = time.perf_counter()
+    result = subprocess.run([sys.executable, "-X", "importtime", "-c", code],
+                            cwd=ROOT, capture_output=True, text=True)
+    wall = time.perf_counter() - start
+    if result.returncode != 0:
+        error = result.stderr.strip().splitlines()[-1] if result.stderr.strip() else "exit code " + str(result.returncode)
+        raise RuntimeError(error)
+    total, direct = parse_importtime(result.stderr)
+    return wall, total, direct
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--repeat", type=int, default=3, help="runs per entry point; the fastest is reported")
+    parser.add_argument("--budget", type=float, default=1.0, help="maximum wall time per entry point in seconds")
+    parser.add_argument("--top", type=int, default=5, help="heaviest direct imports to list")
+    parser.add_argument("--json", help="append the results to this JSON lines file")
+    args = parser.parse_args()
+
+    results = {}
+    over_budget = []
+    for name, code in ENTRY_POINTS.items():
+        try:
+            runs = [measure(code) for _ in range(args.repeat)]
+        except RuntimeError as e:
+            print(f"⚠️  {name}: {str(e)}")
+            continue
+        wall, total, direct = min(runs, key=lambda run: run[0])
+        results[name] = {"wall_seconds": round(wall, 3), "import_seconds": round(total, 3)}
+
+        status = "✅" if wall <= args.budget else "❌"
+        if wall > args.budget:
+            over_budget.append(name)
+        print(f"{status} {name}: {wall:.3f}s wall, {total:.3f}s importing")
+        for module, seconds in sorted(direct.items(), key=lambda item: -item[1])[:args.top]:
+            print(f"    {seconds:7.3f}s  {module}")
+
+    if args.json:
+        with open(args.json, "a", encoding="utf-8") as f:
+            f.write(json.dumps({"timestamp": time.time(), "budget": args.budget, "results": results}) + "\n")
+
+    if over_budget:
+        print(f"\n❌ Over the {args.budget}s budget: {', '.join(over_budget)}")
+        sys.exit(1)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,385 @@
+"""Generate a synthetic Jakarta EE project shaped like the kitchensink quickstart, at any size.
+
+Usage: python benchmarks/generate_project.py <target_dir> [--entities N] [--resources N] [--services N]
+       [--repositories N] [--pages N] [--docs N] [--utils N] [--fields N] [--seed N]
+
+Each entity gets a JPA entity class, and by default a repository, an EJB
+service, a JAX-RS resource and a JSF page, wired to each other the way
+the quickstart is: resources inject services, services inject
+repositories and the previous service, entities reference the previous
+entity. Pages use a shared Facelets template and a form per entity.
+Unannotated utility classes exercise the Java pre-filter, and markdown
+documents the documentation extractor. Output is deterministic for a
+given seed.
+"""
+import argparse
+import json
+import os
+import random
+
+PACKAGE = "org.example.bench"
+
+FIELD_TYPES = [
+    ("String", "VARCHAR(255)", "text"),
+    ("Long", "BIGINT", "number"),
+    ("Integer", "INTEGER", "number"),
+    ("java.math.BigDecimal", "DECIMAL(19,2)", "number"),
+    ("java.time.LocalDate", "DATE", "date"),
+    ("Boolean", "BOOLEAN", "checkbox"),
+]
+
+WORDS = ("order customer invoice shipment catalog product account payment ledger audit region tenant "
+         "schedule booking voucher refund supplier warehouse contract policy claim member profile").split()
+
+def entity_names(count, rng):
+    """Distinct CamelCase entity names"""
+    names = []
+    for i in range(count):
+        first, second = rng.choice(WORDS), rng.choice(WORDS)
+        names.append(f"{first.capitalize()}{second.capitalize()}{i}")
+    return names
+
+def _write(root, rel_path, content):
+    path = os.path.join(root, rel_path)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, "w", encoding="utf-8") as f:
+        f.write(content)
+
+def _java_path(package, class_name):
+    return os.path.join("src", "main", "java", *f"{PACKAGE}.{package}".split("."), f"{class_name}.java")
+
+def _fields(name, count, rng):
+    """[(field name, Java type, column type, input type)] of an entity"""
+    fields = []
+    for i in range(count):
+        java_type, column_type, input_type = rng.choice(FIELD_TYPES)
+        fields.append((f"{rng.choice(WORDS)}{i}", java_type, column_type, input_type))
+    return fields
+
+def entity_source(name, fields, previous):
+    lines = [
+        f"package {PACKAGE}.model;",
+        "",
+        "import java.io.Serializable;",
+        "import javax.persistence.*;",
+        "import javax.validation.constraints.*;",
+        "",
+        "@Entity",
+        f'@Table(name = "{name.lower()}")',
+        f"public class {name} implements Serializable {{",
+        "    @Id",
+        "    @GeneratedValue",
+        "    private Long id;",
+        "",
+    ]
+    for field_name, java_type, _, _ in fields:
+        if java_type == "String":
+            lines += ["    @NotNull", "    @Size(min = 1, max = 255)"]
+        lines += [f'    @Column(name = "{field_name.lower()}")', f"    private {java_type} {field_name};", ""]
+    if previous:
+        lines += ["    @ManyToOne", f"    private {previous} parent;", ""]
+    lines += [
+        "    public Long getId() { return id; }",
+        "    public void setId(Long id) { this.id = id; }",
+    ]
+    for field_name, java_type, _, _ in fields:
+        accessor = field_name[0].upper() + field_name[1:]
+        lines += [
+            f"    public {java_type} get{accessor}() {{ return {field_name}; }}",
+            f"    public void set{accessor}({java_type} {field_name}) {{ this.{field_name} = {field_name}; }}",
+        ]
+    lines.append("}")
+    return "\n".join(lines) + "\n"
+
+def repository_source(name):
+    return f"""package {PACKAGE}.data;
+
+import java.util.List;
+import javax.enterprise.context.ApplicationScoped;
+import javax.inject.Inject;
+import javax.persistence.EntityManager;
+import {PACKAGE}.model.{name};
+
+@ApplicationScoped
+@Repository
+public class {name}Repository {{
+    @Inject
+    private EntityManager em;
+
+    public {name} findById(Long id) {{
+        return em.find({name}.class, id);
+    }}
+
+    public List<{name}> findAllOrderedById() {{
+        return em.createQuery("select e from {name} e order by e.id", {name}.class).getResultList();
+    }}
+
+    public void save({name} entity) {{
+        em.persist(entity);
+    }}
+}}
+"""
+
+def service_source(name, previous):
+    collaborator = ""
+    call = ""
+    if previous:
+        collaborator = f"""
+    @Inject
+    private {previous}Service {previous[0].lower()}{previous[1:]}Service;
+"""
+        call = f"\n        {previous[0].lower()}{previous[1:]}Service.audit(entity.getId());"
+    return f"""package {PACKAGE}.service;
+
+import java.util.logging.Logger;
+import javax.ejb.Stateless;
+import javax.enterprise.event.Event;
+import javax.inject.Inject;
+import {PACKAGE}.data.{name}Repository;
+import {PACKAGE}.model.{name};
+
+@Stateless
+public class {name}Service {{
+    @Inject
+    private Logger log;
+
+    @Inject
+    private {name}Repository repository;
+
+    @Inject
+    private Event<{name}> eventSrc;
+{collaborator}
+    public void register({name} entity) throws Exception {{
+        log.info("Registering " + entity.getId());
+        repository.save(entity);{call}
+        eventSrc.fire(entity);
+    }}
+
+    public void audit(Long id) {{
+        log.info("Audited " + id);
+    }}
+}}
+"""
+
+def resource_source(name):
+    path = name.lower()
+    return f"""package {PACKAGE}.rest;
+
+import java.util.List;
+import javax.enterprise.context.RequestScoped;
+import javax.inject.Inject;
+import javax.ws.rs.*;
+import javax.ws.rs.core.MediaType;
+import javax.ws.rs.core.Response;
+import {PACKAGE}.data.{name}Repository;
+import {PACKAGE}.model.{name};
+import {PACKAGE}.service.{name}Service;
+
+@Path("/{path}")
+@RequestScoped
+public class {name}ResourceRESTService {{
+    @Inject
+    private {name}Repository repository;
+
+    @Inject
+    private {name}Service registration;
+
+    @GET
+    @Produces(MediaType.APPLICATION_JSON)
+    public List<{name}> listAll() {{
+        return repository.findAllOrderedById();
+    }}
+
+    @GET
+    @Path("/{{id:[0-9][0-9]*}}")
+    @Produces(MediaType.APPLICATION_JSON)
+    public {name} lookupById(@PathParam("id") long id) {{
+        {name} entity = repository.findById(id);
+        if (entity == null) {{
+            throw new WebApplicationException(Response.Status.NOT_FOUND);
+        }}
+        return entity;
+    }}
+
+    @POST
+    @Consumes(MediaType.APPLICATION_JSON)
+    public Response create({name} entity) throws Exception {{
+        registration.register(entity);
+        return Response.ok().build();
+    }}
+
+    @PUT
+    @Path("/{{id:[0-9][0-9]*}}")
+    public Response update(@PathParam("id") long id, {name} entity) throws Exception {{
+        registration.register(entity);
+        return Response.ok().build();
+    }}
+
+    @DELETE
+    @Path("/{{id:[0-9][0-9]*}}")
+    public Response delete(@PathParam("id") long id) {{
+        return Response.noContent().build();
+    }}
+}}
+"""
+
+def utility_source(index):
+    return f"""package {PACKAGE}.util;
+
+import java.util.Locale;
+
+public final class Formatting{index} {{
+    private Formatting{index}() {{
+    }}
+
+    public static String label(String value) {{
+        return value == null ? "" : value.trim().toUpperCase(Locale.ROOT);
+    }}
+
+    public static int weight(String value) {{
+        int total = 0;
+        for (char c : label(value).toCharArray()) {{
+            total = total * 31 + c;
+        }}
+        return total;
+    }}
+}}
+"""
+
+def page_source(name, fields):
+    inputs = []
+    for field_name, _, _, input_type in fields:
+        required = ' required="required"' if input_type == "text" else ""
+        inputs.append(f'    <input name="{field_name}" type="{input_type}"{required}/>')
+    return f"""<ui:composition xmlns="http://www.w3.org/1999/xhtml"
+    xmlns:ui="http://java.sun.com/jsf/facelets"
+    xmlns:h="http://java.sun.com/jsf/html"
+    template="/WEB-INF/templates/default.xhtml">
+<ui:define name="content">
+  <h1>{name}</h1>
+  <form id="{name.lower()}Form" action="/{name.lower()}" method="post">
+{chr(10).join(inputs)}
+    <select name="status"><option>active</option><option>archived</option></select>
+    <textarea name="notes" maxlength="500"></textarea>
+    <input type="submit" value="Register"/>
+  </form>
+  <img src="resources/gfx/{name.lower()}.png"/>
+  <script src="resources/js/{name.lower()}.js"></script>
+</ui:define>
+</ui:composition>
+"""
+
+TEMPLATE = """<!DOCTYPE html>
+<html xmlns="http://www.w3.org/1999/xhtml" xmlns:ui="http://java.sun.com/jsf/facelets">
+<head>
+  <title>Synthetic quickstart</title>
+  <link rel="stylesheet" href="resources/css/screen.css"/>
+  <script src="resources/js/app.js"></script>
+</head>
+<body>
+  <div id="container"><ui:insert name="content">Content</ui:insert></div>
+  <img src="resources/gfx/banner.png"/>
+</body>
+</html>
+"""
+
+PERSISTENCE = """<?xml version="1.0" encoding="UTF-8"?>
+<persistence version="2.1" xmlns="http://xmlns.jcp.org/xml/ns/persistence">
+  <persistence-unit name="primary">
+    <jta-data-source>java:jboss/datasources/BenchDS</jta-data-source>
+    <properties>
+      <property name="hibernate.hbm2ddl.auto" value="create-drop"/>
+      <property name="hibernate.dialect" value="org.hibernate.dialect.H2Dialect"/>
+    </properties>
+  </persistence-unit>
+</persistence>
+"""
+
+def document_source(index, names, rng, paragraphs=20):
+    lines = [f"# Design note {index}", ""]
+    for i in range(paragraphs):
+        name = rng.choice(names)
+        if i % 5 == 0:
+            lines += [f"## {name} workflow", ""]
+        lines += [
+            f"The {name} service validates every {rng.choice(WORDS)} before it is persisted, "
+            f"and the REST resource at /{name.lower()} exposes list, lookup and registration. "
+            f"Changes are audited by the previous service in the chain and published as CDI events "
+            f"so the {rng.choice(WORDS)} view can refresh.",
+            "",
+        ]
+    return "\n".join(lines)
+
+def generate_project(target_dir, entities=10, resources=None, services=None, repositories=None,
+                     pages=None, docs=None, utils=None, fields=6, seed=0):
+    """Write a synthetic project to target_dir and return how many files of each kind it holds.
+
+    Counts of resources, services, repositories and pages default to one
+    per entity (and are capped at the number of entities), documents to
+    one per five entities and utility classes to one per two.
+    """
+    rng = random.Random(seed)
+    names = entity_names(entities, rng)
+    resources = entities if resources is None else min(resources, entities)
+    services = entities if services is None else min(services, entities)
+    repositories = entities if repositories is None else min(repositories, entities)
+    pages = entities if pages is None else min(pages, entities)
+    docs = max(1, entities // 5) if docs is None else docs
+    utils = entities // 2 if utils is None else utils
+
+    counts = {"entities": 0, "repositories": 0, "services": 0, "resources": 0,
+              "utils": 0, "pages": 0, "docs": 0, "static": 0}
+    for i, name in enumerate(names):
+        previous = names[i - 1] if i else None
+        entity_fields = _fields(name, fields, rng)
+        _write(target_dir, _java_path("model", name), entity_source(name, entity_fields, previous))
+        counts["entities"] += 1
+        if i < repositories:
+            _write(target_dir, _java_path("data", f"{name}Repository"), repository_source(name))
+            counts["repositories"] += 1
+        if i < services:
+            _write(target_dir, _java_path("service", f"{name}Service"), service_source(name, previous))
+            counts["services"] += 1
+        if i < resources:
+            _write(target_dir, _java_path("rest", f"{name}ResourceRESTService"), resource_source(name))
+            counts["resources"] += 1
+        if i < pages:
+            _write(target_dir, os.path.join("src", "main", "webapp", f"{name.lower()}.xhtml"),
+                   page_source(name, entity_fields))
+            counts["pages"] += 1
+
+    for i in range(utils):
+        _write(target_dir, _java_path("util", f"Formatting{i}"), utility_source(i))
+        counts["utils"] += 1
+
+    _write(target_dir, os.path.join("src", "main", "resources", "META-INF", "persistence.xml"), PERSISTENCE)
+    _write(target_dir, os.path.join("src", "main", "webapp", "WEB-INF", "templates", "default.xhtml"), TEMPLATE)
+    for rel_path, content in (("css/screen.css", "body { margin: 0; }\n"), ("js/app.js", "void 0;\n")):
+        _write(target_dir, os.path.join("src", "main", "webapp", "resources", *rel_path.split("/")), content)
+        counts["static"] += 1
+
+    for i in range(docs):
+        _write(target_dir, os.path.join("docs", f"design-{i}.md"), document_source(i, names, rng))
+        counts["docs"] += 1
+    return counts
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("target_dir")
+    parser.add_argument("--entities", type=int, default=10)
+    parser.add_argument("--resources", type=int, help="JAX-RS resources (default: one per entity)")
+    parser.add_argument("--services", type=int, help="EJB services (default: one per entity)")
+    parser.add_argument("--repositories", type=int, help="repositories (default: one per entity)")
+    parser.add_argument("--pages", type=int, help="XHTML pages (default: one per entity)")
+    parser.add_argument("--docs", type=int, help="markdown documents (default: one per five entities)")
+    parser.add_argument("--utils", type=int, help="unannotated utility classes (default: one per two entities)")
+    parser.add_argument("--fields", type=int, default=6, help="fields per entity")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    counts = generate_project(args.target_dir, args.entities, args.resources, args.services, args.repositories,
+                              args.pages, args.docs, args.utils, args.fields, args.seed)
+    print(f"✅ Generated {args.target_dir}: {json.dumps(counts)}")
+
+if __name__ == "__main__":
+    main()
@@ -1,10 +1,18 @@
 import os
 from typing import Dict
-import google.generativeai as genai
 from utils.namespace_handler import get_package_declaration
 
 class BaseConverter:
-    def __init__(self, api_key: str):
+    def __init__(self, api_key: str, model=None):
+        # Any object with generate_content(prompt) returning a response with
+        # .text can stand in for Gemini, e.g. a stub in benchmarks
+        if model is not None:
+            self.model = model
+            return
+
+        # Imported here so that loading the module stays fast
+        import google.generativeai as genai
+
         genai.configure(api_key=api_key)
         self.model = genai.GenerativeModel('gemini-pro')
     
@@ -1,70 +1,58 @@
 import os
 import javalang
-from neo4j import GraphDatabase
+from functools import partial
+from utils.source_scanner import scan_source_tree
+from utils.java_parser import visit_compilation_units
+from utils.java_prefilter import JavaPrefilter
+from utils.java_visitor import JavaNodeVisitor, collect_with_visitor
+from utils.graph_writer import BatchGraphWriter, NodeRef
+from utils.graph_store import open_graph_store
 
 class DatabaseExtractor:
-    def __init__(self, uri, user, password):
-        self.driver = GraphDatabase.driver(uri, auth=(user, password))
+    def __init__(self, uri, user, password, batch_size=None, flush_interval=None):
+        self.store = open_graph_store(uri, user, password)
+        self.writer = BatchGraphWriter(self.store, batch_size, flush_interval)
 
     def close(self):
-        self.driver.close()
+        self.writer.close()
+        print(f"📝 Database structure: {self.writer.report()}")
+        self.store.close()
+
+    def flush(self):
+        """Write buffered nodes and relationships to the graph store"""
+        self.writer.flush()
 
     def execute_query(self, query, params={}):
-        """Execute Cypher query in Neo4j"""
-        with self.driver.session() as session:
-            session.run(query, params)
+        """Execute Cypher query (Neo4j stores only)"""
+        self.store.query(query, params)
 
     def add_database_info(self, db_type, config_file):
         """Store database type in the graph"""
-        query = """
-        MERGE (db:Database {type: $db_type, configFile: $config_file})
-        """
-        self.execute_query(query, {"db_type": db_type, "config_file": config_file})
+        self.writer.merge_node("Database", {"type": db_type, "configFile": config_file})
 
     def add_table(self, table_name, entity_name, columns=None):
         """Store database tables (from JPA entities)"""
-        query = """
-        MERGE (t:Table {name: $table_name})
-        MERGE (e:Entity {name: $entity_name})
-        SET t.columns = $columns
-        MERGE (e)-[:MAPS_TO]->(t)
-        """
-        self.execute_query(query, {
-            "table_name": table_name, 
-            "entity_name": entity_name,
-            "columns": columns or []
-        })
+        self.writer.merge_edge(
+            NodeRef("Entity", {"name": entity_name}),
+            "MAPS_TO",
+            NodeRef("Table", {"name": table_name}, {"columns": columns or []})
+        )
 
     def add_column(self, table_name, column_name, column_type, constraints=None):
         """Store column information"""
-        query = """
-        MATCH (t:Table {name: $table_name})
-        MERGE (c:Column {name: $column_name, type: $column_type})
-        SET c.constraints = $constraints
-        MERGE (t)-[:HAS_COLUMN]->(c)
-        """
-        self.execute_query(query, {
-            "table_name": table_name,
-            "column_name": column_name,
-            "column_type": column_type,
-            "constraints": constraints or []
-        })
+        self.writer.merge_edge(
+            NodeRef("Table", {"name": table_name}, merge=False),
+            "HAS_COLUMN",
+            NodeRef("Column", {"name": column_name, "type": column_type}, {"constraints": constraints or []})
+        )
 
     def add_model_details(self, entity_name, table_name, variables, methods):
         """Store detailed model information including methods and variables"""
-        query = """
-        MERGE (e:Entity {name: $entity_name})
-        MERGE (t:Table {name: $table_name})
-        SET e.variables = $variables,
-            e.methods = $methods
-        MERGE (e)-[:MAPS_TO]->(t)
-        """
-        self.execute_query(query, {
-            "entity_name": entity_name,
-            "table_name": table_name,
-            "variables": variables,
-            "methods": methods
-        })
+        self.writer.merge_edge(
+            NodeRef("Entity", {"name": entity_name}, {"variables": variables, "methods": methods}),
+            "MAPS_TO",
+            NodeRef("Table", {"name": table_name})
+        )
 
 def extract_table_name(class_node):
     """Extract table name from @Table annotation"""
@@ -84,111 +72,146 @@ def extract_table_name(class_node):
     
     return table_name
 
-def parse_java_files(directory, db_extractor):
+def parse_java_files(directory, db_extractor, manifest=None):
     """Extract DB details from Java files"""
-    for root, _, files in os.walk(directory):
-        for file in files:
-            if file.endswith(".java"):
-                file_path = os.path.join(root, file)
-                with open(file_path, "r", encoding="utf-8") as f:
-                    source_code = f.read()
-                
-                try:
-                    tree = javalang.parse.parse(source_code)
-                    
-                    for _, node in tree:
-                        if isinstance(node, javalang.tree.ClassDeclaration):
-                            is_entity = False
-                            entity_name = None
-                            table_name = None
-                            methods = []
-                            variables = []
-
-                            # Check for @Entity annotation
-                            for annotation in node.annotations:
-                                if annotation.name == "Entity":
-                                    is_entity = True
-                                    entity_name = node.name
-                                    table_name = extract_table_name(node) or entity_name.lower()
-
-                            if is_entity:
-                                # Process fields/variables
-                                for field in node.fields:
-                                    field_name = field.declarators[0].name
-                                    field_type = field.type.name
-                                    constraints = []
-                                    annotations = []
-
-                                    # Extract field metadata from annotations
-                                    for annotation in field.annotations:
-                                        annotations.append(annotation.name)
-                                        if annotation.name == "Column":
-                                            for element in getattr(annotation.element, 'elements', []):
-                                                if element.name == "name":
-                                                    field_name = element.value.strip('"')
-                                        constraints.append(annotation.name)
-
-                                    variables.append({
-                                        "name": field_name,
-                                        "type": field_type,
-                                        "constraints": constraints,
-                                        "annotations": annotations
-                                    })
-
-                                # Process methods
-                                for method in node.methods:
-                                    method_info = {
-                                        "name": method.name,
-                                        "return_type": method.return_type.name if method.return_type else "void",
-                                        "parameters": [],
-                                        "annotations": [ann.name for ann in method.annotations]
-                                    }
-                                    
-                                    # Get method parameters
-                                    for param in method.parameters:
-                                        param_info = {
-                                            "name": param.name,
-                                            "type": param.type.name
-                                        }
-                                        method_info["parameters"].append(param_info)
-                                    
-                                    methods.append(method_info)
-
-                                # Add model details to graph
-                                db_extractor.add_model_details(
-                                    entity_name,
-                                    table_name,
-                                    variables,
-                                    methods
-                                )
-
-                except Exception as e:
-                    print(f"Failed to parse {file_path}: {str(e)}")
-                    continue
-
-def detect_database_config(directory, db_extractor):
+    if manifest is None:
+        manifest = scan_source_tree(directory)
+
+    java_files = JavaPrefilter.for_collectors({"entities": EntityVisitor}).filter(manifest.java_files)
+    visit_compilation_units(java_files, [partial(extract_entities, db_extractor)])
+
+def extract_entities(db_extractor, file_path, tree):
+    """Visitor: add the JPA entities of one parsed Java file"""
+    add_entity_records(db_extractor, collect_entity_records(file_path, tree))
+
+def add_entity_records(db_extractor, entities):
+    """Write entity records produced by collect_entity_records"""
+    for entity in entities:
+        db_extractor.add_model_details(
+            entity["entity_name"],
+            entity["table_name"],
+            entity["variables"],
+            entity["methods"]
+        )
+
+class EntityVisitor(JavaNodeVisitor):
+    """Collects the JPA entities of one Java file in the shared AST walk"""
+
+    relevant_annotations = {"Entity"}
+
+    def __init__(self, file_path):
+        super().__init__(file_path)
+        self.entities = []
+        self.failed = False
+
+    def visit_ClassDeclaration(self, node):
+        if self.failed:
+            return
+        try:
+            self._add_entity(node)
+        except Exception as e:
+            # Keep the entities found so far and ignore the rest of the file
+            print(f"Failed to extract entities from {self.file_path}: {str(e)}")
+            self.failed = True
+
+    def _add_entity(self, node):
+        is_entity = False
+        entity_name = None
+        table_name = None
+        methods = []
+        variables = []
+
+        # Check for @Entity annotation
+        for annotation in node.annotations:
+            if annotation.name == "Entity":
+                is_entity = True
+                entity_name = node.name
+                table_name = extract_table_name(node) or entity_name.lower()
+
+        if is_entity:
+            # Process fields/variables
+            for field in node.fields:
+                field_name = field.declarators[0].name
+                field_type = field.type.name
+                constraints = []
+                annotations = []
+
+                # Extract field metadata from annotations
+                for annotation in field.annotations:
+                    annotations.append(annotation.name)
+                    if annotation.name == "Column":
+                        for element in getattr(annotation.element, 'elements', []):
+                            if element.name == "name":
+                                field_name = element.value.strip('"')
+                    constraints.append(annotation.name)
+
+                variables.append({
+                    "name": field_name,
+                    "type": field_type,
+                    "constraints": constraints,
+                    "annotations": annotations
+                })
+
+            # Process methods
+            for method in node.methods:
+                method_info = {
+                    "name": method.name,
+                    "return_type": method.return_type.name if method.return_type else "void",
+                    "parameters": [],
+                    "annotations": [ann.name for ann in method.annotations]
+                }
+
+                # Get method parameters
+                for param in method.parameters:
+                    param_info = {
+                        "name": param.name,
+                        "type": param.type.name
+                    }
+                    method_info["parameters"].append(param_info)
+
+                methods.append(method_info)
+
+            self.entities.append({
+                "entity_name": entity_name,
+                "table_name": table_name,
+                "variables": variables,
+                "methods": methods
+            })
+
+    def record(self):
+        return self.entities
+
+def collect_entity_records(file_path, tree):
+    """Collect the JPA entities of one parsed Java file as plain dicts"""
+    return collect_with_visitor(file_path, tree, EntityVisitor)
+
+def detect_database_config(directory, db_extractor, manifest=None):
     """Extract DB type from config files"""
-    for root, _, files in os.walk(directory):
-        for file in files:
-            if file == "persistence.xml":
-                file_path = os.path.join(root, file)
-                try:
-                    with open(file_path, "r", encoding="utf-8") as f:
-                        content = f.read()
-
-                    if "hibernate.dialect" in content:
-                        if "MySQL" in content:
-                            db_extractor.add_database_info("MySQL", file_path)
-                        elif "PostgreSQL" in content:
-                            db_extractor.add_database_info("PostgreSQL", file_path)
-                        elif "Oracle" in content:
-                            db_extractor.add_database_info("Oracle", file_path)
-                        elif "H2" in content:
-                            db_extractor.add_database_info("H2", file_path)
-                        else:
-                            db_extractor.add_database_info("Unknown", file_path)
-                except Exception as e:
-                    print(f"Failed to process {file_path}: {str(e)}")
+    if manifest is None:
+        manifest = scan_source_tree(directory)
+
+    for source_file in manifest.persistence_files:
+        detect_database_type(db_extractor, source_file.path)
+
+def detect_database_type(db_extractor, file_path):
+    """Add the database type configured in one persistence.xml"""
+    try:
+        with open(file_path, "r", encoding="utf-8") as f:
+            content = f.read()
+
+        if "hibernate.dialect" in content:
+            if "MySQL" in content:
+                db_extractor.add_database_info("MySQL", file_path)
+            elif "PostgreSQL" in content:
+                db_extractor.add_database_info("PostgreSQL", file_path)
+            elif "Oracle" in content:
+                db_extractor.add_database_info("Oracle", file_path)
+            elif "H2" in content:
+                db_extractor.add_database_info("H2", file_path)
+            else:
+                db_extractor.add_database_info("Unknown", file_path)
+    except Exception as e:
+        print(f"Failed to process {file_path}: {str(e)}")
 
 if __name__ == "__main__":
     directory_path = "/Users/jaiganeshg/projects/logicshift/jboss-eap-quickstarts/kitchensink"
@@ -1,68 +1,160 @@
+import hashlib
 import os
-from typing import List, Dict
-from docx import Document
-import markdown
-from bs4 import BeautifulSoup
-from langchain.text_splitter import RecursiveCharacterTextSplitter
-from langchain_community.vectorstores import Chroma
-from langchain_community.embeddings import HuggingFaceEmbeddings
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple, Union
+from utils.docx_stream import iter_docx_text
+from utils.source_scanner import SourceManifest, scan_source_tree
+
+# python-docx (only a fallback for .docx), markdown, bs4, langchain, chromadb
+# and sentence-transformers are imported on first use, so runs without
+# documentation never load them
+
+def chunk_ids(file_path: str, chunks: List[str]) -> List[Tuple[str, str]]:
+    """Pair each chunk of a document with a stable id from the path and the chunk's content hash.
+
+    Repeated identical chunks in one document are numbered so their ids
+    stay unique.
+    """
+    seen: Dict[str, int] = {}
+    paired = []
+    for chunk in chunks:
+        chunk_hash = hashlib.sha1(chunk.encode("utf-8")).hexdigest()
+        occurrence = seen.get(chunk_hash, 0)
+        seen[chunk_hash] = occurrence + 1
+        chunk_id = hashlib.sha1(f"{file_path}\0{chunk_hash}\0{occurrence}".encode("utf-8")).hexdigest()
+        paired.append((chunk_id, chunk))
+    return paired
+
+VECTOR_DB_PATH = "./vector_db"
 
 class DocumentExtractor:
-    def __init__(self, persist_directory: str = "./vector_db"):
+    def __init__(self, persist_directory: str = VECTOR_DB_PATH, project: Optional[str] = None):
         self.persist_directory = persist_directory
-        self.embeddings = HuggingFaceEmbeddings(model_name="all-MiniLM-L6-v2")
+        # Chunks are tagged with the project, which owns only its own
+        self.project = project
         self.vector_store = None
-        self.text_splitter = RecursiveCharacterTextSplitter(
-            chunk_size=1000,
-            chunk_overlap=200,
-            length_function=len,
-        )
+        self._embeddings = None
+        self._text_splitter = None
+
+    @property
+    def embeddings(self):
+        """Embedding engine, created on first use"""
+        if self._embeddings is None:
+            from utils.embedding_engine import EmbeddingEngine
+            self._embeddings = EmbeddingEngine(model_name="all-MiniLM-L6-v2")
+        return self._embeddings
+
+    @property
+    def text_splitter(self):
+        if self._text_splitter is None:
+            from langchain.text_splitter import RecursiveCharacterTextSplitter
+            self._text_splitter = RecursiveCharacterTextSplitter(
+                chunk_size=1000,
+                chunk_overlap=200,
+                length_function=len,
+            )
+        return self._text_splitter
     
     def extract_from_docx(self, file_path: str) -> str:
-        """Extract text content from Word document"""
-        doc = Document(file_path)
-        return "\n".join([paragraph.text for paragraph in doc.paragraphs])
+        """Extract text content from Word document, paragraphs and tables, streamed from the zip"""
+        try:
+            return "\n".join(iter_docx_text(file_path))
+        except KeyError:
+            # The main part is not at word/document.xml; let python-docx
+            # resolve it through the package relationships
+            from docx import Document
+
+            doc = Document(file_path)
+            return "\n".join([paragraph.text for paragraph in doc.paragraphs])
     
     def extract_from_markdown(self, file_path: str) -> str:
         """Extract text content from Markdown file"""
+        import markdown
+        from bs4 import BeautifulSoup
+
         with open(file_path, 'r', encoding='utf-8') as f:
             md_content = f.read()
             html = markdown.markdown(md_content)
             soup = BeautifulSoup(html, 'html.parser')
             return soup.get_text()
     
-    def process_documents(self, source_dir: str) -> Dict[str, str]:
-        """Process all documents in the source directory"""
-        document_contents = {}
-        
-        for root, _, files in os.walk(source_dir):
-            for file in files:
-                file_path = os.path.join(root, file)
-                if file.endswith('.docx'):
-                    content = self.extract_from_docx(file_path)
-                    document_contents[file_path] = content
-                elif file.endswith('.md'):
-                    content = self.extract_from_markdown(file_path)
-                    document_contents[file_path] = content
+    def iter_documents(self, source_dir: str, manifest: Optional[SourceManifest] = None) -> Iterator[Tuple[str, str]]:
+        """Yield (file_path, text) for each document, reading one document at a time"""
+        if manifest is None:
+            manifest = scan_source_tree(source_dir)
         
-        return document_contents
-    
-    def create_vector_store(self, document_contents: Dict[str, str]):
-        """Create vector store from document contents"""
-        texts = []
-        metadatas = []
-        
-        for file_path, content in document_contents.items():
-            chunks = self.text_splitter.split_text(content)
-            texts.extend(chunks)
-            metadatas.extend([{"source": file_path} for _ in chunks])
-        
-        self.vector_store = Chroma.from_texts(
-            texts=texts,
-            embedding=self.embeddings,
-            metadatas=metadatas,
+        for source_file in manifest.documents:
+            file_path = source_file.path
+            if file_path.endswith('.docx'):
+                yield file_path, self.extract_from_docx(file_path)
+            elif file_path.endswith('.md'):
+                yield file_path, self.extract_from_markdown(file_path)
+
+    def process_documents(self, source_dir: str, manifest: Optional[SourceManifest] = None) -> Dict[str, str]:
+        """Process all documents in the source directory"""
+        return dict(self.iter_documents(source_dir, manifest))
+
+    def create_vector_store(self, documents: Union[Dict[str, str], Iterable[Tuple[str, str]]],
+                            batch_size: Optional[int] = None) -> int:
+        """Bring the persisted vector store in line with the documents and return how many were read.
+
+        Documents are consumed as a stream: read, split, and embedded and
+        written in batches of `batch_size` chunks (default: the embedding
+        batch size), so memory follows the batch size rather than the
+        corpus. Only the chunk ids are kept for the whole run. Each chunk's
+        id is derived from its document path and content hash, so only new
+        chunks are embedded and added. Chunks of changed or removed
+        documents, whose ids are no longer produced, are deleted. With a
+        project set, only that project's chunks are compared and deleted.
+        """
+        from langchain_community.vectorstores import Chroma
+
+        if isinstance(documents, dict):
+            documents = documents.items()
+        batch_size = batch_size or self.embeddings.batch_size
+
+        self.vector_store = Chroma(
+            embedding_function=self.embeddings,
             persist_directory=self.persist_directory
         )
+        if self.project is not None:
+            existing_ids = set(self.vector_store.get(where={"project": self.project}, include=[])["ids"])
+        else:
+            existing_ids = set(self.vector_store.get(include=[])["ids"])
+        produced_ids = set()
+        read = 0
+        added = 0
+        batch = []
+
+        def write_batch():
+            self.vector_store.add_texts(
+                texts=[chunk for _, chunk, _ in batch],
+                metadatas=[metadata for _, _, metadata in batch],
+                ids=[chunk_id for chunk_id, _, _ in batch]
+            )
+            batch.clear()
+
+        for file_path, content in documents:
+            read += 1
+            for chunk_id, chunk in chunk_ids(file_path, self.text_splitter.split_text(content)):
+                produced_ids.add(chunk_id)
+                if chunk_id in existing_ids:
+                    continue
+                metadata = {"source": file_path}
+                if self.project is not None:
+                    metadata["project"] = self.project
+                batch.append((chunk_id, chunk, metadata))
+                added += 1
+                if len(batch) >= batch_size:
+                    write_batch()
+        if batch:
+            write_batch()
+
+        stale_ids = list(existing_ids - produced_ids)
+        if stale_ids:
+            self.vector_store.delete(ids=stale_ids)
+        print(f"🧩 Vector store: {added} chunks embedded, {len(stale_ids)} removed, "
+              f"{len(produced_ids) - added} unchanged")
+        return read
     
     def query_similar_content(self, query: str, num_results: int = 5) -> List[Dict]:
         """Query the vector store for similar content"""
@@ -78,4 +170,8 @@ class DocumentExtractor:
     def close(self):
         """Cleanup resources"""
         if self.vector_store:
-            self.vector_store.persist() 
\ No newline at end of file
+            self.vector_store.persist()
+        if self._embeddings is not None:
+            if self._embeddings.requested:
+                print(f"🧮 Embeddings: {self._embeddings.report()}")
+            self._embeddings.close()
\ No newline at end of file
@@ -1,64 +1,265 @@
 #!/usr/bin/env python3
 
 import os
-from java_knowledge_extractor import KnowledgeGraphBuilder, parse_java_files as parse_java_components
-from database_knowledge_extractor import DatabaseExtractor, parse_java_files as parse_database_files, detect_database_config
-from frontend_knowledge_extractor import FrontendExtractor, extract_frontend_info
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+import java_knowledge_extractor
+import database_knowledge_extractor
+import frontend_knowledge_extractor
+import document_knowledge_extractor
+from java_knowledge_extractor import KnowledgeGraphBuilder, ComponentVisitor, add_component_record
+from database_knowledge_extractor import DatabaseExtractor, EntityVisitor, add_entity_records, detect_database_type
+from frontend_knowledge_extractor import FrontendExtractor, collect_page_record, add_page_record
 from planner import MigrationPlanner
-from document_knowledge_extractor import DocumentExtractor
+from document_knowledge_extractor import DocumentExtractor, VECTOR_DB_PATH
+from utils.source_scanner import scan_source_tree
+from utils import docx_stream, java_parser, java_prefilter, java_visitor, page_parser
+from utils.java_parser import extract_java_records
+from utils.java_prefilter import JavaPrefilter
+from utils.extraction_cache import ExtractionCache, extractor_version, CACHE_PATH
+from utils.graph_schema import schema_statements
+from utils.graph_pipeline import AsyncGraphSink
+from utils.graph_store import open_graph_store
+from utils.graph_writer import delete_element
+from utils.graph_snapshot import describe, export_snapshot
+from utils.metrics import ExtractionMetrics, METRICS_PATH, PROMETHEUS_PATH
+from utils.page_parser import DEFAULT_PAGE_PARSER
+from utils.incremental import ElementTracker, ExtractionManifest, MANIFEST_PATH
+
+# Projects extracted at the same time when several source roots are given
+PROJECT_WORKERS = int(os.getenv("EXTRACTION_PROJECT_WORKERS", "4"))
+
+REPORT_PATH = "migration_report.txt"
+
+def extractor_versions():
+    """Versions of the Java, page and document extraction code, recorded in the extraction manifest"""
+    return {
+        "java": extractor_version(java_knowledge_extractor, database_knowledge_extractor,
+                                  java_parser, java_prefilter, java_visitor),
+        # Backends may group malformed markup differently, so each caches separately
+        "page": f"{extractor_version(frontend_knowledge_extractor, page_parser)}-{DEFAULT_PAGE_PARSER}",
+        "documents": extractor_version(document_knowledge_extractor, docx_stream),
+    }
+
+def project_roots(source_dirs):
+    """Map each source root to its project key.
+
+    A dict already maps keys to roots; otherwise a root's key is its
+    directory name, numbered when two roots share one.
+    """
+    if isinstance(source_dirs, dict):
+        return dict(source_dirs)
+    if isinstance(source_dirs, str):
+        source_dirs = [source_dirs]
+    roots = {}
+    for root in source_dirs:
+        name = os.path.basename(os.path.normpath(root)) or "project"
+        key = name
+        number = 2
+        while key in roots:
+            key = f"{name}-{number}"
+            number += 1
+        roots[key] = root
+    return roots
+
+def project_path(path, project):
+    """A project's own variant of an output file, e.g. extraction_manifest.orders.json"""
+    if not path or project is None:
+        return path
+    base, extension = os.path.splitext(path)
+    return f"{base}.{project}{extension}"
 
 class KnowledgeExtraction:
-    def __init__(self, source_dir, neo4j_uri="bolt://localhost:7687", neo4j_user="neo4j", neo4j_password="password"):
-        self.source_dir = source_dir
+    """Extracts one project, or several concurrently into one shared graph.
+
+    With several source roots (a list, or a dict of project key to root),
+    each project is extracted by its own KnowledgeExtraction in a thread
+    pool. Every node and relationship it writes is tagged with its project
+    key, node keys are unique per project, and the manifest, cache, metrics,
+    migration report and vector store of each project get their own files.
+    """
+
+    def __init__(self, source_dir, neo4j_uri="bolt://localhost:7687", neo4j_user="neo4j", neo4j_password="password",
+                 parse_workers=None, parse_timeout=None, incremental=True, manifest_path=None,
+                 cache_path=CACHE_PATH, async_writes=True, snapshot_path=None,
+                 metrics_path=METRICS_PATH, prometheus_path=PROMETHEUS_PATH,
+                 project=None, project_workers=None, report_path=REPORT_PATH, apply_schema=True):
+        projects = project_roots(source_dir)
         self.neo4j_uri = neo4j_uri
         self.neo4j_user = neo4j_user
         self.neo4j_password = neo4j_password
+        self.manifest_path = manifest_path or MANIFEST_PATH
+        self.snapshot_path = snapshot_path
+        self.report_path = report_path
+        self.apply_schema = apply_schema
+
+        # Several projects: one scoped extraction each, sharing the graph
+        self.children = []
+        if len(projects) > 1:
+            self.project_workers = project_workers or PROJECT_WORKERS
+            self.children = [
+                KnowledgeExtraction(
+                    root, neo4j_uri, neo4j_user, neo4j_password,
+                    parse_workers=parse_workers,
+                    parse_timeout=parse_timeout,
+                    incremental=incremental,
+                    manifest_path=project_path(self.manifest_path, key),
+                    # Each cache holds a write transaction until it closes,
+                    # so concurrent projects do not share a file
+                    cache_path=project_path(cache_path, key),
+                    async_writes=async_writes,
+                    metrics_path=project_path(metrics_path, key),
+                    prometheus_path=project_path(prometheus_path, key),
+                    project=key,
+                    report_path=project_path(report_path, key),
+                    # Applied once for all projects before they start
+                    apply_schema=False
+                )
+                for key, root in projects.items()
+            ]
+            return
+
+        # A single root given with a key is scoped like a portfolio member
+        (key, self.source_dir), = projects.items()
+        self.project = project if project is not None else (key if isinstance(source_dir, dict) else None)
+        self.parse_workers = parse_workers
+        self.parse_timeout = parse_timeout
+        self.incremental = incremental
+        self.metrics_path = metrics_path
+        self.prometheus_path = prometheus_path
         
         # Initialize all extractors
-        self.java_extractor = KnowledgeGraphBuilder()
+        self.java_extractor = KnowledgeGraphBuilder(uri=neo4j_uri, user=neo4j_user, password=neo4j_password)
         self.db_extractor = DatabaseExtractor(neo4j_uri, neo4j_user, neo4j_password)
         self.frontend_extractor = FrontendExtractor(neo4j_uri, neo4j_user, neo4j_password)
-        self.planner = MigrationPlanner(neo4j_uri, neo4j_user, neo4j_password)
-        self.doc_extractor = DocumentExtractor()
+        self.planner = MigrationPlanner(neo4j_uri, neo4j_user, neo4j_password, project=self.project)
+        # Each project keeps its documentation chunks in its own vector store
+        self.doc_extractor = DocumentExtractor(project_path(VECTOR_DB_PATH, self.project), project=self.project)
+
+        # Per-file extraction records cached by content hash; an empty path disables it
+        self.cache = ExtractionCache(cache_path) if cache_path else None
+        self.versions = extractor_versions()
+        self.java_version = self.versions["java"]
+        self.page_version = self.versions["page"]
+
+        # Both visitors share one walk of each file's tree. A byte-level
+        # pre-scan for their annotations keeps irrelevant files from being
+        # parsed at all.
+        self.java_collectors = {"components": ComponentVisitor, "entities": EntityVisitor}
+        self.prefilter = JavaPrefilter.for_collectors(self.java_collectors)
+
+        # Track which graph elements each source file produces, keyed
+        # within the project when the graph is shared
+        self.tracker = ElementTracker()
+        for extractor in (self.java_extractor, self.db_extractor, self.frontend_extractor):
+            extractor.writer.tracker = self.tracker
+            extractor.writer.project = self.project
+
+        # Parsing and graph writes run as a pipeline: flushed batches go
+        # through a bounded queue to the async driver while the next files
+        # are parsed. An embedded store is written in process, with no
+        # round trip to overlap.
+        if async_writes and not self.java_extractor.store.embedded:
+            self.sink = AsyncGraphSink(neo4j_uri, neo4j_user, neo4j_password)
+        else:
+            self.sink = None
+        for extractor in (self.java_extractor, self.db_extractor, self.frontend_extractor):
+            extractor.writer.sink = self.sink
+
+        # Stage timings, per-file parse times and every graph query of the run
+        self.metrics = ExtractionMetrics()
+        for extractor in (self.java_extractor, self.db_extractor, self.frontend_extractor, self.planner):
+            extractor.store.metrics = self.metrics
+        if self.sink:
+            self.sink.metrics = self.metrics
 
     def extract_all(self):
         """Run all extractors and generate migration report"""
+        if self.children:
+            return self._extract_projects()
         try:
-            print("\n🔍 Starting knowledge extraction process...")
+            print(f"\n🔍 Starting knowledge extraction process{self._label()}...")
 
-            # 1. Extract Java components
-            print("\n📦 Analyzing Java components...")
-            parse_java_components(self.source_dir, self.java_extractor)
-            print("✅ Java component analysis complete")
+            if self.apply_schema:
+                self.metrics.stage("schema")
+                # Constraints and indexes back every MERGE key the extractors use
+                scoped = self.project is not None
+                applied = self.java_extractor.store.ensure_schema(scoped)
+                print(f"🗝️  Graph schema ready ({applied}/{len(schema_statements(scoped))} constraints and indexes)")
 
-            # 2. Extract database information
-            print("\n💾 Analyzing database structure...")
-            detect_database_config(self.source_dir, self.db_extractor)
-            parse_database_files(self.source_dir, self.db_extractor)
-            print("✅ Database analysis complete")
+            # Walk the source tree once; every extractor reads from this manifest
+            self.metrics.stage("scan")
+            print("\n🗂️  Scanning source tree...")
+            manifest = scan_source_tree(self.source_dir)
+            print(f"✅ {manifest.summary()}")
 
-            # 3. Extract frontend information
-            print("\n🎨 Analyzing frontend components...")
-            extract_frontend_info(self.source_dir, self.frontend_extractor)
-            print("✅ Frontend analysis complete")
+            # Only files that were added or changed since the last run are
+            # extracted again
+            self.metrics.stage("diff")
+            if self.incremental:
+                state = ExtractionManifest.load(self.manifest_path, self.source_dir, self.versions)
+            else:
+                state = ExtractionManifest(self.source_dir, versions=self.versions)
+            graph_files = manifest.java_files + manifest.persistence_files + manifest.pages
+            to_extract, removed, hashes = state.diff(graph_files)
+            print(f"🔁 {len(to_extract)} added or changed, {len(removed)} removed, "
+                  f"{len(graph_files) - len(to_extract)} unchanged")
+            changed = manifest.filtered({source_file.path for source_file in to_extract})
+
+            self.extract_files(changed, hashes)
 
             # Add document extraction step
+            self.metrics.stage("documents")
             print("\n📄 Analyzing documentation...")
-            doc_contents = self.doc_extractor.process_documents(self.source_dir)
-            if doc_contents:
-                self.doc_extractor.create_vector_store(doc_contents)
-                print(f"✅ Processed {len(doc_contents)} documentation files")
+            processed = 0
+            # With no documents left, an existing store still drops the chunks of removed ones
+            if manifest.documents or os.path.isdir(self.doc_extractor.persist_directory):
+                # Documents stream through reading, splitting, embedding and
+                # writing, so memory does not grow with the corpus
+                documents = self.doc_extractor.iter_documents(self.source_dir, manifest)
+                processed = self.doc_extractor.create_vector_store(documents)
+            if processed:
+                print(f"✅ Processed {processed} documentation files")
             else:
                 print("ℹ️ No documentation files (.docx or .md) found")
 
+            # Write any buffered graph rows before the planner reads the graph
+            self.metrics.stage("flush")
+            self.java_extractor.flush()
+            self.db_extractor.flush()
+            self.frontend_extractor.flush()
+
+            # Remove what removed or changed files no longer produce
+            self.metrics.stage("stale")
+            stale = state.update(to_extract, removed, hashes, self.tracker.elements)
+            if stale:
+                for element in stale:
+                    delete_element(self.java_extractor.writer, element)
+                self.java_extractor.flush()
+                print(f"🧹 Removed {len(stale)} stale graph elements")
+            state.save(self.manifest_path)
+
+            # The planner reads the graph, so every queued write must land first
+            if self.sink:
+                self.metrics.stage("drain")
+                self.sink.drain()
+
+            # A snapshot lets other machines load the graph instead of re-extracting it
+            if self.snapshot_path:
+                self.metrics.stage("snapshot")
+                stats = export_snapshot(self.java_extractor.store, self.snapshot_path)
+                print(f"\n📦 Graph snapshot: {describe(stats)} written to {self.snapshot_path}")
+
             # 4. Generate comprehensive migration report
+            self.metrics.stage("planner")
             print("\n📋 Generating migration report...")
-            self.planner.save_report("migration_report.txt")
+            self.planner.save_report(self.report_path)
             print("✅ Migration report generated")
+            self.metrics.end_stage()
 
-            print("\n✨ Knowledge extraction complete!")
+            print(f"\n✨ Knowledge extraction complete{self._label()}!")
             print("\nNext steps:")
-            print("1. Review the migration report in 'migration_report.txt'")
+            print(f"1. Review the migration report in '{self.report_path}'")
             print("2. Use the Spring Boot migrator to generate the new project")
             print("3. Follow the migration recommendations in the report")
 
@@ -68,31 +269,200 @@ class KnowledgeExtraction:
         finally:
             self.cleanup()
 
+    def extract_files(self, manifest, hashes):
+        """Extract the Java files, persistence units and pages of a manifest into the graph.
+
+        `hashes` maps each file to its content hash, which keys the
+        extraction cache. Elements each file produced are in `self.tracker`.
+        """
+        # 1. Extract Java components and database entities. Each file is
+        # parsed once, in a worker pool, and both extractors' records are
+        # written to the graph from this process.
+        self.metrics.stage("java")
+        print("\n📦 Analyzing Java components and database entities...")
+        parsed = 0
+        for file_path, records in self._java_records(manifest.java_files, hashes):
+            self.tracker.start_file(file_path)
+            if records["components"]:
+                add_component_record(self.java_extractor, records["components"])
+            if records["entities"]:
+                add_entity_records(self.db_extractor, records["entities"])
+            parsed += 1
+        print(f"✂️  Pre-filter {self.prefilter.report()}")
+        print(f"✅ Java analysis complete ({parsed} compilation units)")
+
+        # 2. Extract database configuration
+        self.metrics.stage("persistence")
+        print("\n💾 Analyzing database configuration...")
+        for source_file in manifest.persistence_files:
+            self.tracker.start_file(source_file.path)
+            detect_database_type(self.db_extractor, source_file.path)
+        print("✅ Database analysis complete")
+
+        # 3. Extract frontend information
+        self.metrics.stage("frontend")
+        print("\n🎨 Analyzing frontend components...")
+        for source_file in manifest.pages:
+            self.tracker.start_file(source_file.path)
+            self._extract_page(source_file.path, hashes[source_file.path])
+        print("✅ Frontend analysis complete")
+
+    def _label(self):
+        return f" for project '{self.project}'" if self.project is not None else ""
+
+    def _extract_projects(self):
+        """Extract every project concurrently into the shared graph"""
+        print(f"\n🗂️  Extracting {len(self.children)} projects, up to {self.project_workers} at a time...")
+        store = open_graph_store(self.neo4j_uri, self.neo4j_user, self.neo4j_password)
+        failed = []
+        try:
+            # Keys are unique per project, so the constraints are scoped before any project writes
+            applied = store.ensure_schema(scoped=True)
+            print(f"🗝️  Graph schema ready ({applied}/{len(schema_statements(True))} project-scoped "
+                  f"constraints and indexes)")
+
+            with ThreadPoolExecutor(max_workers=self.project_workers, thread_name_prefix="project") as pool:
+                futures = {pool.submit(child.extract_all): child for child in self.children}
+                for future in as_completed(futures):
+                    project = futures[future].project
+                    try:
+                        future.result()
+                        print(f"✅ Project '{project}' extracted")
+                    except Exception as e:
+                        failed.append(project)
+                        print(f"❌ Project '{project}' failed: {str(e)}")
+
+            # One snapshot holds the whole portfolio
+            if self.snapshot_path:
+                stats = export_snapshot(store, self.snapshot_path)
+                print(f"\n📦 Graph snapshot: {describe(stats)} written to {self.snapshot_path}")
+        finally:
+            store.close()
+
+        if failed:
+            raise RuntimeError(f"Extraction failed for {len(failed)} of {len(self.children)} projects: "
+                               f"{', '.join(sorted(failed))}")
+        print(f"\n✨ Extracted {len(self.children)} projects; reports in "
+              f"{', '.join(child.report_path for child in self.children)}")
+
+    def _java_records(self, java_files, hashes):
+        """Yield (file_path, records) for Java files, parsing only cache misses"""
+        to_parse = []
+        for source_file in java_files:
+            records = self.cache.get("java", self.java_version, hashes[source_file.path]) if self.cache else None
+            if records is None:
+                to_parse.append(source_file)
+                continue
+            # Records are cached by content, so restore this file's path
+            if records["components"]:
+                records["components"]["file_path"] = source_file.path
+            yield source_file.path, records
+
+        for file_path, records in extract_java_records(
+            to_parse,
+            self.java_collectors,
+            workers=self.parse_workers,
+            timeout=self.parse_timeout,
+            prefilter=self.prefilter,
+            metrics=self.metrics
+        ):
+            if self.cache:
+                self.cache.put("java", self.java_version, hashes[file_path], records)
+            yield file_path, records
+
+    def _extract_page(self, file_path, content_hash):
+        """Extract one page, reusing its cached record when the content is unchanged"""
+        record = self.cache.get("page", self.page_version, content_hash) if self.cache else None
+        if record is None:
+            start = time.perf_counter()
+            try:
+                with open(file_path, 'r', encoding='utf-8') as f:
+                    record = collect_page_record(f.read())
+            except Exception as e:
+                self.metrics.file_parsed("page", file_path, time.perf_counter() - start, ok=False)
+                print(f"Error processing {file_path}: {str(e)}")
+                return
+            self.metrics.file_parsed("page", file_path, time.perf_counter() - start)
+            if self.cache:
+                self.cache.put("page", self.page_version, content_hash, record)
+        add_page_record(self.frontend_extractor, file_path, record)
+
     def cleanup(self):
         """Close all connections"""
         try:
+            self.metrics.stage("cleanup")
+            if self.sink:
+                for extractor in (self.java_extractor, self.db_extractor, self.frontend_extractor):
+                    extractor.flush()
+                self.sink.close()
+                print(f"🚚 Async graph writes: {self.sink.report()}")
             self.java_extractor.close()
             self.db_extractor.close()
             self.frontend_extractor.close()
             self.planner.close()
             self.doc_extractor.close()
+            if self.cache:
+                print(f"🗄️  Extraction cache: {self.cache.report()}")
+                self.cache.close()
+            self.write_metrics()
         except Exception as e:
             print(f"Warning: Error during cleanup: {str(e)}")
 
+    def write_metrics(self):
+        """Write the run report as JSON and, if configured, as a Prometheus textfile"""
+        self.metrics.finish()
+        self.metrics.set_info("writers", {
+            "java": self.java_extractor.writer.stats(),
+            "database": self.db_extractor.writer.stats(),
+            "frontend": self.frontend_extractor.writer.stats()
+        })
+        self.metrics.set_info("prefilter", self.prefilter.report())
+        if self.cache:
+            self.metrics.set_info("cache", self.cache.stats())
+        if self.sink:
+            self.metrics.set_info("async_writes", self.sink.report())
+        if self.doc_extractor._embeddings is not None:
+            self.metrics.set_info("embeddings", self.doc_extractor._embeddings.stats())
+
+        written = []
+        if self.metrics_path:
+            self.metrics.write_json(self.metrics_path)
+            written.append(self.metrics_path)
+        if self.prometheus_path:
+            self.metrics.write_prometheus(self.prometheus_path)
+            written.append(self.prometheus_path)
+        destination = f" → {', '.join(written)}" if written else ""
+        print(f"📈 Run metrics: {self.metrics.summary()}{destination}")
+
 def main():
-    # Get source directory from environment variable or use default
+    # Get source directory from environment variable or use default. Several
+    # roots separated by os.pathsep (':' on Unix) are extracted concurrently
+    # as separate projects into the same graph.
     source_dir = os.getenv('SOURCE_DIR', "/Users/jaiganeshg/projects/logicshift/jboss-eap-quickstarts/kitchensink")
+    if os.pathsep in source_dir:
+        source_dir = [root for root in source_dir.split(os.pathsep) if root]
     
-    # Neo4j connection details from environment variables or defaults
+    # Graph store from environment variables or defaults: a Neo4j URI, or
+    # memory:// or sqlite:///path/graph.db for the embedded store
     neo4j_uri = os.getenv('NEO4J_URI', "bolt://localhost:7687")
     neo4j_user = os.getenv('NEO4J_USER', "neo4j")
     neo4j_password = os.getenv('NEO4J_PASSWORD', "password")
 
+    # Set EXTRACTION_INCREMENTAL=0 to re-extract every file, e.g. after wiping the graph
+    incremental = os.getenv('EXTRACTION_INCREMENTAL', "1") != "0"
+    # Set GRAPH_ASYNC_WRITES=0 to write each batch synchronously before parsing continues
+    async_writes = os.getenv('GRAPH_ASYNC_WRITES', "1") != "0"
+    # Set GRAPH_SNAPSHOT to a path to export the extracted graph there
+    snapshot_path = os.getenv('GRAPH_SNAPSHOT') or None
+
     extractor = KnowledgeExtraction(
         source_dir=source_dir,
         neo4j_uri=neo4j_uri,
         neo4j_user=neo4j_user,
-        neo4j_password=neo4j_password
+        neo4j_password=neo4j_password,
+        incremental=incremental,
+        async_writes=async_writes,
+        snapshot_path=snapshot_path
     )
     
     extractor.extract_all()
@@ -1,165 +1,142 @@
+import json
 import os
-from bs4 import BeautifulSoup
-from neo4j import GraphDatabase
+from utils.source_scanner import scan_source_tree
+from utils.graph_writer import BatchGraphWriter, NodeRef
+from utils.graph_store import open_graph_store
+from utils.page_parser import collect_page
+
+# Pages whose subgraphs are written together in one transaction
+PAGES_PER_BATCH = int(os.getenv("FRONTEND_PAGES_PER_BATCH", "100"))
 
 class FrontendExtractor:
-    def __init__(self, uri, user, password):
-        self.driver = GraphDatabase.driver(uri, auth=(user, password))
+    def __init__(self, uri, user, password, batch_size=None, flush_interval=None, pages_per_batch=None):
+        self.store = open_graph_store(uri, user, password)
+        self.writer = BatchGraphWriter(self.store, batch_size, flush_interval)
+        self.pages_per_batch = pages_per_batch or PAGES_PER_BATCH
+        self.pending_pages = 0
 
     def close(self):
-        self.driver.close()
+        self.writer.close()
+        print(f"📝 Frontend components: {self.writer.report()}")
+        self.store.close()
+
+    def flush(self):
+        """Write buffered nodes and relationships to the graph store"""
+        self.writer.flush()
+        self.pending_pages = 0
+
+    def page_added(self):
+        """Count a fully buffered page subgraph and write the batch once it holds enough pages"""
+        self.pending_pages += 1
+        if self.pending_pages >= self.pages_per_batch:
+            self.flush()
 
     def execute_query(self, query, params={}):
-        """Execute Cypher query in Neo4j"""
-        with self.driver.session() as session:
-            session.run(query, params)
+        """Execute Cypher query (Neo4j stores only)"""
+        self.store.query(query, params)
 
     def add_page(self, name, file_path, template_type):
         """Store page information in the graph"""
-        query = """
-        MERGE (p:Page {name: $name})
-        SET p.filePath = $file_path,
-            p.templateType = $template_type
-        """
-        self.execute_query(query, {
-            "name": name,
-            "file_path": file_path,
-            "template_type": template_type
+        self.writer.merge_node("Page", {"name": name}, {
+            "filePath": file_path,
+            "templateType": template_type
         })
 
     def add_form(self, page_name, form_id, action, method):
         """Store form information"""
-        query = """
-        MATCH (p:Page {name: $page_name})
-        MERGE (f:Form {id: $form_id})
-        SET f.action = $action,
-            f.method = $method
-        MERGE (p)-[:CONTAINS]->(f)
-        """
-        self.execute_query(query, {
-            "page_name": page_name,
-            "form_id": form_id or "unnamed_form",
-            "action": action,
-            "method": method
-        })
+        self.writer.merge_edge(
+            NodeRef("Page", {"name": page_name}, merge=False),
+            "CONTAINS",
+            NodeRef("Form", {"id": form_id or "unnamed_form"}, {"action": action, "method": method})
+        )
 
     def add_form_field(self, page_name, form_id, field_name, field_type, validation=None):
-        """Store form field information"""
-        query = """
-        MATCH (p:Page {name: $page_name})-[:CONTAINS]->(f:Form {id: $form_id})
-        MERGE (field:FormField {name: $field_name})
-        SET field.type = $field_type,
-            field.validation = $validation
-        MERGE (f)-[:HAS_FIELD]->(field)
+        """Store form field information.
+
+        Neo4j only stores primitives and lists of them as properties, so the
+        validation attributes are stored as a JSON object string.
         """
-        self.execute_query(query, {
-            "page_name": page_name,
-            "form_id": form_id or "unnamed_form",
-            "field_name": field_name,
-            "field_type": field_type,
-            "validation": validation
-        })
+        if validation is not None:
+            validation = json.dumps(validation, sort_keys=True)
+        self.writer.merge_edge(
+            NodeRef("Form", {"id": form_id or "unnamed_form"}, merge=False),
+            "HAS_FIELD",
+            NodeRef("FormField", {"name": field_name}, {"type": field_type, "validation": validation})
+        )
 
     def add_template_relationship(self, page_name, template_name):
         """Store template relationships"""
-        query = """
-        MATCH (p:Page {name: $page_name})
-        MERGE (t:Template {name: $template_name})
-        MERGE (p)-[:USES_TEMPLATE]->(t)
-        """
-        self.execute_query(query, {
-            "page_name": page_name,
-            "template_name": template_name
-        })
+        self.writer.merge_edge(
+            NodeRef("Page", {"name": page_name}, merge=False),
+            "USES_TEMPLATE",
+            NodeRef("Template", {"name": template_name})
+        )
 
     def add_resource_dependency(self, page_name, resource_type, resource_path):
         """Store resource dependencies (CSS, JS, etc.)"""
-        query = """
-        MATCH (p:Page {name: $page_name})
-        MERGE (r:Resource {path: $resource_path})
-        SET r.type = $resource_type
-        MERGE (p)-[:DEPENDS_ON]->(r)
-        """
-        self.execute_query(query, {
-            "page_name": page_name,
-            "resource_type": resource_type,
-            "resource_path": resource_path
-        })
+        self.writer.merge_edge(
+            NodeRef("Page", {"name": page_name}, merge=False),
+            "DEPENDS_ON",
+            NodeRef("Resource", {"path": resource_path}, {"type": resource_type})
+        )
 
-def extract_frontend_info(directory, extractor):
+def extract_frontend_info(directory, extractor, manifest=None):
     """Extract information from XHTML and HTML files"""
-    for root, _, files in os.walk(directory):
-        for file in files:
-            if file.endswith(('.xhtml', '.html')):
-                file_path = os.path.join(root, file)
-                template_type = 'xhtml' if file.endswith('.xhtml') else 'html'
-                page_name = os.path.splitext(file)[0]
-
-                try:
-                    with open(file_path, 'r', encoding='utf-8') as f:
-                        content = f.read()
-                        soup = BeautifulSoup(content, 'html.parser')
-
-                        # Add page to graph
-                        extractor.add_page(page_name, file_path, template_type)
-
-                        # Extract forms
-                        forms = soup.find_all('form')
-                        for form in forms:
-                            form_id = form.get('id', 'unnamed_form')
-                            action = form.get('action', '')
-                            method = form.get('method', 'get')
-
-                            extractor.add_form(page_name, form_id, action, method)
-
-                            # Extract form fields
-                            for field in form.find_all(['input', 'select', 'textarea']):
-                                field_name = field.get('name', '')
-                                field_type = field.get('type', field.name)
-                                validation = {
-                                    'required': field.get('required') is not None,
-                                    'pattern': field.get('pattern'),
-                                    'minlength': field.get('minlength'),
-                                    'maxlength': field.get('maxlength')
-                                }
-                                
-                                if field_name:
-                                    extractor.add_form_field(
-                                        page_name, 
-                                        form_id, 
-                                        field_name, 
-                                        field_type, 
-                                        validation
-                                    )
-
-                        # Extract template relationships
-                        templates = soup.find_all(attrs={'template': True})
-                        for template in templates:
-                            template_name = template.get('template')
-                            if template_name:
-                                extractor.add_template_relationship(page_name, template_name)
-
-                        # Extract resource dependencies
-                        # CSS files
-                        for css in soup.find_all('link', rel='stylesheet'):
-                            href = css.get('href')
-                            if href:
-                                extractor.add_resource_dependency(page_name, 'css', href)
-
-                        # JavaScript files
-                        for js in soup.find_all('script', src=True):
-                            src = js.get('src')
-                            if src:
-                                extractor.add_resource_dependency(page_name, 'javascript', src)
-
-                        # Images
-                        for img in soup.find_all('img', src=True):
-                            src = img.get('src')
-                            if src:
-                                extractor.add_resource_dependency(page_name, 'image', src)
-
-                except Exception as e:
-                    print(f"Error processing {file_path}: {str(e)}")
+    if manifest is None:
+        manifest = scan_source_tree(directory)
+
+    for source_file in manifest.pages:
+        extract_page(extractor, source_file.path)
+
+def extract_page(extractor, file_path):
+    """Extract the forms, templates and resources of one XHTML or HTML page"""
+    try:
+        with open(file_path, 'r', encoding='utf-8') as f:
+            content = f.read()
+        add_page_record(extractor, file_path, collect_page_record(content))
+    except Exception as e:
+        print(f"Error processing {file_path}: {str(e)}")
+
+def collect_page_record(content, parser=None):
+    """Collect the forms, templates and resources of a page as a plain dict.
+
+    The page is read in one streaming pass by the chosen parser backend
+    (see utils.page_parser). The record depends only on the page content,
+    not on its path.
+    """
+    return collect_page(content, parser)
+
+def add_page_record(extractor, file_path, record):
+    """Write a page and the contents collected by collect_page_record.
+
+    The whole page subgraph is buffered before anything is written, and
+    is written in the same transaction as the other pages of its batch.
+    """
+    file = os.path.basename(file_path)
+    template_type = 'xhtml' if file.endswith('.xhtml') else 'html'
+    page_name = os.path.splitext(file)[0]
+
+    with extractor.writer.transaction():
+        # Add page to graph
+        extractor.add_page(page_name, file_path, template_type)
+
+        for form in record["forms"]:
+            extractor.add_form(page_name, form["id"], form["action"], form["method"])
+            for field in form["fields"]:
+                extractor.add_form_field(
+                    page_name,
+                    form["id"],
+                    field["name"],
+                    field["type"],
+                    field["validation"]
+                )
+
+        for template_name in record["templates"]:
+            extractor.add_template_relationship(page_name, template_name)
+
+        for resource_type, resource_path in record["resources"]:
+            extractor.add_resource_dependency(page_name, resource_type, resource_path)
+    extractor.page_added()
 
 if __name__ == "__main__":
     directory_path = "/Users/jaiganeshg/projects/logicshift/jboss-eap-quickstarts/kitchensink"
@@ -1,165 +1,190 @@
-from neo4j import GraphDatabase
 import os
 import javalang
-
-# Neo4j Configuration
-NEO4J_URI = "bolt://localhost:7687"
-NEO4J_USER = "neo4j"
-NEO4J_PASS = "password"
+from functools import partial
+from utils.source_scanner import scan_source_tree
+from utils.java_parser import visit_compilation_units
+from utils.java_prefilter import JavaPrefilter
+from utils.java_visitor import JavaNodeVisitor, collect_with_visitor
+from utils.graph_writer import BatchGraphWriter, NodeRef
+from utils.graph_store import open_graph_store
+
+# Enhanced component detection: class annotations that classify a component
+CONTROLLER_ANNOTATIONS = {'Controller', 'RestController', 'Path', 'RequestMapping'}
+SERVICE_ANNOTATIONS = {'Service', 'ApplicationScoped', 'RequestScoped', 'Stateless', 'Stateful'}
+MODEL_ANNOTATIONS = {'Entity', 'Model', 'Document', 'MappedSuperclass'}
+REPOSITORY_ANNOTATIONS = {'Repository', 'PersistenceContext'}
+COMPONENT_ANNOTATIONS = CONTROLLER_ANNOTATIONS | SERVICE_ANNOTATIONS | MODEL_ANNOTATIONS | REPOSITORY_ANNOTATIONS
+
+# Graph store configuration: a Neo4j URI, or memory:// / sqlite:///path for the embedded store
+NEO4J_URI = os.getenv("NEO4J_URI", "bolt://localhost:7687")
+NEO4J_USER = os.getenv("NEO4J_USER", "neo4j")
+NEO4J_PASS = os.getenv("NEO4J_PASSWORD", "password")
 
 class KnowledgeGraphBuilder:
-    def __init__(self):
-        self.driver = GraphDatabase.driver(NEO4J_URI, auth=(NEO4J_USER, NEO4J_PASS))
+    def __init__(self, batch_size=None, flush_interval=None, uri=NEO4J_URI, user=NEO4J_USER, password=NEO4J_PASS):
+        self.store = open_graph_store(uri, user, password)
+        self.writer = BatchGraphWriter(self.store, batch_size, flush_interval)
 
     def close(self):
-        self.driver.close()
+        self.writer.close()
+        print(f"📝 Java components: {self.writer.report()}")
+        self.store.close()
+
+    def flush(self):
+        self.writer.flush()
 
     def execute_query(self, query, params={}):
-        with self.driver.session() as session:
-            session.run(query, params)
+        self.store.query(query, params)
+
+    def _add_component(self, label, name, package, file_path):
+        # Every class is a Component keyed by name; its role is an extra label
+        self.writer.merge_node("Component", {"name": name}, {
+            "package": package,
+            "filePath": file_path,
+            "type": label
+        }, labels=(label,))
 
     def add_jakarta_controller(self, name, package, file_path):
-        query = """
-        MERGE (c:Controller {name: $name})
-        SET c.package = $package, 
-            c.filePath = $file_path,
-            c.type = 'Controller'
-        """
-        self.execute_query(query, {"name": name, "package": package, "file_path": file_path})
+        self._add_component("Controller", name, package, file_path)
 
     def add_service(self, name, package, file_path):
-        query = """
-        MERGE (s:Service {name: $name})
-        SET s.package = $package, 
-            s.filePath = $file_path,
-            s.type = 'Service'
-        """
-        self.execute_query(query, {"name": name, "package": package, "file_path": file_path})
+        self._add_component("Service", name, package, file_path)
 
     def add_model(self, name, package, file_path):
-        query = """
-        MERGE (m:Model {name: $name})
-        SET m.package = $package, 
-            m.filePath = $file_path,
-            m.type = 'Model'
-        """
-        self.execute_query(query, {"name": name, "package": package, "file_path": file_path})
+        self._add_component("Model", name, package, file_path)
 
     def add_repository(self, name, package, file_path):
-        query = """
-        MERGE (r:Repository {name: $name})
-        SET r.package = $package, 
-            r.filePath = $file_path,
-            r.type = 'Repository'
-        """
-        self.execute_query(query, {"name": name, "package": package, "file_path": file_path})
+        self._add_component("Repository", name, package, file_path)
 
     def add_dependency(self, caller, callee):
-        query = """
-        MERGE (a {name: $caller})
-        MERGE (b {name: $callee})
-        MERGE (a)-[:DEPENDS_ON]->(b)
-        """
-        self.execute_query(query, {"caller": caller, "callee": callee})
+        self.writer.merge_edge(
+            NodeRef("Component", {"name": caller}),
+            "DEPENDS_ON",
+            NodeRef("Component", {"name": callee})
+        )
 
     def add_controller_action(self, controller_name, method_name, http_method, path):
-        query = """
-        MATCH (c:Controller {name: $controller_name})
-        MERGE (a:Action {name: $method_name})
-        SET a.httpMethod = $http_method,
-            a.path = $path
-        MERGE (c)-[:HAS_ACTION]->(a)
-        """
-        self.execute_query(query, {
-            "controller_name": controller_name,
-            "method_name": method_name,
-            "http_method": http_method,
-            "path": path
-        })
+        self.writer.merge_edge(
+            NodeRef("Controller", {"name": controller_name}, merge=False),
+            "HAS_ACTION",
+            NodeRef("Action", {"name": method_name}, {"httpMethod": http_method, "path": path})
+        )
 
 
 # Function to parse Java files
-def parse_java_files(directory, graph):
-    for root, _, files in os.walk(directory):
-        for file in files:
-            if file.endswith(".java"):
-                file_path = os.path.join(root, file)
-                with open(file_path, "r", encoding="utf-8") as f:
-                    source_code = f.read()
-
-                try:
-                    tree = javalang.parse.parse(source_code)
-                except javalang.parser.JavaSyntaxError:
-                    print(f"⚠️ Syntax error in {file_path}, skipping...")
-                    continue
-
-                package = None
-                class_name = None
-                annotations = set()
-                field_types = set()
-
-                # Extract package name
-                for path, node in tree:
-                    if isinstance(node, javalang.tree.PackageDeclaration):
-                        package = node.name
-
-                # Extract class names, annotations and field types
-                for path, node in tree:
-                    if isinstance(node, javalang.tree.ClassDeclaration):
-                        class_name = node.name
-                        for annotation in node.annotations:
-                            annotations.add(annotation.name)
-                    
-                    # Collect field types for dependency analysis
-                    if isinstance(node, javalang.tree.FieldDeclaration):
-                        for declarator in node.declarators:
-                            if hasattr(node.type, 'name'):
-                                field_types.add(node.type.name)
-
-                # Enhanced component detection
-                controller_annotations = {'Controller', 'RestController', 'Path', 'RequestMapping'}
-                service_annotations = {'Service', 'ApplicationScoped', 'RequestScoped', 'Stateless', 'Stateful'}
-                model_annotations = {'Entity', 'Model', 'Document', 'MappedSuperclass'}
-                repository_annotations = {'Repository', 'PersistenceContext'}
-
-                # Make controller detection take precedence
-                if annotations.intersection(controller_annotations):
-                    graph.add_jakarta_controller(class_name, package, file_path)
-                elif annotations.intersection(service_annotations):
-                    graph.add_service(class_name, package, file_path)
-                elif annotations.intersection(repository_annotations):
-                    graph.add_repository(class_name, package, file_path)
-                elif annotations.intersection(model_annotations):
-                    graph.add_model(class_name, package, file_path)
-
-                # Parse controller methods
-                for path, node in tree:
-                    if isinstance(node, javalang.tree.MethodDeclaration):
-                        parse_controller_methods(node, class_name, node.annotations, graph)
-
-                # Add dependencies based on field types and method parameters
-                for field_type in field_types:
-                    if class_name and field_type != class_name:  # Avoid self-references
-                        graph.add_dependency(class_name, field_type)
-
-                # Detect method dependencies
-                for path, node in tree:
-                    if isinstance(node, javalang.tree.MethodInvocation):
-                        if node.qualifier and node.qualifier != class_name:
-                            graph.add_dependency(class_name, node.qualifier)
-                    
-                    # Add parameter type dependencies
-                    if isinstance(node, javalang.tree.MethodDeclaration):
-                        for param in node.parameters:
-                            if hasattr(param.type, 'name'):
-                                param_type = param.type.name
-                                if param_type != class_name:
-                                    graph.add_dependency(class_name, param_type)
+def parse_java_files(directory, graph, manifest=None):
+    if manifest is None:
+        manifest = scan_source_tree(directory)
+
+    java_files = JavaPrefilter.for_collectors({"components": ComponentVisitor}).filter(manifest.java_files)
+    visit_compilation_units(java_files, [partial(extract_components, graph)])
+
+def extract_components(graph, file_path, tree):
+    """Visitor: add the components and dependencies of one parsed Java file"""
+    add_component_record(graph, collect_component_record(file_path, tree))
+
+class ComponentVisitor(JavaNodeVisitor):
+    """Collects the component facts of one Java file in the shared AST walk"""
+
+    relevant_annotations = COMPONENT_ANNOTATIONS
+
+    def __init__(self, file_path):
+        super().__init__(file_path)
+        self.package = None
+        self.class_name = None
+        self.annotations = set()
+        self.field_types = set()
+        self.actions = []
+        self.invocations = []
+        self.parameter_types = []
+
+    def visit_PackageDeclaration(self, node):
+        self.package = node.name
+
+    def visit_ClassDeclaration(self, node):
+        self.class_name = node.name
+        for annotation in node.annotations:
+            self.annotations.add(annotation.name)
+
+    def visit_FieldDeclaration(self, node):
+        # Collect field types for dependency analysis
+        if node.declarators and hasattr(node.type, 'name'):
+            self.field_types.add(node.type.name)
+
+    def visit_MethodDeclaration(self, node):
+        # Parse controller methods
+        action = controller_action(node)
+        if action:
+            self.actions.append(action)
+
+        # Collect parameter types
+        for param in node.parameters:
+            if hasattr(param.type, 'name'):
+                self.parameter_types.append(param.type.name)
+
+    def visit_MethodInvocation(self, node):
+        # Detect method dependencies
+        if node.qualifier:
+            self.invocations.append(node.qualifier)
+
+    def record(self):
+        return {
+            "file_path": self.file_path,
+            "package": self.package,
+            "class_name": self.class_name,
+            "annotations": sorted(self.annotations),
+            "field_types": sorted(self.field_types),
+            "actions": self.actions,
+            "invocations": self.invocations,
+            "parameter_types": self.parameter_types
+        }
+
+def collect_component_record(file_path, tree):
+    """Collect the component facts of one parsed Java file as a plain dict.
+
+    The record only holds strings and lists, so it can be produced in a
+    worker process and written to the graph by the parent.
+    """
+    return collect_with_visitor(file_path, tree, ComponentVisitor)
+
+def add_component_record(graph, record):
+    """Write the components, actions and dependencies of a component record"""
+    class_name = record["class_name"]
+    package = record["package"]
+    file_path = record["file_path"]
+    annotations = set(record["annotations"])
+
+    # Make controller detection take precedence
+    if annotations.intersection(CONTROLLER_ANNOTATIONS):
+        graph.add_jakarta_controller(class_name, package, file_path)
+    elif annotations.intersection(SERVICE_ANNOTATIONS):
+        graph.add_service(class_name, package, file_path)
+    elif annotations.intersection(REPOSITORY_ANNOTATIONS):
+        graph.add_repository(class_name, package, file_path)
+    elif annotations.intersection(MODEL_ANNOTATIONS):
+        graph.add_model(class_name, package, file_path)
+    else:
+        # Unclassified classes are not part of the component graph, which
+        # lets the pre-filter skip parsing them altogether
+        return
 
-def parse_controller_methods(node, class_name, annotations, graph):
-    if not isinstance(node, javalang.tree.MethodDeclaration):
+    for method_name, http_method, path in record["actions"]:
+        graph.add_controller_action(class_name, method_name, http_method, path)
+
+    if not class_name:
         return
 
+    # Add dependencies based on field types, method invocations and parameters
+    for field_type in record["field_types"]:
+        if field_type != class_name:  # Avoid self-references
+            graph.add_dependency(class_name, field_type)
+
+    for dependency in record["invocations"] + record["parameter_types"]:
+        if dependency != class_name:
+            graph.add_dependency(class_name, dependency)
+
+def controller_action(node):
+    """Return (method_name, http_method, path) for a REST/Web endpoint method, else None"""
     method_name = node.name
     http_method = None
     path = None
@@ -177,7 +202,16 @@ def parse_controller_methods(node, class_name, annotations, graph):
                 path = annotation.element.value.strip('"\'')
 
     if http_method or path:
-        graph.add_controller_action(class_name, method_name, http_method, path)
+        return (method_name, http_method, path)
+    return None
+
+def parse_controller_methods(node, class_name, annotations, graph):
+    if not isinstance(node, javalang.tree.MethodDeclaration):
+        return
+
+    action = controller_action(node)
+    if action:
+        graph.add_controller_action(class_name, *action)
 
 
 if __name__ == "__main__":
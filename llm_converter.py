@@ -1,11 +1,14 @@
 import os
-import google.generativeai as genai
-from typing import Dict, List
+from typing import Dict, List, Optional
 import shutil
 import re
+from utils.ignore_rules import IgnoreRules, IgnoreStats, walk_tree
 
 class LLMConverter:
     def __init__(self, api_key: str):
+        # Imported here so that loading the module stays fast
+        import google.generativeai as genai
+
         genai.configure(api_key=api_key)
         self.model = genai.GenerativeModel('gemini-pro')
         
@@ -119,7 +122,7 @@ def convert_path(path: str) -> str:
     # Keep Java files in their structure
     return path
 
-def copy_static_resources(source_dir: str, target_dir: str) -> Dict[str, int]:
+def copy_static_resources(source_dir: str, target_dir: str, rules: Optional[IgnoreRules] = None) -> Dict[str, int]:
     """Copy static resources and return statistics"""
     stats = {
         'copied': 0,
@@ -131,7 +134,8 @@ def copy_static_resources(source_dir: str, target_dir: str) -> Dict[str, int]:
         '.svg', '.ico', '.woff', '.woff2', '.ttf', '.eot'
     }
     
-    for root, _, files in os.walk(source_dir):
+    # Ignored directories (build output, node_modules, ...) are never entered
+    for root, _, files in walk_tree(source_dir, rules):
         for file in files:
             if any(file.lower().endswith(ext) for ext in static_extensions):
                 source_path = os.path.join(root, file)
@@ -195,14 +199,19 @@ def convert_project(source_dir: str, target_dir: str, api_key: str):
     
     # Create target directory structure
     os.makedirs(target_dir, exist_ok=True)
+
+    # Build output, dependencies and whatever .migratorignore lists are
+    # pruned from both walks
+    rules = IgnoreRules.for_root(source_dir)
+    ignored = IgnoreStats()
     
     # First, copy all static resources
     print("\n📦 Copying static resources...")
-    resource_stats = copy_static_resources(source_dir, target_dir)
+    resource_stats = copy_static_resources(source_dir, target_dir, rules)
     stats["static_resources"] = resource_stats
     
     # Then process all files
-    for root, _, files in os.walk(source_dir):
+    for root, _, files in walk_tree(source_dir, rules, ignored):
         for file in files:
             source_path = os.path.join(root, file)
             rel_path = os.path.relpath(source_path, source_dir)
@@ -260,6 +269,8 @@ def convert_project(source_dir: str, target_dir: str, api_key: str):
     print(f"📦 Static Resources: {stats['static_resources']['copied']} copied, {stats['static_resources']['failed']} failed")
     print(f"❌ Failed: {stats['failed']} files")
     print(f"⏭️  Skipped: {stats['skipped']} files")
+    print(f"🙈 Ignored: {ignored.report()}")
+    stats["ignored"] = {"dirs": ignored.dirs, "files": ignored.files, "bytes": ignored.bytes}
     
     return stats
 
@@ -5,17 +5,18 @@ from converters.entity_converter import EntityConverter
 from converters.view_converter import ViewConverter
 from utils.resource_handler import *
 from utils.neo4j_handler import get_file_metadata
+from utils.ignore_rules import IgnoreRules, IgnoreStats, walk_tree
 from typing import Dict
 import os
 
 class MigrationManager:
-    def __init__(self, api_key: str):
+    def __init__(self, api_key: str, model=None):
         self.converters = {
-            "Controller": ControllerConverter(api_key),
-            "Service": ServiceConverter(api_key),
-            "Repository": RepositoryConverter(api_key),
-            "Entity": EntityConverter(api_key),
-            "View": ViewConverter(api_key)
+            "Controller": ControllerConverter(api_key, model),
+            "Service": ServiceConverter(api_key, model),
+            "Repository": RepositoryConverter(api_key, model),
+            "Entity": EntityConverter(api_key, model),
+            "View": ViewConverter(api_key, model)
         }
     
     def convert_project(self, source_dir: str, target_dir: str):
@@ -34,14 +35,19 @@ class MigrationManager:
         
         # Create target directory structure
         os.makedirs(target_dir, exist_ok=True)
+
+        # Build output, dependencies and whatever .migratorignore lists are
+        # pruned from both walks
+        rules = IgnoreRules.for_root(source_dir)
+        ignored = IgnoreStats()
         
         # First, copy all static resources
         print("\n📦 Copying static resources...")
-        resource_stats = copy_static_resources(source_dir, target_dir)
+        resource_stats = copy_static_resources(source_dir, target_dir, rules)
         stats["static_resources"] = resource_stats
         
         # Walk through source directory
-        for root, _, files in os.walk(source_dir):
+        for root, _, files in walk_tree(source_dir, rules, ignored):
             for file in files:
                 source_path = os.path.join(root, file)
                 rel_path = os.path.relpath(source_path, source_dir)
@@ -111,5 +117,7 @@ class MigrationManager:
         print(f"📦 Static Resources: {stats['static_resources']['copied']} copied, {stats['static_resources']['failed']} failed")
         print(f"❌ Failed: {stats['failed']} files")
         print(f"⏭️  Skipped: {stats['skipped']} files")
+        print(f"🙈 Ignored: {ignored.report()}")
+        stats["ignored"] = {"dirs": ignored.dirs, "files": ignored.files, "bytes": ignored.bytes}
         
         return stats 
\ No newline at end of file
@@ -1,400 +1,370 @@
-from neo4j import GraphDatabase
+import json
+import os
+from concurrent.futures import ThreadPoolExecutor
+from utils.graph_store import open_graph_store
+
+# Reads behind the report. Sections share them, so each runs once per report.
+REPORT_READS = (
+    "component_summary",
+    "database_info",
+    "table_columns",
+    "entity_details",
+    "page_templates",
+    "page_forms",
+    "resource_usage",
+)
+
+# Report reads issued at the same time over the shared driver
+READ_WORKERS = int(os.getenv("PLANNER_READ_WORKERS", str(len(REPORT_READS))))
+
+BACKEND_TYPES = ("Controller", "Service", "Repository", "Model")
 
 class MigrationPlanner:
-    def __init__(self, uri, user, password):
-        self.driver = GraphDatabase.driver(uri, auth=(user, password))
+    def __init__(self, uri, user, password, project=None, read_workers=None):
+        self.store = open_graph_store(uri, user, password)
+        # In a graph shared by several projects, only this project is analyzed
+        self.project = project
+        self.read_workers = read_workers or READ_WORKERS
 
     def close(self):
-        self.driver.close()
+        self.store.close()
+
+    def fetch(self):
+        """Run every report read once, concurrently, and return {read name: rows}"""
+        # An embedded store answers in process under one lock, with no round trip to overlap
+        if self.read_workers <= 1 or self.store.embedded:
+            return {name: self.store.read(name, project=self.project) for name in REPORT_READS}
+        with ThreadPoolExecutor(max_workers=self.read_workers, thread_name_prefix="planner") as pool:
+            futures = {name: pool.submit(self.store.read, name, project=self.project) for name in REPORT_READS}
+            return {name: future.result() for name, future in futures.items()}
 
     def analyze_project(self):
         """Analyze the project and generate migration recommendations"""
+        # Every section is derived in memory from one set of reads
+        data = self.fetch()
         report = []
         
         # Backend Analysis
-        report.extend(self._analyze_backend_components())
+        report.extend(self._analyze_backend_components(data))
         
         # Database Analysis
-        report.extend(self._analyze_database())
+        report.extend(self._analyze_database(data))
         
         # Frontend Analysis
-        report.extend(self._analyze_frontend())
+        report.extend(self._analyze_frontend(data))
         
         # Add detailed migration steps
-        report.extend(self._generate_migration_steps())
+        report.extend(self._generate_migration_steps(data))
         
         # Migration Recommendations
-        report.extend(self._generate_recommendations())
+        report.extend(self._generate_recommendations(data))
         
         return report
 
-    def _analyze_backend_components(self):
+    @staticmethod
+    def _component_type(record):
+        """A component's type: its first label other than Component"""
+        return record["roles"][0] if record["roles"] else None
+
+    def _analyze_backend_components(self, data):
         """Analyze backend components and their relationships"""
         report = [
             "\n=== Backend Components Analysis ===\n",
             "📊 Component Overview:"
         ]
         
-        # Query to get all components and their relationships
-        query = """
-        MATCH (n)
-        WHERE n:Controller OR n:Service OR n:Repository OR n:Model OR n:Entity
-        OPTIONAL MATCH (n)-[r]->(m)
-        RETURN n.name as name, 
-               labels(n)[0] as type,
-               n.package as package,
-               collect(distinct type(r)) as relationships,
-               collect(distinct m.name) as dependencies
-        """
-        
-        with self.driver.session() as session:
-            results = session.run(query)
+        # All components and their relationships
+        results = data["component_summary"]
             
-            # Group components by type
-            components = {}
-            for record in results:
-                comp_type = record["type"]
-                if comp_type not in components:
-                    components[comp_type] = []
-                components[comp_type].append({
-                    "name": record["name"],
-                    "package": record["package"],
-                    "relationships": record["relationships"],
-                    "dependencies": record["dependencies"]
-                })
+        # Group components by type
+        components = {}
+        for record in results:
+            comp_type = self._component_type(record)
+            if comp_type not in components:
+                components[comp_type] = []
+            components[comp_type].append({
+                "name": record["name"],
+                "package": record["package"],
+                "relationships": record["relationships"],
+                "dependencies": record["dependencies"]
+            })
             
-            # Generate report for each component type
-            for comp_type, comps in components.items():
-                report.append(f"\n🔹 {comp_type}s ({len(comps)} found):")
-                for comp in comps:
-                    report.append(f"\n  - {comp['name']}")
-                    if comp['package']:
-                        report.append(f"    Package: {comp['package']}")
-                    if comp['dependencies']:
-                        report.append(f"    Dependencies: {', '.join(filter(None, comp['dependencies']))}")
-                    if comp['relationships']:
-                        report.append(f"    Relationships: {', '.join(filter(None, comp['relationships']))}")
+        # Generate report for each component type
+        for comp_type, comps in components.items():
+            report.append(f"\n🔹 {comp_type}s ({len(comps)} found):")
+            for comp in comps:
+                report.append(f"\n  - {comp['name']}")
+                if comp['package']:
+                    report.append(f"    Package: {comp['package']}")
+                if comp['dependencies']:
+                    report.append(f"    Dependencies: {', '.join(filter(None, comp['dependencies']))}")
+                if comp['relationships']:
+                    report.append(f"    Relationships: {', '.join(filter(None, comp['relationships']))}")
 
         return report
 
-    def _analyze_database(self):
+    def _analyze_database(self, data):
         """Analyze database structure and configurations"""
         report = ["\n=== Database Analysis ===\n"]
         
-        with self.driver.session() as session:
-            # Get database type and configuration
-            db_info = session.run("""
-                MATCH (db:Database)
-                RETURN db.type as type, db.configFile as config
-                LIMIT 1
-            """)
-            db_record = db_info.single()
-            if db_record:
-                report.extend([
-                    "🔹 Database Configuration:",
-                    f"  Type: {db_record['type']}",
-                    f"  Config File: {db_record['config']}\n"
-                ])
+        # Get database type and configuration
+        db_record = next(iter(data["database_info"]), None)
+        if db_record:
+            report.extend([
+                "🔹 Database Configuration:",
+                f"  Type: {db_record['type']}",
+                f"  Config File: {db_record['config']}\n"
+            ])
 
-            # Get table structures
-            tables = session.run("""
-                MATCH (t:Table)
-                OPTIONAL MATCH (t)-[:HAS_COLUMN]->(c:Column)
-                RETURN t.name as table,
-                       collect({
-                           name: c.name,
-                           type: c.type,
-                           constraints: c.constraints
-                       }) as columns
-            """)
+        # Get table structures
+        tables = data["table_columns"]
             
-            report.append("🔹 Table Structures:")
-            for record in tables:
-                report.append(f"\n  Table: {record['table']}")
-                for column in record["columns"]:
-                    constraints = column["constraints"] or []
-                    constraint_str = f" [{', '.join(constraints)}]" if constraints else ""
-                    report.append(f"    • {column['name']} ({column['type']}){constraint_str}")
+        report.append("🔹 Table Structures:")
+        for record in tables:
+            report.append(f"\n  Table: {record['table']}")
+            for column in record["columns"]:
+                constraints = column["constraints"] or []
+                constraint_str = f" [{', '.join(constraints)}]" if constraints else ""
+                report.append(f"    • {column['name']} ({column['type']}){constraint_str}")
 
-            # Get entity details including methods and variables
-            entities = session.run("""
-                MATCH (e:Entity)
-                RETURN e.name as name,
-                       e.variables as variables,
-                       e.methods as methods
-            """)
+        # Get entity details including methods and variables
+        entities = data["entity_details"]
             
-            report.append("\n🔹 Entity Details:")
-            for record in entities:
-                report.append(f"\n  Entity: {record['name']}")
+        report.append("\n🔹 Entity Details:")
+        for record in entities:
+            report.append(f"\n  Entity: {record['name']}")
                 
-                # Report variables/fields
-                if record['variables']:
-                    report.append("    Variables:")
-                    for var in record['variables']:
-                        annotations = var.get('annotations', [])
-                        annotation_str = f" [{', '.join(annotations)}]" if annotations else ""
-                        report.append(f"      • {var['name']} ({var['type']}){annotation_str}")
+            # Report variables/fields
+            if record['variables']:
+                report.append("    Variables:")
+                for var in record['variables']:
+                    annotations = var.get('annotations', [])
+                    annotation_str = f" [{', '.join(annotations)}]" if annotations else ""
+                    report.append(f"      • {var['name']} ({var['type']}){annotation_str}")
                 
-                # Report methods
-                if record['methods']:
-                    report.append("    Methods:")
-                    for method in record['methods']:
-                        params = [f"{p['type']} {p['name']}" for p in method['parameters']]
-                        param_str = ", ".join(params)
-                        annotations = method.get('annotations', [])
-                        annotation_str = f" [{', '.join(annotations)}]" if annotations else ""
-                        report.append(f"      • {method['name']}({param_str}) -> {method['return_type']}{annotation_str}")
+            # Report methods
+            if record['methods']:
+                report.append("    Methods:")
+                for method in record['methods']:
+                    params = [f"{p['type']} {p['name']}" for p in method['parameters']]
+                    param_str = ", ".join(params)
+                    annotations = method.get('annotations', [])
+                    annotation_str = f" [{', '.join(annotations)}]" if annotations else ""
+                    report.append(f"      • {method['name']}({param_str}) -> {method['return_type']}{annotation_str}")
 
         return report
 
-    def _analyze_frontend(self):
+    def _analyze_frontend(self, data):
         """Analyze frontend components and templates"""
         report = ["\n=== Frontend Analysis ===\n"]
 
-        with self.driver.session() as session:
-            # Analyze pages and templates
-            report.append("🔹 Pages and Templates:")
-            pages = session.run("""
-                MATCH (p:Page)
-                OPTIONAL MATCH (p)-[:USES_TEMPLATE]->(t:Template)
-                RETURN p.name as page,
-                       p.filePath as path,
-                       p.templateType as type,
-                       collect(distinct t.name) as templates
-            """)
+        # Analyze pages and templates
+        report.append("🔹 Pages and Templates:")
+        pages = data["page_templates"]
             
-            for record in pages:
-                page_type = record["type"] or "html"
-                templates = record["templates"]
-                template_str = f" (uses templates: {', '.join(templates)})" if templates and templates[0] else ""
-                report.extend([
-                    f"\n  - {record['page']}.{page_type}",
-                    f"    Path: {record['path']}{template_str}"
-                ])
+        for record in pages:
+            page_type = record["type"] or "html"
+            templates = record["templates"]
+            template_str = f" (uses templates: {', '.join(templates)})" if templates and templates[0] else ""
+            report.extend([
+                f"\n  - {record['page']}.{page_type}",
+                f"    Path: {record['path']}{template_str}"
+            ])
 
-            # Analyze forms
-            report.append("\n🔹 Forms and Validations:")
-            forms = session.run("""
-                MATCH (p:Page)-[:CONTAINS]->(f:Form)
-                OPTIONAL MATCH (f)-[:HAS_FIELD]->(field:FormField)
-                RETURN p.name as page,
-                       f.id as form_id,
-                       f.action as action,
-                       f.method as method,
-                       collect({
-                           name: field.name,
-                           type: field.type,
-                           validation: field.validation
-                       }) as fields
-            """)
+        # Analyze forms
+        report.append("\n🔹 Forms and Validations:")
+        forms = data["page_forms"]
             
-            for record in forms:
-                report.extend([
-                    f"\n  Form: {record['form_id']} in {record['page']}",
-                    f"    Action: {record['action']}",
-                    f"    Method: {record['method']}",
-                    "    Fields:"
-                ])
+        for record in forms:
+            report.extend([
+                f"\n  Form: {record['form_id']} in {record['page']}",
+                f"    Action: {record['action']}",
+                f"    Method: {record['method']}",
+                "    Fields:"
+            ])
                 
-                for field in record["fields"]:
-                    validation = field["validation"]
-                    validation_str = ""
-                    if validation:
-                        validations = []
-                        if validation.get("required"):
-                            validations.append("required")
-                        if validation.get("pattern"):
-                            validations.append(f"pattern={validation['pattern']}")
-                        if validation.get("minlength"):
-                            validations.append(f"minlength={validation['minlength']}")
-                        if validation.get("maxlength"):
-                            validations.append(f"maxlength={validation['maxlength']}")
-                        if validations:
-                            validation_str = f" [{', '.join(validations)}]"
-                    report.append(f"      • {field['name']} ({field['type']}){validation_str}")
+            for field in record["fields"]:
+                validation = field["validation"]
+                if isinstance(validation, str):
+                    validation = json.loads(validation)
+                validation_str = ""
+                if validation:
+                    validations = []
+                    if validation.get("required"):
+                        validations.append("required")
+                    if validation.get("pattern"):
+                        validations.append(f"pattern={validation['pattern']}")
+                    if validation.get("minlength"):
+                        validations.append(f"minlength={validation['minlength']}")
+                    if validation.get("maxlength"):
+                        validations.append(f"maxlength={validation['maxlength']}")
+                    if validations:
+                        validation_str = f" [{', '.join(validations)}]"
+                report.append(f"      • {field['name']} ({field['type']}){validation_str}")
 
-            # Analyze resource dependencies
-            report.append("\n🔹 Resource Dependencies:")
-            resources = session.run("""
-                MATCH (p:Page)-[:DEPENDS_ON]->(r:Resource)
-                WITH r.type as type, count(r) as count, 
-                     collect(distinct {path: r.path, page: p.name}) as resources
-                RETURN type, count, resources
-            """)
+        # Analyze resource dependencies
+        report.append("\n🔹 Resource Dependencies:")
+        resources = data["resource_usage"]
             
-            for record in resources:
-                report.append(f"\n  {record['type'].title()} Files ({record['count']}):")
-                for resource in record["resources"]:
-                    report.append(f"    • {resource['path']}")
-                    report.append(f"      Used in: {resource['page']}")
+        for record in resources:
+            report.append(f"\n  {record['type'].title()} Files ({record['count']}):")
+            for resource in record["resources"]:
+                report.append(f"    • {resource['path']}")
+                report.append(f"      Used in: {resource['page']}")
 
         return report
 
-    def _generate_migration_steps(self):
+    def _generate_migration_steps(self, data):
         """Generate specific migration steps for each component"""
         report = ["\n=== Detailed Migration Steps ===\n"]
         
-        with self.driver.session() as session:
-            # Get all components that need migration
-            components = session.run("""
-                MATCH (n)
-                WHERE n:Controller OR n:Service OR n:Repository OR n:Model OR n:Entity
-                OPTIONAL MATCH (n)-[:HAS_COLUMN]->(c:Column)
-                RETURN n.name as name,
-                       labels(n)[0] as type,
-                       n.package as package,
-                       collect({
-                           name: c.name,
-                           type: c.type,
-                           constraints: COALESCE(c.constraints, [])
-                       }) as columns
-            """)
+        # Get all components that need migration
+        components = data["component_summary"]
             
-            for record in components:
-                name = record["name"]
-                comp_type = record["type"]
-                package = record["package"]
-                columns = record["columns"]
+        for record in components:
+            name = record["name"]
+            comp_type = self._component_type(record)
+            package = record["package"]
+            # A component without columns lists one empty field, as the
+            # report always has
+            columns = record["columns"] or [{"name": None, "type": None, "constraints": []}]
                 
-                report.append(f"\n🔹 {name} ({comp_type}):")
-                report.append(f"  Source Package: {package}")
+            report.append(f"\n🔹 {name} ({comp_type}):")
+            report.append(f"  Source Package: {package}")
                 
-                if comp_type == "Controller":
-                    report.extend([
-                        "  Migration Steps:",
-                        "    1. Replace @Path with @RequestMapping",
-                        "    2. Convert class to @RestController",
-                        "    3. Update method annotations:",
-                        "       - @GET → @GetMapping",
-                        "       - @POST → @PostMapping",
-                        "       - @PUT → @PutMapping",
-                        "       - @DELETE → @DeleteMapping",
-                        "    4. Replace @PathParam with @PathVariable",
-                        "    5. Replace @QueryParam with @RequestParam",
-                        "    6. Replace @FormParam with @RequestParam",
-                        "    7. Update response handling to use ResponseEntity",
-                        "    8. Replace @Produces/@Consumes with produces/consumes attributes"
-                    ])
+            if comp_type == "Controller":
+                report.extend([
+                    "  Migration Steps:",
+                    "    1. Replace @Path with @RequestMapping",
+                    "    2. Convert class to @RestController",
+                    "    3. Update method annotations:",
+                    "       - @GET → @GetMapping",
+                    "       - @POST → @PostMapping",
+                    "       - @PUT → @PutMapping",
+                    "       - @DELETE → @DeleteMapping",
+                    "    4. Replace @PathParam with @PathVariable",
+                    "    5. Replace @QueryParam with @RequestParam",
+                    "    6. Replace @FormParam with @RequestParam",
+                    "    7. Update response handling to use ResponseEntity",
+                    "    8. Replace @Produces/@Consumes with produces/consumes attributes"
+                ])
 
-                elif comp_type == "Service":
-                    report.extend([
-                        "  Migration Steps:",
-                        "    1. Replace @Stateless/@Stateful with @Service",
-                        "    2. Replace @EJB with @Autowired",
-                        "    3. Replace @TransactionAttribute with @Transactional",
-                        "    4. Update exception handling to use Spring exceptions",
-                        "    5. Replace JNDI lookups with dependency injection",
-                        "    6. Update transaction management to use Spring's approach"
-                    ])
+            elif comp_type == "Service":
+                report.extend([
+                    "  Migration Steps:",
+                    "    1. Replace @Stateless/@Stateful with @Service",
+                    "    2. Replace @EJB with @Autowired",
+                    "    3. Replace @TransactionAttribute with @Transactional",
+                    "    4. Update exception handling to use Spring exceptions",
+                    "    5. Replace JNDI lookups with dependency injection",
+                    "    6. Update transaction management to use Spring's approach"
+                ])
 
-                elif comp_type == "Repository":
-                    report.extend([
-                        "  Migration Steps:",
-                        "    1. Convert to Spring Data interface",
-                        "    2. Extend MongoRepository<EntityType, String>",
-                        "    3. Remove explicit EntityManager usage",
-                        "    4. Convert JPQL queries to:",
-                        "       - Method names (findByXxx)",
-                        "       - @Query annotations",
-                        "    5. Replace @PersistenceContext with Spring Data methods"
-                    ])
+            elif comp_type == "Repository":
+                report.extend([
+                    "  Migration Steps:",
+                    "    1. Convert to Spring Data interface",
+                    "    2. Extend MongoRepository<EntityType, String>",
+                    "    3. Remove explicit EntityManager usage",
+                    "    4. Convert JPQL queries to:",
+                    "       - Method names (findByXxx)",
+                    "       - @Query annotations",
+                    "    5. Replace @PersistenceContext with Spring Data methods"
+                ])
 
-                elif comp_type in ["Model", "Entity"]:
-                    report.extend([
-                        "  Migration Steps:",
-                        "    1. Replace JPA annotations with MongoDB annotations:",
-                        "       - @Entity → @Document",
-                        "       - @Table → collection attribute in @Document",
-                        "       - @Id remains (but from different package)",
-                        "       - @Column → @Field",
-                        "    2. Update field annotations:"
-                    ])
+            elif comp_type in ["Model", "Entity"]:
+                report.extend([
+                    "  Migration Steps:",
+                    "    1. Replace JPA annotations with MongoDB annotations:",
+                    "       - @Entity → @Document",
+                    "       - @Table → collection attribute in @Document",
+                    "       - @Id remains (but from different package)",
+                    "       - @Column → @Field",
+                    "    2. Update field annotations:"
+                ])
                     
-                    # Add specific field migrations if columns exist
-                    if columns:
-                        report.append("    Current fields to migrate:")
-                        for column in columns:
-                            constraints = column.get("constraints", [])
-                            if not constraints:  # Handle empty constraints
-                                constraints = []
-                            report.append(f"      • {column['name']} ({column['type']}):")
+                # Add specific field migrations if columns exist
+                if columns:
+                    report.append("    Current fields to migrate:")
+                    for column in columns:
+                        constraints = column.get("constraints", [])
+                        if not constraints:  # Handle empty constraints
+                            constraints = []
+                        report.append(f"      • {column['name']} ({column['type']}):")
                             
-                            # Suggest specific annotation migrations
-                            annotations = []
-                            if "Id" in constraints:
-                                annotations.append("@Id (from spring-data-mongodb)")
-                            if "Column" in constraints:
-                                annotations.append("@Field")
-                            if "NotNull" in constraints:
-                                annotations.append("@NotNull")
-                            if "Size" in constraints:
-                                annotations.append("@Size")
-                            if "Email" in constraints:
-                                annotations.append("@Email")
-                            if annotations:
-                                report.append(f"        Annotations: {', '.join(annotations)}")
-                            else:
-                                report.append("        No special annotations needed")
+                        # Suggest specific annotation migrations
+                        annotations = []
+                        if "Id" in constraints:
+                            annotations.append("@Id (from spring-data-mongodb)")
+                        if "Column" in constraints:
+                            annotations.append("@Field")
+                        if "NotNull" in constraints:
+                            annotations.append("@NotNull")
+                        if "Size" in constraints:
+                            annotations.append("@Size")
+                        if "Email" in constraints:
+                            annotations.append("@Email")
+                        if annotations:
+                            report.append(f"        Annotations: {', '.join(annotations)}")
+                        else:
+                            report.append("        No special annotations needed")
 
-                report.extend([
-                    "  Additional Considerations:",
-                    "    - Update import statements to Spring Boot packages",
-                    "    - Review and update exception handling",
-                    "    - Add appropriate Spring Boot validation annotations",
-                    "    - Update any Jakarta EE-specific code"
-                ])
+            report.extend([
+                "  Additional Considerations:",
+                "    - Update import statements to Spring Boot packages",
+                "    - Review and update exception handling",
+                "    - Add appropriate Spring Boot validation annotations",
+                "    - Update any Jakarta EE-specific code"
+            ])
 
         return report
 
-    def _generate_recommendations(self):
+    def _generate_recommendations(self, data):
         """Generate migration recommendations based on analysis"""
         report = ["\n=== Migration Recommendations ===\n"]
         
-        with self.driver.session() as session:
-            # Backend recommendations
-            backend_count = session.run("""
-                MATCH (n)
-                WHERE n:Controller OR n:Service OR n:Repository OR n:Model
-                RETURN labels(n)[0] as type, count(n) as count
-            """)
+        # Backend recommendations: components per type, Entities aside
+        backend_count = {}
+        for record in data["component_summary"]:
+            if any(role in BACKEND_TYPES for role in record["roles"]):
+                comp_type = self._component_type(record)
+                backend_count[comp_type] = backend_count.get(comp_type, 0) + record["count"]
             
-            report.append("🔹 Backend Migration:")
-            for record in backend_count:
-                report.append(f"  • Migrate {record['count']} {record['type']}(s) to Spring Boot equivalents")
+        report.append("🔹 Backend Migration:")
+        for comp_type, count in backend_count.items():
+            report.append(f"  • Migrate {count} {comp_type}(s) to Spring Boot equivalents")
 
-            # Database recommendations
-            db_info = session.run("MATCH (db:Database) RETURN db.type as type LIMIT 1").single()
-            if db_info:
-                report.extend([
-                    "\n🔹 Database Migration:",
-                    f"  • Current database: {db_info['type']}",
-                    "  • Recommended actions:",
-                    "    - Update database configuration in application.properties",
-                    "    - Migrate JPA entities to Spring Data annotations",
-                    "    - Update repository interfaces to extend Spring Data repositories"
-                ])
+        # Database recommendations
+        db_info = next(iter(data["database_info"]), None)
+        if db_info:
+            report.extend([
+                "\n🔹 Database Migration:",
+                f"  • Current database: {db_info['type']}",
+                "  • Recommended actions:",
+                "    - Update database configuration in application.properties",
+                "    - Migrate JPA entities to Spring Data annotations",
+                "    - Update repository interfaces to extend Spring Data repositories"
+            ])
 
-            # Frontend recommendations
-            frontend_info = session.run("""
-                MATCH (p:Page)
-                RETURN p.templateType as type, count(p) as count
-            """)
+        # Pages per template type
+        frontend_info = {}
+        for record in data["page_templates"]:
+            frontend_info[record["type"]] = frontend_info.get(record["type"], 0) + record["count"]
             
-            report.append("\n🔹 Frontend Migration:")
-            for record in frontend_info:
-                if record["type"] == "xhtml":
-                    report.extend([
-                        f"  • Convert {record['count']} XHTML templates to Thymeleaf",
-                        "  • Replace JSF components with Thymeleaf equivalents",
-                        "  • Update form handling to use Spring MVC conventions"
-                    ])
-                else:
-                    report.extend([
-                        f"  • Update {record['count']} HTML templates to use Thymeleaf syntax",
-                        "  • Add Thymeleaf namespace to templates",
-                        "  • Update static resource references"
-                    ])
+        report.append("\n🔹 Frontend Migration:")
+        for page_type, count in frontend_info.items():
+            if page_type == "xhtml":
+                report.extend([
+                    f"  • Convert {count} XHTML templates to Thymeleaf",
+                    "  • Replace JSF components with Thymeleaf equivalents",
+                    "  • Update form handling to use Spring MVC conventions"
+                ])
+            else:
+                report.extend([
+                    f"  • Update {count} HTML templates to use Thymeleaf syntax",
+                    "  • Add Thymeleaf namespace to templates",
+                    "  • Update static resource references"
+                ])
 
         return report
 
@@ -408,7 +378,13 @@ class MigrationPlanner:
         print(f"Migration analysis report saved to {filename}")
 
 if __name__ == "__main__":
-    planner = MigrationPlanner("bolt://localhost:7687", "neo4j", "password")
+    planner = MigrationPlanner(
+        os.getenv("NEO4J_URI", "bolt://localhost:7687"),
+        os.getenv("NEO4J_USER", "neo4j"),
+        os.getenv("NEO4J_PASSWORD", "password"),
+        # The project to report on, in a graph shared by several projects
+        project=os.getenv("MIGRATION_PROJECT") or None
+    )
     
     try:
         planner.save_report()
@@ -1,27 +1,30 @@
-from neo4j import GraphDatabase
-import google.generativeai as genai
 import os
+from utils.graph_store import open_graph_store
 
-# Neo4j Configuration
-NEO4J_URI = "bolt://localhost:7687"
-NEO4J_USER = "neo4j"
-NEO4J_PASS = "password"
+# Graph store configuration; free-form questions need Neo4j, since they are answered with Cypher
+NEO4J_URI = os.getenv("NEO4J_URI", "bolt://localhost:7687")
+NEO4J_USER = os.getenv("NEO4J_USER", "neo4j")
+NEO4J_PASS = os.getenv("NEO4J_PASSWORD", "password")
 
 # Google Gemini API Key
 GOOGLE_GEMINI_API_KEY = os.getenv("GOOGLE_GEMINI_API_KEY")
-genai.configure(api_key=GOOGLE_GEMINI_API_KEY)
+
+def gemini_model():
+    """Import and configure the Gemini client on first use; it is slow to import"""
+    import google.generativeai as genai
+
+    genai.configure(api_key=GOOGLE_GEMINI_API_KEY)
+    return genai.GenerativeModel("gemini-pro")
 
 class KnowledgeGraphQuery:
     def __init__(self):
-        self.driver = GraphDatabase.driver(NEO4J_URI, auth=(NEO4J_USER, NEO4J_PASS))
+        self.store = open_graph_store(NEO4J_URI, NEO4J_USER, NEO4J_PASS)
 
     def close(self):
-        self.driver.close()
+        self.store.close()
 
     def execute_query(self, query, params={}):
-        with self.driver.session() as session:
-            result = session.run(query, params)
-            return [record for record in result]
+        return self.store.query(query, params)
 
     def query_graph(self, user_question):
         prompt = f"""
@@ -29,6 +32,7 @@ class KnowledgeGraphQuery:
         '{user_question}'
         
         The graph has these nodes and properties:
+        - Every Controller, Service, Model and Repository node also has the Component label
         - (Controller) with properties: name, package, filePath, type
         - (Service) with properties: name, package, filePath, type
         - (Model) with properties: name, package, filePath, type
@@ -57,7 +61,7 @@ class KnowledgeGraphQuery:
         """
 
         # Generate Cypher query
-        model = genai.GenerativeModel("gemini-pro")
+        model = gemini_model()
         response = model.generate_content(prompt)
         cypher_query = response.text.strip('`').strip()
 
@@ -106,19 +110,7 @@ class KnowledgeGraphQuery:
         }
 
     def get_service_details(self, service_name):
-        query = """
-        MATCH (s:Service)
-        WHERE s.name CONTAINS $service_name
-        OPTIONAL MATCH (c:Controller)-[:DEPENDS_ON]->(s)
-        OPTIONAL MATCH (s)-[:DEPENDS_ON]->(r:Repository)
-        OPTIONAL MATCH (c)-[:HAS_ACTION]->(a:Action)
-        RETURN s.name as name,
-               s.package as package,
-               collect(DISTINCT c.name) as controllers,
-               collect(DISTINCT r.name) as repositories,
-               collect(DISTINCT {method: a.httpMethod, path: a.path, name: a.name}) as actions
-        """
-        return self.execute_query(query, {"service_name": service_name})
+        return self.store.read("service_details", service_name=service_name)
 
 if __name__ == "__main__":
     graph_query = KnowledgeGraphQuery()
@@ -154,7 +146,7 @@ if __name__ == "__main__":
                 
                 Format as bullet points and include all technical details.
                 """
-                model = genai.GenerativeModel("gemini-pro")
+                model = gemini_model()
                 answer = model.generate_content(answer_prompt).text
             else:
                 answer = graph_query.query_graph(user_input)
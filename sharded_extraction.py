@@ -0,0 +1,374 @@
+#!/usr/bin/env python3
+"""Sharded knowledge extraction for source trees too large for one host.
+
+Usage: python sharded_extraction.py plan|work|merge|run [options]
+
+`plan` scans the source tree, finds the files to extract (all of them, or
+only those added or changed since the last run) and splits them into
+shards by a hash of their path, one task per shard in a SQLite work
+queue. `work` takes shards from the queue until it is empty; each shard
+is extracted into a private in-memory graph and written to a partial
+result (a graph snapshot plus the elements every file produced). Any
+number of workers may run, on this host or on others sharing the queue,
+the shard directory and the source tree's path. `merge` bulk-loads every
+partial result into the graph store, removes stale elements, updates
+the extraction manifest, embeds the documentation and writes the
+migration report. `run` does all three on one host with local workers.
+"""
+import argparse
+import hashlib
+import json
+import os
+import socket
+import subprocess
+import sys
+import time
+from document_knowledge_extractor import DocumentExtractor
+from extract_knowledge import KnowledgeExtraction, REPORT_PATH, extractor_versions
+from planner import MigrationPlanner
+from utils.source_scanner import SourceFile, SourceManifest, classify_file, scan_source_tree
+from utils.extraction_cache import CACHE_PATH
+from utils.graph_schema import schema_statements
+from utils.graph_snapshot import describe, export_snapshot, load_snapshot
+from utils.graph_store import open_graph_store
+from utils.graph_writer import BatchGraphWriter, delete_element
+from utils.incremental import ExtractionManifest, MANIFEST_PATH
+from utils.metrics import ExtractionMetrics, METRICS_PATH
+from utils.work_queue import WorkQueue, DONE, QUEUE_PATH
+
+# Shards the changed files are split into
+SHARDS = int(os.getenv("EXTRACTION_SHARDS", "16"))
+# Directory the partial results of the shards are written to
+SHARD_DIR = os.getenv("EXTRACTION_SHARD_DIR", "extraction_shards")
+
+def shard_of(rel_path, shards):
+    """Shard of a file, from a hash of its path relative to the source root.
+
+    The same on every host and run, unlike Python's salted hash().
+    """
+    digest = hashlib.sha1(rel_path.replace(os.sep, "/").encode("utf-8")).digest()
+    return int.from_bytes(digest[:8], "big") % shards
+
+def worker_name():
+    return f"{socket.gethostname()}-{os.getpid()}"
+
+class ShardedExtraction:
+    """Plans, works on and merges the shards of one extraction through a work queue"""
+
+    def __init__(self, source_dir=None, neo4j_uri="bolt://localhost:7687", neo4j_user="neo4j",
+                 neo4j_password="password", queue_path=QUEUE_PATH, shard_dir=SHARD_DIR,
+                 incremental=True, manifest_path=None, cache_path=CACHE_PATH, parse_workers=None,
+                 snapshot_path=None, metrics_path=METRICS_PATH, report_path=REPORT_PATH):
+        self.source_dir = source_dir
+        self.neo4j_uri = neo4j_uri
+        self.neo4j_user = neo4j_user
+        self.neo4j_password = neo4j_password
+        self.queue = WorkQueue(queue_path)
+        self.shard_dir = shard_dir
+        self.incremental = incremental
+        self.manifest_path = manifest_path or MANIFEST_PATH
+        self.cache_path = cache_path
+        self.parse_workers = parse_workers
+        self.snapshot_path = snapshot_path
+        self.metrics_path = metrics_path
+        self.report_path = report_path
+
+    def _shard_path(self, shard, suffix):
+        return os.path.join(self.shard_dir, f"shard-{shard:04d}{suffix}")
+
+    def plan(self, shards=SHARDS):
+        """Queue the files to extract as shards; return the number of shards"""
+        print(f"\n🗂️  Scanning source tree {self.source_dir}...")
+        manifest = scan_source_tree(self.source_dir)
+        print(f"✅ {manifest.summary()}")
+
+        if self.incremental:
+            state = ExtractionManifest.load(self.manifest_path, self.source_dir, extractor_versions())
+        else:
+            state = ExtractionManifest(self.source_dir, versions=extractor_versions())
+        graph_files = manifest.java_files + manifest.persistence_files + manifest.pages
+        to_extract, removed, hashes = state.diff(graph_files)
+        print(f"🔁 {len(to_extract)} added or changed, {len(removed)} removed, "
+              f"{len(graph_files) - len(to_extract)} unchanged")
+
+        # Workers join these paths to their own source root
+        files = {}
+        for source_file in to_extract:
+            rel_path = os.path.relpath(source_file.path, self.source_dir)
+            files.setdefault(shard_of(rel_path, shards), []).append(
+                [rel_path, source_file.size, source_file.mtime, hashes[source_file.path]]
+            )
+        payloads = [{"shard": shard, "files": files[shard]} for shard in sorted(files)]
+
+        # Partial results of an earlier run must not be merged into this one
+        os.makedirs(self.shard_dir, exist_ok=True)
+        for name in os.listdir(self.shard_dir):
+            if name.startswith("shard-"):
+                os.remove(os.path.join(self.shard_dir, name))
+
+        self.queue.reset(payloads, meta={
+            "root": self.source_dir,
+            "shards": shards,
+            "removed": removed,
+            "documents": [list(source_file) for source_file in manifest.documents],
+            "planned": time.time()
+        })
+        print(f"🧩 Queued {len(payloads)} shards of {len(to_extract)} files in {self.queue.path}")
+        return len(payloads)
+
+    def work(self, worker=None):
+        """Extract shards until the queue has none left; return how many this worker extracted"""
+        worker = worker or worker_name()
+        meta = self.queue.meta()
+        root = self.source_dir or meta["root"]
+        extracted = 0
+        while True:
+            task = self.queue.claim(worker)
+            if task is None:
+                break
+            task_id, payload = task
+            print(f"\n🧩 Worker {worker}: shard {payload['shard']} ({len(payload['files'])} files)")
+            try:
+                result = self._extract_shard(root, payload)
+            except Exception as e:
+                print(f"❌ Shard {payload['shard']} failed: {str(e)}")
+                self.queue.fail(task_id, worker, str(e))
+                continue
+            self.queue.complete(task_id, result)
+            extracted += 1
+        print(f"✅ Worker {worker} extracted {extracted} shards; queue: {self.queue.report()}")
+        return extracted
+
+    def _extract_shard(self, root, payload):
+        """Extract one shard into a private in-memory graph and write its partial result"""
+        shard = payload["shard"]
+        manifest = SourceManifest(root)
+        hashes = {}
+        files = {}
+        for rel_path, size, mtime, content_hash in payload["files"]:
+            path = os.path.join(root, rel_path)
+            manifest.add(classify_file(os.path.basename(path)), SourceFile(path, size, mtime))
+            hashes[path] = content_hash
+            files[path] = rel_path
+
+        # The private graph lives as long as the extraction holds it open
+        extraction = KnowledgeExtraction(
+            root, f"memory://shard-{shard}",
+            parse_workers=self.parse_workers,
+            incremental=False,
+            cache_path=self.cache_path,
+            async_writes=False,
+            metrics_path=self._shard_path(shard, ".metrics.json"),
+            prometheus_path=None,
+            report_path=None,
+            apply_schema=False
+        )
+        try:
+            extraction.extract_files(manifest, hashes)
+            extraction.metrics.stage("flush")
+            extraction.java_extractor.flush()
+            extraction.db_extractor.flush()
+            extraction.frontend_extractor.flush()
+
+            # Relationships to nodes of other shards hold those nodes by
+            # key, so the merge joins them with their definitions
+            extraction.metrics.stage("snapshot")
+            snapshot_path = self._shard_path(shard, ".jsonl.gz")
+            stats = export_snapshot(extraction.java_extractor.store, snapshot_path)
+            elements_path = self._shard_path(shard, ".elements.json")
+            entries = {
+                files[path]: {"elements": sorted(elements)}
+                for path, elements in extraction.tracker.elements.items()
+            }
+            for rel_path, size, mtime, content_hash in payload["files"]:
+                entries.setdefault(rel_path, {"elements": []}).update(
+                    {"hash": content_hash, "size": size, "mtime": mtime}
+                )
+            tmp_path = f"{elements_path}.tmp"
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump(entries, f)
+            os.replace(tmp_path, elements_path)
+            print(f"📦 Shard {shard}: {describe(stats)} written to {snapshot_path}")
+        finally:
+            extraction.cleanup()
+
+        return {
+            "snapshot": snapshot_path,
+            "elements": elements_path,
+            "files": len(payload["files"]),
+            "nodes": stats["nodes"],
+            "edges": stats["edges"]
+        }
+
+    def merge(self):
+        """Bulk-load every shard's partial result into the graph store and finish the extraction"""
+        meta = self.queue.meta()
+        tasks = self.queue.tasks()
+        unfinished = [task for task in tasks if task["status"] != DONE]
+        if unfinished:
+            raise RuntimeError(f"{len(unfinished)} of {len(tasks)} shards are not extracted: " +
+                               ", ".join(f"#{task['id']} {task['status']}" +
+                                         (f" ({task['error']})" if task["error"] else "")
+                                         for task in unfinished))
+
+        # Paths are recorded as the planning host saw them
+        root = meta["root"]
+        metrics = ExtractionMetrics()
+        store = open_graph_store(self.neo4j_uri, self.neo4j_user, self.neo4j_password)
+        store.metrics = metrics
+        try:
+            print(f"\n🔗 Merging {len(tasks)} shards into {self.neo4j_uri}...")
+            metrics.stage("schema")
+            applied = store.ensure_schema()
+            print(f"🗝️  Graph schema ready ({applied}/{len(schema_statements())} constraints and indexes)")
+
+            # The constraints make a node referenced from several shards merge into one
+            metrics.stage("load")
+            nodes = edges = 0
+            for task in tasks:
+                stats = load_snapshot(store, task["result"]["snapshot"])
+                nodes += stats["nodes"]
+                edges += stats["edges"]
+            print(f"✅ Loaded {nodes} nodes and {edges} relationships")
+
+            metrics.stage("stale")
+            if self.incremental:
+                state = ExtractionManifest.load(self.manifest_path, root, extractor_versions())
+            else:
+                state = ExtractionManifest(root, versions=extractor_versions())
+            extracted = []
+            hashes = {}
+            elements = {}
+            for task in tasks:
+                with open(task["result"]["elements"], "r", encoding="utf-8") as f:
+                    entries = json.load(f)
+                for rel_path, entry in entries.items():
+                    path = os.path.join(root, rel_path)
+                    extracted.append(SourceFile(path, entry["size"], entry["mtime"]))
+                    hashes[path] = entry["hash"]
+                    elements[path] = set(entry["elements"])
+            stale = state.update(extracted, meta["removed"], hashes, elements)
+            if stale:
+                writer = BatchGraphWriter(store)
+                for element in stale:
+                    delete_element(writer, element)
+                writer.close()
+                print(f"🧹 Removed {len(stale)} stale graph elements")
+            state.save(self.manifest_path)
+
+            metrics.stage("documents")
+            self._extract_documents(root, meta["documents"], metrics)
+
+            if self.snapshot_path:
+                metrics.stage("snapshot")
+                stats = export_snapshot(store, self.snapshot_path)
+                print(f"\n📦 Graph snapshot: {describe(stats)} written to {self.snapshot_path}")
+
+            metrics.stage("planner")
+            print("\n📋 Generating migration report...")
+            planner = MigrationPlanner(self.neo4j_uri, self.neo4j_user, self.neo4j_password)
+            planner.store.metrics = metrics
+            try:
+                planner.save_report(self.report_path)
+            finally:
+                planner.close()
+            metrics.end_stage()
+        finally:
+            store.close()
+
+        metrics.finish()
+        metrics.set_info("shards", {"count": len(tasks), "nodes": nodes, "edges": edges})
+        if self.metrics_path:
+            metrics.write_json(self.metrics_path)
+        print(f"📈 Merge metrics: {metrics.summary()}")
+        print(f"\n✨ Sharded extraction complete; report in '{self.report_path}'")
+
+    def _extract_documents(self, root, documents, metrics):
+        """Embed the documentation of the planned tree; documents are not sharded"""
+        print("\n📄 Analyzing documentation...")
+        doc_extractor = DocumentExtractor()
+        try:
+            processed = 0
+            # With no documents left, an existing store still drops the chunks of removed ones
+            if documents or os.path.isdir(doc_extractor.persist_directory):
+                manifest = SourceManifest(root)
+                for path, size, mtime in documents:
+                    manifest.add(classify_file(os.path.basename(path)), SourceFile(path, size, mtime))
+                processed = doc_extractor.create_vector_store(doc_extractor.iter_documents(root, manifest))
+            if processed:
+                print(f"✅ Processed {processed} documentation files")
+            else:
+                print("ℹ️ No documentation files (.docx or .md) found")
+            if doc_extractor._embeddings is not None:
+                metrics.set_info("embeddings", doc_extractor._embeddings.stats())
+        finally:
+            doc_extractor.close()
+
+    def run(self, shards=SHARDS, workers=None):
+        """Plan, extract the shards with local worker processes and merge"""
+        if not self.plan(shards):
+            print("ℹ️ Nothing to extract")
+        else:
+            workers = workers or os.cpu_count() or 1
+            print(f"\n🚀 Starting {workers} workers...")
+            processes = []
+            for number in range(workers):
+                env = dict(os.environ)
+                # Share the CPUs between the workers' Java parse pools
+                env.setdefault("JAVA_PARSE_WORKERS", str(max(1, (os.cpu_count() or 1) // workers)))
+                # A cache holds a write transaction until it closes, so each worker has its own
+                command = [sys.executable, os.path.abspath(__file__), "work",
+                           "--source-dir", self.source_dir, "--queue", self.queue.path, "--shard-dir", self.shard_dir,
+                           "--cache", worker_cache_path(self.cache_path, number)]
+                processes.append(subprocess.Popen(command, env=env))
+            failed = sum(1 for process in processes if process.wait() != 0)
+            if failed:
+                print(f"⚠️  {failed} workers exited with an error")
+        self.merge()
+
+def worker_cache_path(cache_path, number):
+    """Local worker's own cache file, e.g. extraction_cache.worker-0.db"""
+    if not cache_path:
+        return ""
+    base, extension = os.path.splitext(cache_path)
+    return f"{base}.worker-{number}{extension}"
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("command", choices=["plan", "work", "merge", "run"])
+    parser.add_argument("--source-dir", default=os.getenv("SOURCE_DIR"),
+                        help="source tree; for work, overrides the planned path on this host")
+    parser.add_argument("--shards", type=int, default=SHARDS, help="shards the changed files are split into")
+    parser.add_argument("--workers", type=int, help="local worker processes for run (default: CPU count)")
+    parser.add_argument("--queue", default=QUEUE_PATH, help="SQLite work queue file")
+    parser.add_argument("--shard-dir", default=SHARD_DIR, help="directory of the partial results")
+    parser.add_argument("--cache", default=CACHE_PATH, help="extraction cache of this worker; empty disables it")
+    args = parser.parse_args()
+
+    if args.command in ("plan", "run") and not args.source_dir:
+        parser.error(f"{args.command} needs --source-dir or SOURCE_DIR")
+
+    # Parse workers, batch sizes and the like are read from the same
+    # environment variables as extract_knowledge.py
+    sharded = ShardedExtraction(
+        source_dir=args.source_dir,
+        neo4j_uri=os.getenv('NEO4J_URI', "bolt://localhost:7687"),
+        neo4j_user=os.getenv('NEO4J_USER', "neo4j"),
+        neo4j_password=os.getenv('NEO4J_PASSWORD', "password"),
+        queue_path=args.queue,
+        shard_dir=args.shard_dir,
+        incremental=os.getenv('EXTRACTION_INCREMENTAL', "1") != "0",
+        cache_path=args.cache,
+        snapshot_path=os.getenv('GRAPH_SNAPSHOT') or None
+    )
+    if args.command == "plan":
+        sharded.plan(args.shards)
+    elif args.command == "work":
+        sharded.work()
+    elif args.command == "merge":
+        sharded.merge()
+    else:
+        sharded.run(args.shards, args.workers)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,29 @@
+from docx import Document
+from docx.shared import Inches
+
+from utils.docx_stream import iter_docx_text
+
+def _paragraph_texts(path):
+    return [paragraph.text for paragraph in Document(path).paragraphs]
+
+def test_custom_tab_stops_are_not_text(tmp_path):
+    path = str(tmp_path / "toc.docx")
+    document = Document()
+    paragraph = document.add_paragraph("Chapter 1\tpage 3")
+    paragraph.paragraph_format.tab_stops.add_tab_stop(Inches(1))
+    paragraph.paragraph_format.tab_stops.add_tab_stop(Inches(5))
+    document.save(path)
+
+    assert list(iter_docx_text(path)) == ["Chapter 1\tpage 3"]
+    assert list(iter_docx_text(path)) == _paragraph_texts(path)
+
+def test_paragraphs_tabs_and_breaks(tmp_path):
+    path = str(tmp_path / "body.docx")
+    document = Document()
+    document.add_paragraph("first\tsecond")
+    run = document.add_paragraph("line one").add_run()
+    run.add_break()
+    run.add_text("line two")
+    document.save(path)
+
+    assert list(iter_docx_text(path)) == ["first\tsecond", "line one\nline two"]
@@ -0,0 +1,62 @@
+import json
+
+from frontend_knowledge_extractor import FrontendExtractor, add_page_record, collect_page_record
+from utils.graph_store import GraphStore
+
+PAGE = """
+<html>
+  <head><link rel="stylesheet" href="resources/css/screen.css"/></head>
+  <body>
+    <form id="reg" action="#{memberController.register}" method="post">
+      <input name="email" type="email" required="required" pattern=".+@.+" maxlength="64"/>
+      <input name="name" type="text" minlength="2"/>
+    </form>
+  </body>
+</html>
+"""
+
+class _RecordingStore(GraphStore):
+    """Records write transactions, rejecting map property values as Neo4j does"""
+
+    def __init__(self):
+        self.transactions = []
+
+    def _write(self, batches, batch_size):
+        for _, rows in batches:
+            for row in rows:
+                for name in ("props", "start_props", "end_props"):
+                    if any(isinstance(value, dict) for value in row.get(name, {}).values()):
+                        raise TypeError("Property values can only be of primitive types or arrays thereof")
+        self.transactions.append(batches)
+
+def _extractor(store):
+    extractor = FrontendExtractor("memory://test-frontend-batch", "neo4j", "password", flush_interval=3600)
+    extractor.writer.store = store
+    return extractor
+
+def test_page_batch_is_written_in_one_transaction():
+    store = _RecordingStore()
+    extractor = _extractor(store)
+    record = collect_page_record(PAGE)
+    add_page_record(extractor, "src/main/webapp/register.xhtml", record)
+    add_page_record(extractor, "src/main/webapp/login.xhtml", record)
+    extractor.flush()
+
+    assert len(store.transactions) == 1
+    stats = extractor.writer.stats()
+    assert stats["transactions"] == 1
+    assert stats["rows_failed"] == 0
+    extractor.store.close()
+
+def test_form_field_validation_is_stored_as_json():
+    store = _RecordingStore()
+    extractor = _extractor(store)
+    add_page_record(extractor, "src/main/webapp/register.xhtml", collect_page_record(PAGE))
+    extractor.flush()
+
+    fields = {row["end"]["name"]: row["end_props"] for group, rows in store.transactions[0]
+              if group[0] == "edge" and group[4] == "HAS_FIELD" for row in rows}
+    assert json.loads(fields["email"]["validation"]) == {
+        "required": True, "pattern": ".+@.+", "minlength": None, "maxlength": "64"
+    }
+    extractor.store.close()
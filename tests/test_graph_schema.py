@@ -0,0 +1,67 @@
+from utils.graph_schema import UNIQUE_KEYS, ensure_schema, schema_statements
+
+class _Result:
+    def consume(self):
+        return None
+
+class _Session:
+    """Records the statements run, failing composite uniqueness constraints as Community edition does"""
+
+    def __init__(self, composite_unique=True):
+        self.composite_unique = composite_unique
+        self.statements = []
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+    def run(self, statement):
+        if not self.composite_unique and "REQUIRE (n.project," in statement:
+            raise RuntimeError("Property uniqueness constraints on multiple properties require Enterprise Edition")
+        self.statements.append(statement)
+        return _Result()
+
+class _Driver:
+    def __init__(self, session):
+        self._session = session
+
+    def session(self):
+        return self._session
+
+def test_scoped_schema_replaces_plain_constraints_after_creating_composite_ones():
+    session = _Session()
+    applied = ensure_schema(_Driver(session), scoped=True)
+
+    assert applied == len(schema_statements(scoped=True))
+    create = session.statements.index(
+        "CREATE CONSTRAINT component_project_name_unique IF NOT EXISTS "
+        "FOR (n:Component) REQUIRE (n.project, n.name) IS UNIQUE"
+    )
+    drop = session.statements.index("DROP CONSTRAINT component_name_unique IF EXISTS")
+    assert create < drop
+
+def test_scoped_schema_falls_back_to_composite_indexes(capsys):
+    session = _Session(composite_unique=False)
+    applied = ensure_schema(_Driver(session), scoped=True)
+
+    assert applied == len(schema_statements(scoped=True))
+    assert not any("IS UNIQUE" in statement for statement in session.statements)
+    create = session.statements.index(
+        "CREATE INDEX component_project_name_index IF NOT EXISTS FOR (n:Component) ON (n.project, n.name)"
+    )
+    drop = session.statements.index("DROP CONSTRAINT component_name_unique IF EXISTS")
+    assert create < drop
+    assert capsys.readouterr().out.count("indexing it instead") == len(UNIQUE_KEYS)
+
+def test_plain_constraints_are_kept_when_no_replacement_can_be_created():
+    class _ReadOnlySession(_Session):
+        def run(self, statement):
+            if statement.startswith("CREATE"):
+                raise RuntimeError("Schema operations are not allowed for this user")
+            return super().run(statement)
+
+    session = _ReadOnlySession()
+    assert ensure_schema(_Driver(session), scoped=True) == 0
+    assert not any(statement.startswith("DROP") for statement in session.statements)
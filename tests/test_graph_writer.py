@@ -0,0 +1,39 @@
+from utils.graph_writer import build_edge_query
+
+# Clauses that read the graph, which Cypher only allows after an update through a WITH
+READING = ("MATCH", "OPTIONAL MATCH", "UNWIND")
+UPDATING = ("SET", "MERGE", "CREATE", "DELETE", "DETACH DELETE", "REMOVE")
+
+def _updates_then_reads(query):
+    """Lines of a query that read straight after an update, which Neo4j rejects"""
+    updated = False
+    errors = []
+    for line in query.splitlines():
+        if line.startswith("WITH"):
+            updated = False
+        elif line.startswith(READING):
+            if updated:
+                errors.append(line)
+        elif line.startswith(UPDATING):
+            updated = True
+    return errors
+
+def test_edge_query_between_matched_nodes_is_valid_cypher():
+    query = build_edge_query("Component", ("name",), False, "DEPENDS_ON", "Component", ("name",), False)
+    assert _updates_then_reads(query) == []
+    assert query.splitlines() == [
+        "UNWIND $rows AS row",
+        "MATCH (a:Component {name: row.start.name})",
+        "SET a += row.start_props",
+        "WITH a, row",
+        "MATCH (b:Component {name: row.end.name})",
+        "SET b += row.end_props",
+        "MERGE (a)-[r:DEPENDS_ON]->(b)",
+        "SET r += row.props",
+    ]
+
+def test_edge_queries_are_valid_cypher_for_every_endpoint_mode():
+    for start_merge in (True, False):
+        for end_merge in (True, False):
+            query = build_edge_query("Page", ("name",), start_merge, "CONTAINS", "Form", ("id",), end_merge)
+            assert _updates_then_reads(query) == [], query
@@ -0,0 +1,45 @@
+import os
+
+from utils.ignore_rules import IgnoreRules, walk_tree
+from utils.source_scanner import scan_source_tree
+
+def _touch(root, rel_path):
+    path = os.path.join(root, *rel_path.split("/"))
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, "w", encoding="utf-8") as f:
+        f.write("class X {}\n")
+    return path
+
+def test_build_output_directories_are_ignored_at_root_and_in_modules():
+    rules = IgnoreRules.for_root("/nonexistent", use_defaults=True)
+    assert rules.ignored("target", is_dir=True)
+    assert rules.ignored("build", is_dir=True)
+    assert rules.ignored("orders-service/target", is_dir=True)
+    assert rules.ignored("node_modules", is_dir=True)
+
+def test_source_package_named_build_is_kept():
+    rules = IgnoreRules.for_root("/nonexistent", use_defaults=True)
+    assert not rules.ignored("src/main/java/com/acme/build", is_dir=True)
+    assert not rules.ignored("orders-service/src/main/java/com/acme/out", is_dir=True)
+    assert not rules.ignored("src/main/java/com/acme/target", is_dir=True)
+
+def test_scan_extracts_sources_of_a_build_package(tmp_path):
+    root = str(tmp_path)
+    kept = _touch(root, "src/main/java/com/acme/build/BuildService.java")
+    _touch(root, "target/generated/Generated.java")
+    _touch(root, "module/build/classes/Compiled.java")
+
+    manifest = scan_source_tree(root)
+
+    assert [source_file.path for source_file in manifest.java_files] == [kept]
+    assert manifest.ignored.dirs == 2
+    walked = [os.path.join(current, name) for current, _, files in walk_tree(root) for name in files]
+    assert walked == [kept]
+
+def test_migratorignore_can_reinclude_build_output(tmp_path):
+    root = str(tmp_path)
+    with open(os.path.join(root, ".migratorignore"), "w", encoding="utf-8") as f:
+        f.write("!build/\n")
+    rules = IgnoreRules.for_root(root)
+    assert not rules.ignored("build", is_dir=True)
+    assert rules.ignored("target", is_dir=True)
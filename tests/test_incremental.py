@@ -0,0 +1,46 @@
+import os
+
+from utils.incremental import ExtractionManifest
+from utils.source_scanner import SourceFile
+
+VERSIONS = {"java": "1111", "page": "2222-html.parser", "documents": "3333"}
+
+def _source_file(path):
+    stat = os.stat(path)
+    return SourceFile(path, stat.st_size, stat.st_mtime)
+
+def _extract_once(tmp_path):
+    root = tmp_path / "project"
+    root.mkdir()
+    path = root / "Order.java"
+    path.write_text("@Entity class Order {}\n", encoding="utf-8")
+    files = [_source_file(str(path))]
+
+    manifest = ExtractionManifest(str(root), versions=VERSIONS)
+    to_extract, removed, hashes = manifest.diff(files)
+    manifest.update(to_extract, removed, hashes, {str(path): {"Entity:Order", "Entity:OrderLine"}})
+    manifest.save(str(tmp_path / "manifest.json"))
+    return str(root), files
+
+def test_unchanged_files_are_skipped_with_the_same_extractors(tmp_path):
+    root, files = _extract_once(tmp_path)
+    manifest = ExtractionManifest.load(str(tmp_path / "manifest.json"), root, dict(VERSIONS))
+
+    to_extract, removed, _ = manifest.diff(files)
+    assert to_extract == [] and removed == []
+
+def test_every_file_is_extracted_again_after_an_extractor_changes(tmp_path):
+    root, files = _extract_once(tmp_path)
+    versions = dict(VERSIONS, java="4444")
+    manifest = ExtractionManifest.load(str(tmp_path / "manifest.json"), root, versions)
+
+    to_extract, removed, hashes = manifest.diff(files)
+    assert to_extract == files and removed == []
+
+    # Elements the new extractor no longer produces are stale
+    stale = manifest.update(to_extract, removed, hashes, {files[0].path: {"Entity:Order"}})
+    assert stale == {"Entity:OrderLine"}
+
+    manifest.save(str(tmp_path / "manifest.json"))
+    reloaded = ExtractionManifest.load(str(tmp_path / "manifest.json"), root, versions)
+    assert reloaded.diff(files)[0] == []
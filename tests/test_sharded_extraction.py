@@ -0,0 +1,131 @@
+import os
+
+import sharded_extraction
+from sharded_extraction import ShardedExtraction
+from utils.graph_store import GraphStore, open_graph_store
+from utils.graph_writer import build_query
+
+SOURCES = {
+    "src/main/java/org/acme/model/Order.java": """
+package org.acme.model;
+
+@Entity
+@Table(name = "orders")
+public class Order {
+    @Id
+    private Long id;
+}
+""",
+    "src/main/java/org/acme/data/OrderRepository.java": """
+package org.acme.data;
+
+import org.acme.model.Order;
+
+@Repository
+public class OrderRepository {
+    public Order findById(Long id) { return null; }
+}
+""",
+    "src/main/java/org/acme/service/OrderService.java": """
+package org.acme.service;
+
+import org.acme.data.OrderRepository;
+
+@Service
+public class OrderService {
+    @Autowired
+    private OrderRepository orders;
+}
+""",
+    "src/main/java/org/acme/rest/OrderController.java": """
+package org.acme.rest;
+
+import org.acme.service.OrderService;
+
+@RestController
+public class OrderController {
+    @Autowired
+    private OrderService service;
+
+    @GetMapping("/orders")
+    public String list() { return ""; }
+}
+""",
+}
+
+class _CypherStore(GraphStore):
+    """Builds the Cypher of every write, as a Neo4j store does, and rejects
+    what Neo4j would reject before applying the write to an embedded graph"""
+
+    def __init__(self, store):
+        self.store = store
+        self.queries = []
+
+    def ensure_schema(self, scoped=False):
+        return self.store.ensure_schema(scoped)
+
+    def _write(self, batches, batch_size):
+        for group, _ in batches:
+            query = build_query(group)
+            updated = False
+            for line in query.splitlines():
+                if line.startswith("WITH"):
+                    updated = False
+                elif line.startswith(("MATCH", "OPTIONAL MATCH", "UNWIND")) and updated:
+                    raise ValueError(f"WITH is required between {line!r} and the update before it:\n{query}")
+                elif line.startswith(("SET", "MERGE", "CREATE", "DELETE", "DETACH DELETE", "REMOVE")):
+                    updated = True
+            self.queries.append(query)
+        self.store.write(batches, batch_size)
+
+    def _read(self, name, params):
+        return self.store.read(name, **params)
+
+    def iter_nodes(self):
+        return self.store.iter_nodes()
+
+    def iter_edges(self):
+        return self.store.iter_edges()
+
+    def close(self):
+        self.store.close()
+
+def test_merge_keeps_relationships_between_shards(tmp_path, monkeypatch):
+    root = tmp_path / "project"
+    for rel_path, source in SOURCES.items():
+        path = root / rel_path
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(source, encoding="utf-8")
+
+    uri = "memory://test-sharded-merge"
+    # Held open so the merged graph outlives the merge
+    graph = open_graph_store(uri, "neo4j", "password")
+    stores = []
+
+    def open_cypher_store(*args):
+        stores.append(_CypherStore(open_graph_store(*args)))
+        return stores[-1]
+
+    monkeypatch.setattr(sharded_extraction, "open_graph_store", open_cypher_store)
+    monkeypatch.setattr(ShardedExtraction, "_extract_documents", lambda self, root, documents, metrics: None)
+
+    extraction = ShardedExtraction(
+        str(root), uri, queue_path=str(tmp_path / "queue.db"), shard_dir=str(tmp_path / "shards"),
+        incremental=False, manifest_path=str(tmp_path / "manifest.json"), cache_path="", parse_workers=1,
+        metrics_path=None, report_path=str(tmp_path / "report.txt")
+    )
+    try:
+        assert extraction.plan(shards=4) > 1
+        extraction.work("test-worker")
+        shard_edges = sum(task["result"]["edges"] for task in extraction.queue.tasks())
+        extraction.merge()
+
+        assert any("WITH a, row" in query for query in stores[0].queries)
+        names = {node_id: props.get("name") for node_id, _, props in graph.iter_nodes()}
+        edges = {(names[start], rel_type, names[end]) for start, rel_type, end, _ in graph.iter_edges()}
+        assert shard_edges and len(edges) == shard_edges
+        assert ("OrderService", "DEPENDS_ON", "OrderRepository") in edges
+        assert ("OrderController", "DEPENDS_ON", "OrderService") in edges
+        assert os.path.exists(tmp_path / "report.txt")
+    finally:
+        graph.close()
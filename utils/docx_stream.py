@@ -0,0 +1,78 @@
+import zipfile
+from typing import Iterator, List
+from xml.etree.ElementTree import iterparse
+
+WORD_NAMESPACE = "{http://schemas.openxmlformats.org/wordprocessingml/2006/main}"
+
+_P = WORD_NAMESPACE + "p"
+_T = WORD_NAMESPACE + "t"
+_TAB = WORD_NAMESPACE + "tab"
+_PPR = WORD_NAMESPACE + "pPr"
+_BREAKS = (WORD_NAMESPACE + "br", WORD_NAMESPACE + "cr")
+_TC = WORD_NAMESPACE + "tc"
+_TR = WORD_NAMESPACE + "tr"
+_CONTAINERS = (_P, _TC, _TR)
+
+def iter_docx_text(file_path: str) -> Iterator[str]:
+    """Yield the text of a .docx body progressively, without building its object model.
+
+    `word/document.xml` is streamed out of the zip and parsed
+    incrementally. Each paragraph is yielded as it ends, with tabs and
+    line breaks kept; the tab stops a paragraph's properties define are
+    not text. Each table row is yielded as one line of
+    tab-separated cells; a cell holding several paragraphs joins them with
+    newlines, and a nested table's rows become paragraphs of their cell.
+    Parsed elements are cleared as soon as their text is taken, so memory
+    stays flat however long the document is.
+    """
+    with zipfile.ZipFile(file_path) as archive:
+        with archive.open("word/document.xml") as stream:
+            # Open paragraphs, cells and rows, innermost last, each with the
+            # text collected for it so far
+            stack: List[tuple] = []
+            # Inside paragraph properties, whose w:tabs/w:tab elements are
+            # tab stop definitions rather than tab characters
+            properties = 0
+
+            for event, element in iterparse(stream, events=("start", "end")):
+                tag = element.tag
+                if event == "start":
+                    if tag in _CONTAINERS:
+                        stack.append((tag, []))
+                    elif tag == _PPR:
+                        properties += 1
+                    continue
+
+                if tag == _PPR:
+                    properties -= 1
+                elif properties:
+                    continue
+                elif tag == _T:
+                    if stack and stack[-1][0] == _P and element.text:
+                        stack[-1][1].append(element.text)
+                elif tag == _TAB:
+                    if stack and stack[-1][0] == _P:
+                        stack[-1][1].append("\t")
+                elif tag in _BREAKS:
+                    if stack and stack[-1][0] == _P:
+                        stack[-1][1].append("\n")
+                elif tag in _CONTAINERS:
+                    _, parts = stack.pop()
+                    if tag == _P:
+                        text = "".join(parts)
+                    elif tag == _TC:
+                        text = "\n".join(parts)
+                    else:
+                        text = "\t".join(parts)
+
+                    parent = stack[-1][0] if stack else None
+                    if tag == _TC:
+                        stack[-1][1].append(text)
+                    elif parent == _TC:
+                        # A paragraph or nested table row inside a cell
+                        stack[-1][1].append(text)
+                    else:
+                        # Body paragraphs, table rows, and paragraphs of
+                        # text boxes anchored inside another paragraph
+                        yield text
+                    element.clear()
@@ -0,0 +1,142 @@
+import hashlib
+import os
+import sqlite3
+import time
+from array import array
+from typing import Dict, List, Optional
+from langchain_core.embeddings import Embeddings
+
+EMBEDDING_BATCH_SIZE = int(os.getenv("EMBEDDING_BATCH_SIZE", "64"))
+EMBEDDING_WORKERS = int(os.getenv("EMBEDDING_WORKERS", "1"))
+EMBEDDING_CACHE = os.getenv("EMBEDDING_CACHE", "embedding_cache.db")
+
+class EmbeddingCache:
+    """Embedding vectors on local disk, keyed by model name and text hash.
+
+    Vectors are stored as float32 bytes in a single SQLite file, which can
+    be shared between projects and runs.
+    """
+
+    def __init__(self, path: str = EMBEDDING_CACHE):
+        self.path = path
+        self.conn = sqlite3.connect(path)
+        self.conn.execute("""
+            CREATE TABLE IF NOT EXISTS embeddings (
+                key TEXT PRIMARY KEY,
+                vector BLOB NOT NULL
+            )
+        """)
+
+    @staticmethod
+    def key(model_name: str, text: str) -> str:
+        return f"{model_name}:{hashlib.sha1(text.encode('utf-8')).hexdigest()}"
+
+    def get_many(self, keys: List[str]) -> Dict[str, List[float]]:
+        found = {}
+        # Stay below SQLite's bound parameter limit
+        for i in range(0, len(keys), 500):
+            batch = keys[i:i + 500]
+            placeholders = ", ".join("?" for _ in batch)
+            for key, blob in self.conn.execute(
+                f"SELECT key, vector FROM embeddings WHERE key IN ({placeholders})", batch
+            ):
+                found[key] = array("f", blob).tolist()
+        return found
+
+    def put_many(self, vectors: Dict[str, List[float]]):
+        self.conn.executemany(
+            "INSERT OR REPLACE INTO embeddings (key, vector) VALUES (?, ?)",
+            [(key, array("f", vector).tobytes()) for key, vector in vectors.items()]
+        )
+        self.conn.commit()
+
+    def close(self):
+        self.conn.close()
+
+class EmbeddingEngine(Embeddings):
+    """Sentence-transformers embeddings with batching, an optional process pool and a disk cache.
+
+    Texts whose vectors are cached for this model are never encoded
+    again; the rest are encoded once per distinct text in batches of
+    `batch_size`, across `workers` processes when more than one is
+    configured. An empty cache path disables the cache.
+    """
+
+    def __init__(self, model_name: str = "all-MiniLM-L6-v2", batch_size: Optional[int] = None,
+                 workers: Optional[int] = None, cache_path: Optional[str] = EMBEDDING_CACHE):
+        self.model_name = model_name
+        self.batch_size = batch_size or EMBEDDING_BATCH_SIZE
+        self.workers = EMBEDDING_WORKERS if workers is None else workers
+        self.cache = EmbeddingCache(cache_path) if cache_path else None
+        self._model = None
+        self._pool = None
+
+        # Statistics
+        self.requested = 0
+        self.cache_hits = 0
+        self.encoded = 0
+        self.encode_seconds = 0.0
+
+    @property
+    def model(self):
+        if self._model is None:
+            from sentence_transformers import SentenceTransformer
+            self._model = SentenceTransformer(self.model_name)
+        return self._model
+
+    def _encode(self, texts: List[str]) -> List[List[float]]:
+        start = time.perf_counter()
+        if self.workers > 1 and len(texts) > self.batch_size:
+            if self._pool is None:
+                self._pool = self.model.start_multi_process_pool(target_devices=["cpu"] * self.workers)
+            vectors = self.model.encode_multi_process(texts, self._pool, batch_size=self.batch_size)
+        else:
+            vectors = self.model.encode(texts, batch_size=self.batch_size, convert_to_numpy=True)
+        self.encode_seconds += time.perf_counter() - start
+        self.encoded += len(texts)
+        return [vector.tolist() for vector in vectors]
+
+    def embed_documents(self, texts: List[str]) -> List[List[float]]:
+        self.requested += len(texts)
+        keys = [EmbeddingCache.key(self.model_name, text) for text in texts]
+        vectors = self.cache.get_many(list(set(keys))) if self.cache else {}
+        self.cache_hits += sum(1 for key in keys if key in vectors)
+
+        # Encode each distinct uncached text once
+        missing = {}
+        for key, text in zip(keys, texts):
+            if key not in vectors:
+                missing.setdefault(key, text)
+        if missing:
+            encoded = dict(zip(missing, self._encode(list(missing.values()))))
+            if self.cache:
+                self.cache.put_many(encoded)
+            vectors.update(encoded)
+
+        return [vectors[key] for key in keys]
+
+    def embed_query(self, text: str) -> List[float]:
+        return self.embed_documents([text])[0]
+
+    def stats(self) -> Dict[str, float]:
+        rate = self.encoded / self.encode_seconds if self.encode_seconds else 0.0
+        return {
+            "requested": self.requested,
+            "cache_hits": self.cache_hits,
+            "encoded": self.encoded,
+            "encode_seconds": round(self.encode_seconds, 3),
+            "chunks_per_second": round(rate, 1)
+        }
+
+    def report(self) -> str:
+        stats = self.stats()
+        return (f"{stats['requested']} chunks, {stats['cache_hits']} from cache, {stats['encoded']} encoded "
+                f"in {stats['encode_seconds']}s ({stats['chunks_per_second']} chunks/s)")
+
+    def close(self):
+        """Stop the encode pool and close the cache"""
+        if self._pool is not None:
+            self.model.stop_multi_process_pool(self._pool)
+            self._pool = None
+        if self.cache:
+            self.cache.close()
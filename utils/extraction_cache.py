@@ -0,0 +1,113 @@
+import hashlib
+import marshal
+import os
+import sqlite3
+import time
+import zlib
+from typing import Any, Dict, Optional
+
+CACHE_PATH = os.getenv("EXTRACTION_CACHE", "extraction_cache.db")
+CACHE_MAX_MB = float(os.getenv("EXTRACTION_CACHE_MAX_MB", "512"))
+
+def extractor_version(*modules) -> str:
+    """Version of the extraction code: a hash of the given modules' source files.
+
+    Any edit to an extractor invalidates the records it cached.
+    """
+    digest = hashlib.sha1()
+    for module in modules:
+        with open(module.__file__, "rb") as f:
+            digest.update(f.read())
+    return digest.hexdigest()[:16]
+
+class ExtractionCache:
+    """Per-file extraction records on local disk, keyed by content hash and extractor version.
+
+    Records are stored marshal-encoded and zlib-compressed in a single
+    SQLite file, so the cache can be saved and restored as one CI
+    artifact. The file is kept under `max_mb` by evicting the least
+    recently used records on close.
+    """
+
+    def __init__(self, path: str = CACHE_PATH, max_mb: float = CACHE_MAX_MB):
+        self.path = path
+        self.max_bytes = int(max_mb * 1024 * 1024)
+        # Opened where the extraction is set up, used by the thread that runs it
+        self.conn = sqlite3.connect(path, check_same_thread=False)
+        self.conn.execute("""
+            CREATE TABLE IF NOT EXISTS records (
+                key TEXT PRIMARY KEY,
+                data BLOB NOT NULL,
+                size INTEGER NOT NULL,
+                last_used REAL NOT NULL
+            )
+        """)
+        self.conn.execute("CREATE INDEX IF NOT EXISTS records_last_used ON records (last_used)")
+        self.used: Dict[str, float] = {}
+        self.hits = 0
+        self.misses = 0
+        self.stored = 0
+        self.evicted = 0
+
+    @staticmethod
+    def _key(kind: str, version: str, content_hash: str) -> str:
+        return f"{kind}:{version}:{content_hash}"
+
+    def get(self, kind: str, version: str, content_hash: str) -> Optional[Any]:
+        """Return the cached record or None"""
+        key = self._key(kind, version, content_hash)
+        row = self.conn.execute("SELECT data FROM records WHERE key = ?", (key,)).fetchone()
+        if row is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        self.used[key] = time.time()
+        return marshal.loads(zlib.decompress(row[0]))
+
+    def put(self, kind: str, version: str, content_hash: str, record: Any):
+        """Store a record built only from dicts, lists, tuples, strings, numbers and None"""
+        data = zlib.compress(marshal.dumps(record))
+        self.conn.execute(
+            "INSERT OR REPLACE INTO records (key, data, size, last_used) VALUES (?, ?, ?, ?)",
+            (self._key(kind, version, content_hash), data, len(data), time.time())
+        )
+        self.stored += 1
+
+    def _evict(self):
+        total = self.conn.execute("SELECT COALESCE(SUM(size), 0) FROM records").fetchone()[0]
+        if total <= self.max_bytes:
+            return
+
+        victims = []
+        for key, size in self.conn.execute("SELECT key, size FROM records ORDER BY last_used"):
+            if total <= self.max_bytes:
+                break
+            victims.append((key,))
+            total -= size
+        self.conn.executemany("DELETE FROM records WHERE key = ?", victims)
+        self.evicted += len(victims)
+
+    def stats(self) -> Dict[str, Any]:
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / lookups, 3) if lookups else 0.0,
+            "stored": self.stored,
+            "evicted": self.evicted
+        }
+
+    def report(self) -> str:
+        stats = self.stats()
+        return (f"{stats['hits']} hits, {stats['misses']} misses "
+                f"({stats['hit_rate']:.1%} hit rate), {stats['stored']} stored, {stats['evicted']} evicted")
+
+    def close(self):
+        """Record hit times, enforce the size cap and commit"""
+        self.conn.executemany(
+            "UPDATE records SET last_used = ? WHERE key = ?",
+            [(used, key) for key, used in self.used.items()]
+        )
+        self._evict()
+        self.conn.commit()
+        self.conn.close()
@@ -0,0 +1,137 @@
+import asyncio
+import os
+import threading
+import time
+from typing import List, Optional, Tuple
+from neo4j import AsyncGraphDatabase
+from utils.graph_writer import build_query
+
+DEFAULT_QUEUE_SIZE = int(os.getenv("GRAPH_WRITE_QUEUE", "4"))
+
+class AsyncGraphSink:
+    """Consumer side of the extraction pipeline: writes flushed batches through the async driver.
+
+    Writers hand their flushed batches to `submit`, which returns as soon
+    as the batch is queued, so parsing continues while earlier batches are
+    in flight to Neo4j. The queue holds at most `queue_size` batches;
+    `submit` blocks when it is full, which bounds memory. Batches are
+    written one transaction at a time in submission order, so nodes are
+    always written before the relationships that match them.
+    """
+
+    def __init__(self, uri: str, user: str, password: str, queue_size: Optional[int] = None):
+        self.uri = uri
+        self.auth = (user, password)
+        self.queue_size = queue_size or DEFAULT_QUEUE_SIZE
+        self.loop = asyncio.new_event_loop()
+        self.queue: Optional[asyncio.Queue] = None
+        self.error: Optional[Exception] = None
+        self.ready = threading.Event()
+        # Set to an ExtractionMetrics (see utils.metrics) to time transactions
+        self.metrics = None
+        self.thread = threading.Thread(target=self._run, name="graph-writer", daemon=True)
+        self.thread.start()
+        self.ready.wait()
+        if self.error:
+            raise self.error
+
+        # Statistics
+        self.batches = 0
+        self.wait_seconds = 0.0
+
+    def _run(self):
+        asyncio.set_event_loop(self.loop)
+        self.loop.run_until_complete(self._consume())
+        self.loop.close()
+
+    async def _consume(self):
+        self.queue = asyncio.Queue(maxsize=self.queue_size)
+        try:
+            driver = AsyncGraphDatabase.driver(self.uri, auth=self.auth)
+        except Exception as e:
+            self.error = e
+            return
+        finally:
+            self.ready.set()
+        try:
+            while True:
+                item = await self.queue.get()
+                try:
+                    if item is None:
+                        return
+                    writer, batches = item
+                    await self._write(driver, writer, batches)
+                except Exception as e:
+                    print(f"⚠️  Async graph write failed: {str(e)}")
+                finally:
+                    self.queue.task_done()
+        finally:
+            await driver.close()
+
+    def submit(self, writer, batches: List[Tuple[tuple, List]]):
+        """Queue a writer's flushed batches, blocking while the queue is full"""
+        start = time.perf_counter()
+        asyncio.run_coroutine_threadsafe(self.queue.put((writer, batches)), self.loop).result()
+        self.wait_seconds += time.perf_counter() - start
+        self.batches += 1
+
+    def drain(self):
+        """Block until every queued batch has been written"""
+        if self.thread.is_alive():
+            asyncio.run_coroutine_threadsafe(self.queue.join(), self.loop).result()
+
+    def close(self):
+        """Write the remaining batches and stop the consumer"""
+        if self.thread.is_alive():
+            asyncio.run_coroutine_threadsafe(self.queue.put(None), self.loop).result()
+            self.thread.join()
+
+    async def _transaction(self, driver, batches, batch_size):
+        start = time.perf_counter()
+        try:
+            async with driver.session() as session:
+                await session.execute_write(_run_batches_async,
+                                            [(build_query(group), rows) for group, rows in batches], batch_size)
+        except Exception:
+            if self.metrics is not None:
+                self.metrics.observe_write(batches, time.perf_counter() - start, ok=False)
+            raise
+        if self.metrics is not None:
+            self.metrics.observe_write(batches, time.perf_counter() - start)
+
+    async def _write(self, driver, writer, batches):
+        """Same semantics as BatchGraphWriter.flush: one transaction, then per group and per row on failure"""
+        start = time.perf_counter()
+        try:
+            await self._transaction(driver, batches, writer.batch_size)
+            writer.record_write(sum(len(rows) for _, rows in batches), 0, 1, time.perf_counter() - start)
+            return
+        except Exception as e:
+            print(f"⚠️  Batch write failed ({str(e)}), retrying statement by statement")
+
+        for group, rows in batches:
+            group_start = time.perf_counter()
+            try:
+                await self._transaction(driver, [(group, rows)], writer.batch_size)
+                writer.record_write(len(rows), 0, 1, time.perf_counter() - group_start)
+                continue
+            except Exception:
+                pass
+
+            for row in rows:
+                row_start = time.perf_counter()
+                try:
+                    await self._transaction(driver, [(group, [row])], writer.batch_size)
+                    writer.record_write(1, 0, 1, time.perf_counter() - row_start)
+                except Exception as e:
+                    writer.record_write(0, 1, 0, time.perf_counter() - row_start)
+                    print(f"⚠️  Failed to write row {row}: {str(e)}")
+
+    def report(self) -> str:
+        return f"{self.batches} batches queued, producers waited {self.wait_seconds:.3f}s on a full queue"
+
+async def _run_batches_async(tx, batches, batch_size):
+    for query, rows in batches:
+        for i in range(0, len(rows), batch_size):
+            result = await tx.run(query, rows=rows[i:i + batch_size])
+            await result.consume()
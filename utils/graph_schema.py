@@ -0,0 +1,129 @@
+import os
+from typing import Dict, List, Tuple
+
+# (label, key properties) of every node the extractors MERGE on. Each key
+# gets a uniqueness constraint, which also backs MERGE and MATCH with an index.
+UNIQUE_KEYS: List[Tuple[str, Tuple[str, ...]]] = [
+    ("Component", ("name",)),
+    ("Action", ("name",)),
+    ("Entity", ("name",)),
+    ("Table", ("name",)),
+    ("Page", ("name",)),
+    ("Form", ("id",)),
+    ("FormField", ("name",)),
+    ("Template", ("name",)),
+    ("Resource", ("path",)),
+]
+
+# Other properties looked up by the extractors, planner and converters.
+# Composite keys are indexed rather than constrained, since composite
+# uniqueness is not available on every Neo4j edition.
+INDEXES: List[Tuple[str, Tuple[str, ...]]] = [
+    ("Column", ("name", "type")),
+    ("Database", ("type", "configFile")),
+    ("Controller", ("name",)),
+    ("Service", ("name",)),
+    ("Model", ("name",)),
+    ("Repository", ("name",)),
+    ("Component", ("filePath",)),
+]
+
+# Property tagging every node and relationship with its project when
+# several projects share one graph (see BatchGraphWriter.project)
+PROJECT_KEY = "project"
+
+# Key each node label is merged on: its unique key, or for Column and
+# Database the composite key they are indexed on
+MERGE_KEYS: Dict[str, Tuple[str, ...]] = dict(UNIQUE_KEYS)
+MERGE_KEYS.update((label, properties) for label, properties in INDEXES if label in ("Column", "Database"))
+
+def _schema_name(kind: str, label: str, properties: Tuple[str, ...]) -> str:
+    return "_".join([label.lower(), *properties, kind])
+
+def schema_keys(scoped: bool = False) -> Tuple[List[Tuple[str, Tuple[str, ...]]], List[Tuple[str, Tuple[str, ...]]]]:
+    """(unique keys, indexes), with the project key leading each when the graph holds several projects"""
+    if not scoped:
+        return UNIQUE_KEYS, INDEXES
+    unique_keys = [(label, (PROJECT_KEY,) + properties) for label, properties in UNIQUE_KEYS]
+    # Lookups that do not name a project (e.g. by file path) keep their plain indexes
+    indexes = [(label, (PROJECT_KEY,) + properties) for label, properties in INDEXES] + INDEXES
+    return unique_keys, indexes
+
+def _constraint_statement(label: str, properties: Tuple[str, ...]) -> str:
+    fields = ", ".join(f"n.{name}" for name in properties)
+    return (f"CREATE CONSTRAINT {_schema_name('unique', label, properties)} IF NOT EXISTS "
+            f"FOR (n:{label}) REQUIRE ({fields}) IS UNIQUE")
+
+def _index_statement(label: str, properties: Tuple[str, ...]) -> str:
+    fields = ", ".join(f"n.{name}" for name in properties)
+    return f"CREATE INDEX {_schema_name('index', label, properties)} IF NOT EXISTS FOR (n:{label}) ON ({fields})"
+
+def schema_statements(scoped: bool = False) -> List[str]:
+    """Idempotent Cypher statements creating every constraint and index.
+
+    Scoped for a graph shared by several projects, each unique key leads
+    with the project key (see ensure_schema for how the plain constraints
+    are replaced).
+    """
+    unique_keys, indexes = schema_keys(scoped)
+    return ([_constraint_statement(label, properties) for label, properties in unique_keys] +
+            [_index_statement(label, properties) for label, properties in indexes])
+
+def ensure_schema(driver, scoped: bool = False) -> int:
+    """Create any missing constraints and indexes, returning how many statements succeeded.
+
+    A statement that fails (e.g. because existing data violates a
+    constraint) is reported and skipped so extraction can still run.
+
+    Scoped, a name is only unique within its project. Composite
+    uniqueness is not available on every edition, so where a (project,
+    key) constraint cannot be created a plain (project, key) index backs
+    the MERGEs instead. The name-unique constraint a key had before is
+    dropped only once its replacement is in place.
+    """
+    applied = 0
+    with driver.session() as session:
+        def run(statement, quiet=False):
+            try:
+                session.run(statement).consume()
+                return True
+            except Exception as e:
+                if not quiet:
+                    print(f"⚠️  Could not apply schema statement '{statement}': {str(e)}")
+                return False
+
+        unique_keys, indexes = schema_keys(scoped)
+        for (label, properties), (_, plain_properties) in zip(unique_keys, UNIQUE_KEYS):
+            if not scoped:
+                applied += run(_constraint_statement(label, properties))
+                continue
+
+            replaced = run(_constraint_statement(label, properties), quiet=True)
+            if not replaced:
+                print(f"⚠️  No composite uniqueness for {label}({', '.join(properties)}); indexing it instead")
+                replaced = run(_index_statement(label, properties))
+            if replaced:
+                applied += 1
+                run(f"DROP CONSTRAINT {_schema_name('unique', label, plain_properties)} IF EXISTS")
+
+        for label, properties in indexes:
+            applied += run(_index_statement(label, properties))
+    return applied
+
+if __name__ == "__main__":
+    import sys
+    from utils.graph_store import open_graph_store
+
+    # --projects applies the project-scoped schema of a graph shared by several projects
+    scoped = "--projects" in sys.argv[1:]
+
+    uri = os.getenv("NEO4J_URI", "bolt://localhost:7687")
+    user = os.getenv("NEO4J_USER", "neo4j")
+    password = os.getenv("NEO4J_PASSWORD", "password")
+
+    store = open_graph_store(uri, user, password)
+    try:
+        applied = store.ensure_schema(scoped)
+    finally:
+        store.close()
+    print(f"✅ Applied {applied}/{len(schema_statements(scoped))} schema statements")
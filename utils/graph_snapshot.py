@@ -0,0 +1,144 @@
+import gzip
+import json
+import os
+import sys
+import time
+from typing import Any, Dict, List, Optional, Tuple
+
+from utils.graph_schema import MERGE_KEYS, PROJECT_KEY
+from utils.graph_writer import BatchGraphWriter, NodeRef
+
+SNAPSHOT_FORMAT = "code-migrator-graph"
+SNAPSHOT_VERSION = 1
+
+def _merge_key(labels: List[str], props: Dict[str, Any]) -> Tuple[str, Dict[str, Any]]:
+    """The label and key a node is merged on when the snapshot is loaded.
+
+    A node without a known label, or missing its key, is merged on all of
+    its properties. A node tagged with a project is merged within it.
+    """
+    label = next((label for label in MERGE_KEYS if label in labels), "")
+    fields = MERGE_KEYS.get(label, ())
+    if not fields or any(props.get(field) is None for field in fields):
+        return "", dict(props)
+    # Nodes of a graph shared by several projects are keyed within their project
+    if PROJECT_KEY in props:
+        fields = (PROJECT_KEY,) + fields
+    return label, {field: props[field] for field in fields}
+
+def export_snapshot(store, path: str) -> Dict[str, Any]:
+    """Write every node and relationship of a graph store to a gzip-compressed JSON lines snapshot.
+
+    The first line is a header with the format and version, then one line
+    per node, one per relationship, and a trailer with the counts so a
+    truncated file is detected on load. Nodes are written with the label
+    and key they are merged on, and relationships name their endpoints by
+    that label and key, so a snapshot loads into any store, empty or not.
+    The file is written next to its destination and moved into place.
+    """
+    start = time.perf_counter()
+    refs: Dict[Any, Tuple[str, Dict[str, Any]]] = {}
+    nodes = edges = 0
+    tmp_path = f"{path}.tmp"
+    with gzip.open(tmp_path, "wt", encoding="utf-8") as f:
+        def write(item):
+            f.write(json.dumps(item, separators=(",", ":"), sort_keys=True) + "\n")
+
+        write({"format": SNAPSHOT_FORMAT, "version": SNAPSHOT_VERSION, "created": time.time()})
+        for node_id, labels, props in store.iter_nodes():
+            label, key = _merge_key(labels, props)
+            refs[node_id] = (label, key)
+            write({
+                "kind": "node",
+                "label": label,
+                "key": key,
+                "labels": [extra for extra in labels if extra != label],
+                "props": {name: value for name, value in props.items() if name not in key}
+            })
+            nodes += 1
+        for start_id, rel_type, end_id, props in store.iter_edges():
+            write({"kind": "edge", "start": refs[start_id], "type": rel_type, "end": refs[end_id], "props": props})
+            edges += 1
+        write({"kind": "end", "nodes": nodes, "edges": edges})
+    os.replace(tmp_path, path)
+
+    return {
+        "nodes": nodes,
+        "edges": edges,
+        "bytes": os.path.getsize(path),
+        "seconds": round(time.perf_counter() - start, 3)
+    }
+
+def load_snapshot(store, path: str, batch_size: Optional[int] = None) -> Dict[str, Any]:
+    """Bulk-load a snapshot written by export_snapshot into a graph store.
+
+    Nodes and relationships are merged through a BatchGraphWriter, so they
+    are written in batched transactions and loading the same snapshot twice
+    changes nothing. Raises ValueError for a file of another format or a
+    newer version, and for a truncated file (after loading what it holds).
+    """
+    start = time.perf_counter()
+    writer = BatchGraphWriter(store, batch_size)
+    nodes = edges = 0
+    trailer = None
+    with gzip.open(path, "rt", encoding="utf-8") as f:
+        header = json.loads(f.readline() or "{}")
+        if header.get("format") != SNAPSHOT_FORMAT:
+            raise ValueError(f"{path} is not a graph snapshot")
+        if header.get("version", 0) > SNAPSHOT_VERSION:
+            raise ValueError(f"{path} is a version {header['version']} snapshot; "
+                             f"this version reads up to {SNAPSHOT_VERSION}")
+
+        for line in f:
+            item = json.loads(line)
+            if item["kind"] == "node":
+                writer.merge_node(item["label"], item["key"], item["props"], labels=tuple(item["labels"]))
+                nodes += 1
+            elif item["kind"] == "edge":
+                # Every node precedes the relationships, so endpoints are only matched
+                writer.merge_edge(
+                    NodeRef(*item["start"], merge=False),
+                    item["type"],
+                    NodeRef(*item["end"], merge=False),
+                    item["props"]
+                )
+                edges += 1
+            elif item["kind"] == "end":
+                trailer = item
+    writer.close()
+
+    if trailer is None or (trailer["nodes"], trailer["edges"]) != (nodes, edges):
+        raise ValueError(f"{path} is truncated: loaded {nodes} nodes and {edges} relationships")
+    return {
+        "nodes": nodes,
+        "edges": edges,
+        "seconds": round(time.perf_counter() - start, 3)
+    }
+
+def describe(stats: Dict[str, Any]) -> str:
+    report = f"{stats['nodes']} nodes, {stats['edges']} relationships in {stats['seconds']}s"
+    if "bytes" in stats:
+        report += f", {stats['bytes'] / (1024 * 1024):.2f} MB"
+    return report
+
+if __name__ == "__main__":
+    from utils.graph_store import open_graph_store
+
+    if len(sys.argv) != 3 or sys.argv[1] not in ("export", "load"):
+        print("Usage: python -m utils.graph_snapshot export|load <snapshot.jsonl.gz>")
+        sys.exit(2)
+    command, path = sys.argv[1:]
+
+    uri = os.getenv("NEO4J_URI", "bolt://localhost:7687")
+    user = os.getenv("NEO4J_USER", "neo4j")
+    password = os.getenv("NEO4J_PASSWORD", "password")
+
+    store = open_graph_store(uri, user, password)
+    try:
+        if command == "export":
+            print(f"📦 Exported {describe(export_snapshot(store, path))} to {path}")
+        else:
+            store.ensure_schema()
+            print(f"📦 Loaded {describe(load_snapshot(store, path))} from {path}")
+    finally:
+        store.close()
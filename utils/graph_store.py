@@ -0,0 +1,714 @@
+import json
+import os
+import sqlite3
+import threading
+import time
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Set, Tuple
+
+from utils import graph_schema
+from utils.graph_schema import PROJECT_KEY, schema_keys, schema_statements
+from utils.graph_writer import build_query, _run_batches
+
+# Schemes served by the embedded store; any other URI goes to Neo4j
+EMBEDDED_SCHEMES = ("memory://", "sqlite://")
+
+# Cypher of every named read used by the planner, the query tool and the
+# converters. The embedded store answers the same names with the same rows.
+# Every read takes an optional $project and then only sees that project's
+# part of a graph shared by several projects.
+CYPHER_READS: Dict[str, str] = {
+    "component_summary": """
+        MATCH (n)
+        WHERE (n:Controller OR n:Service OR n:Repository OR n:Model OR n:Entity)
+          AND ($project IS NULL OR n.project = $project)
+        OPTIONAL MATCH (n)-[r]->(m)
+        RETURN n.name as name,
+               [l IN labels(n) WHERE l <> 'Component'] as roles,
+               n.package as package,
+               count(distinct n) as count,
+               collect(distinct type(r)) as relationships,
+               collect(distinct m.name) as dependencies,
+               collect(CASE WHEN type(r) = 'HAS_COLUMN' AND m:Column THEN {
+                   name: m.name,
+                   type: m.type,
+                   constraints: COALESCE(m.constraints, [])
+               } END) as columns
+    """,
+    "database_info": """
+        MATCH (db:Database)
+        WHERE $project IS NULL OR db.project = $project
+        RETURN db.type as type, db.configFile as config
+        LIMIT 1
+    """,
+    "table_columns": """
+        MATCH (t:Table)
+        WHERE $project IS NULL OR t.project = $project
+        OPTIONAL MATCH (t)-[:HAS_COLUMN]->(c:Column)
+        RETURN t.name as table,
+               collect({
+                   name: c.name,
+                   type: c.type,
+                   constraints: c.constraints
+               }) as columns
+    """,
+    "entity_details": """
+        MATCH (e:Entity)
+        WHERE $project IS NULL OR e.project = $project
+        RETURN e.name as name,
+               e.variables as variables,
+               e.methods as methods
+    """,
+    "page_templates": """
+        MATCH (p:Page)
+        WHERE $project IS NULL OR p.project = $project
+        OPTIONAL MATCH (p)-[:USES_TEMPLATE]->(t:Template)
+        RETURN p.name as page,
+               p.filePath as path,
+               p.templateType as type,
+               count(distinct p) as count,
+               collect(distinct t.name) as templates
+    """,
+    "page_forms": """
+        MATCH (p:Page)-[:CONTAINS]->(f:Form)
+        WHERE $project IS NULL OR p.project = $project
+        OPTIONAL MATCH (f)-[:HAS_FIELD]->(field:FormField)
+        RETURN p.name as page,
+               f.id as form_id,
+               f.action as action,
+               f.method as method,
+               collect({
+                   name: field.name,
+                   type: field.type,
+                   validation: field.validation
+               }) as fields
+    """,
+    "resource_usage": """
+        MATCH (p:Page)-[:DEPENDS_ON]->(r:Resource)
+        WHERE $project IS NULL OR p.project = $project
+        WITH r.type as type, count(r) as count,
+             collect(distinct {path: r.path, page: p.name}) as resources
+        RETURN type, count, resources
+    """,
+    "file_metadata": """
+        MATCH (f:Component {filePath: $file_path})
+        WHERE (f:Model OR f:Controller OR f:Service)
+          AND ($project IS NULL OR f.project = $project)
+        OPTIONAL MATCH (f)-[r]->(related)
+        RETURN [l IN labels(f) WHERE l <> 'Component'][0] as type,
+               collect(DISTINCT {
+                   type: type(r),
+                   target: related.filePath,
+                   targetType: [l IN labels(related) WHERE l <> 'Component'][0]
+               }) as relationships
+    """,
+    "service_details": """
+        MATCH (s:Service)
+        WHERE s.name CONTAINS $service_name
+          AND ($project IS NULL OR s.project = $project)
+        OPTIONAL MATCH (c:Controller)-[:DEPENDS_ON]->(s)
+        OPTIONAL MATCH (s)-[:DEPENDS_ON]->(r:Repository)
+        OPTIONAL MATCH (c)-[:HAS_ACTION]->(a:Action)
+        RETURN s.name as name,
+               s.package as package,
+               collect(DISTINCT c.name) as controllers,
+               collect(DISTINCT r.name) as repositories,
+               collect(DISTINCT {method: a.httpMethod, path: a.path, name: a.name}) as actions
+    """,
+}
+
+class GraphStore:
+    """Where the knowledge graph lives: batched writes and named reads.
+
+    Writes are the (group, rows) batches flushed by BatchGraphWriter, all
+    applied in one transaction. Reads are addressed by name (see
+    CYPHER_READS) and return a list of dicts, so callers do not depend on
+    a query language.
+    """
+
+    # In-process stores gain nothing from overlapping writes with parsing
+    embedded = False
+    # Set to an ExtractionMetrics (see utils.metrics) to time writes and reads
+    metrics = None
+
+    def ensure_schema(self, scoped: bool = False) -> int:
+        """Create missing constraints and indexes, returning how many are in place.
+
+        Scoped, keys are unique per project (see graph_schema.schema_keys).
+        """
+        raise NotImplementedError
+
+    def write(self, batches: List[Tuple[tuple, List[Dict]]], batch_size: int):
+        """Apply flushed writer batches in one transaction"""
+        start = time.perf_counter()
+        try:
+            self._write(batches, batch_size)
+        except Exception:
+            if self.metrics is not None:
+                self.metrics.observe_write(batches, time.perf_counter() - start, ok=False)
+            raise
+        if self.metrics is not None:
+            self.metrics.observe_write(batches, time.perf_counter() - start)
+
+    def read(self, name: str, **params) -> List[Dict[str, Any]]:
+        """Rows of a named read; with project=key, of that project only"""
+        start = time.perf_counter()
+        try:
+            return self._read(name, params)
+        finally:
+            if self.metrics is not None:
+                self.metrics.observe_query("read", name, time.perf_counter() - start)
+
+    def _write(self, batches, batch_size):
+        raise NotImplementedError
+
+    def _read(self, name: str, params: Dict[str, Any]) -> List[Dict[str, Any]]:
+        raise NotImplementedError
+
+    def iter_nodes(self) -> Iterator[Tuple[Any, List[str], Dict[str, Any]]]:
+        """Every node as (id, labels, properties); ids are only meaningful to iter_edges"""
+        raise NotImplementedError
+
+    def iter_edges(self) -> Iterator[Tuple[Any, str, Any, Dict[str, Any]]]:
+        """Every relationship as (start id, type, end id, properties)"""
+        raise NotImplementedError
+
+    def query(self, cypher: str, params: Optional[Dict[str, Any]] = None) -> List[Dict[str, Any]]:
+        """Rows of an arbitrary Cypher query"""
+        raise NotImplementedError("Only a Neo4j graph store runs Cypher; use a bolt:// or neo4j:// URI")
+
+    def close(self):
+        pass
+
+class Neo4jGraphStore(GraphStore):
+    """The graph in a Neo4j server, reached through the official driver"""
+
+    def __init__(self, uri: str, user: str, password: str):
+        from neo4j import GraphDatabase
+
+        self.uri = uri
+        self.driver = GraphDatabase.driver(uri, auth=(user, password))
+
+    def ensure_schema(self, scoped=False) -> int:
+        return graph_schema.ensure_schema(self.driver, scoped)
+
+    def _write(self, batches, batch_size):
+        with self.driver.session() as session:
+            session.execute_write(_run_batches, [(build_query(group), rows) for group, rows in batches], batch_size)
+
+    def _read(self, name, params):
+        return self.query(CYPHER_READS[name], {"project": None, **params})
+
+    def query(self, cypher, params=None):
+        with self.driver.session() as session:
+            return [record.data() for record in session.run(cypher, params or {})]
+
+    def iter_nodes(self):
+        # Records are streamed from the server as they are consumed
+        with self.driver.session() as session:
+            for record in session.run("MATCH (n) RETURN elementId(n) AS id, labels(n) AS labels, properties(n) AS props"):
+                yield record["id"], record["labels"], record["props"]
+
+    def iter_edges(self):
+        with self.driver.session() as session:
+            for record in session.run("MATCH (a)-[r]->(b) RETURN elementId(a) AS start, type(r) AS type, "
+                                      "elementId(b) AS end, properties(r) AS props"):
+                yield record["start"], record["type"], record["end"], record["props"]
+
+    def close(self):
+        self.driver.close()
+
+class _Node:
+    __slots__ = ("id", "labels", "props")
+
+    def __init__(self, node_id: int, labels: List[str], props: Dict[str, Any]):
+        self.id = node_id
+        self.labels = labels
+        self.props = props
+
+def _freeze(value):
+    """Hashable form of a property value"""
+    if isinstance(value, list):
+        return tuple(_freeze(item) for item in value)
+    if isinstance(value, dict):
+        return tuple(sorted((name, _freeze(item)) for name, item in value.items()))
+    return value
+
+def _role(node: Optional[_Node]) -> Optional[str]:
+    """First label other than Component, like `[l IN labels(n) WHERE l <> 'Component'][0]`"""
+    if node is None:
+        return None
+    return next((label for label in node.labels if label != "Component"), None)
+
+def _prop(node: Optional[_Node], name: str):
+    return None if node is None else node.props.get(name)
+
+def _distinct(values: Iterable) -> List:
+    """collect(DISTINCT ...): first occurrence order, nulls dropped"""
+    seen = set()
+    result = []
+    for value in values:
+        if value is None:
+            continue
+        frozen = _freeze(value)
+        if frozen not in seen:
+            seen.add(frozen)
+            result.append(value)
+    return result
+
+class EmbeddedGraphStore(GraphStore):
+    """The graph held in process as an adjacency store, optionally persisted to SQLite.
+
+    Nodes carry an ordered label list and a property dict; relationships
+    are unique per (start, type, end), as the writer only MERGEs them.
+    Lookups by label and key go through hash indexes that are built on
+    first use and kept current as nodes change. With a path, every write
+    transaction is also committed to a SQLite file, which is loaded when
+    the store opens, so separate processes (extraction, planner, query
+    tool) see the same graph.
+    """
+
+    embedded = True
+
+    def __init__(self, path: Optional[str] = None):
+        self.path = path
+        self.lock = threading.RLock()
+        self.nodes: Dict[int, _Node] = {}
+        self.out_edges: Dict[int, Dict[Tuple[str, int], Dict[str, Any]]] = {}
+        self.in_edges: Dict[int, Set[Tuple[str, int]]] = {}
+        self.indexes: Dict[Tuple[str, Tuple[str, ...]], Dict[tuple, Set[int]]] = {}
+        self.next_id = 0
+        self.refs = 0
+        # Project the running read is limited to, if any
+        self.scope: Optional[str] = None
+        self.conn = None
+        # Elements changed by the running transaction, for persistence
+        self.dirty_nodes: Set[int] = set()
+        # (ordered like the writes, so edges keep their creation order on disk)
+        self.dirty_edges: Dict[Tuple[int, str, int], None] = {}
+        if path:
+            self._load()
+
+    # Persistence
+
+    def _load(self):
+        self.conn = sqlite3.connect(self.path, check_same_thread=False)
+        self.conn.executescript("""
+            CREATE TABLE IF NOT EXISTS nodes (
+                id INTEGER PRIMARY KEY,
+                labels TEXT NOT NULL,
+                props TEXT NOT NULL
+            );
+            CREATE TABLE IF NOT EXISTS edges (
+                start INTEGER NOT NULL,
+                type TEXT NOT NULL,
+                end INTEGER NOT NULL,
+                props TEXT NOT NULL,
+                PRIMARY KEY (start, type, end)
+            );
+        """)
+        for node_id, labels, props in self.conn.execute("SELECT id, labels, props FROM nodes ORDER BY id"):
+            self.nodes[node_id] = _Node(node_id, json.loads(labels), json.loads(props))
+            self.next_id = node_id + 1
+        for start, rel_type, end, props in self.conn.execute("SELECT start, type, end, props FROM edges ORDER BY rowid"):
+            self.out_edges.setdefault(start, {})[(rel_type, end)] = json.loads(props)
+            self.in_edges.setdefault(end, set()).add((rel_type, start))
+
+    def _persist(self):
+        if self.conn is None:
+            return
+        with self.conn:
+            for node_id in self.dirty_nodes:
+                node = self.nodes.get(node_id)
+                if node is None:
+                    self.conn.execute("DELETE FROM nodes WHERE id = ?", (node_id,))
+                else:
+                    self.conn.execute("INSERT INTO nodes (id, labels, props) VALUES (?, ?, ?) "
+                                      "ON CONFLICT (id) DO UPDATE SET labels = excluded.labels, props = excluded.props",
+                                      (node_id, json.dumps(node.labels), json.dumps(node.props)))
+            for start, rel_type, end in self.dirty_edges:
+                props = self.out_edges.get(start, {}).get((rel_type, end))
+                if props is None:
+                    self.conn.execute("DELETE FROM edges WHERE start = ? AND type = ? AND end = ?",
+                                      (start, rel_type, end))
+                else:
+                    # Updated in place, so edges reload in creation order
+                    self.conn.execute("INSERT INTO edges (start, type, end, props) VALUES (?, ?, ?, ?) "
+                                      "ON CONFLICT (start, type, end) DO UPDATE SET props = excluded.props",
+                                      (start, rel_type, end, json.dumps(props)))
+
+    # Indexes
+
+    def _index(self, label: str, fields: Tuple[str, ...]) -> Dict[tuple, Set[int]]:
+        index = self.indexes.get((label, fields))
+        if index is None:
+            index = self.indexes[(label, fields)] = {}
+            for node in self.nodes.values():
+                entry = self._index_entry(node, label, fields)
+                if entry is not None:
+                    index.setdefault(entry, set()).add(node.id)
+        return index
+
+    @staticmethod
+    def _index_entry(node: _Node, label: str, fields: Tuple[str, ...]) -> Optional[tuple]:
+        # An empty label indexes every node, like a label-less pattern matches any node
+        if label and label not in node.labels:
+            return None
+        if any(node.props.get(field) is None for field in fields):
+            return None
+        return tuple(_freeze(node.props[field]) for field in fields)
+
+    def _unindex(self, node: _Node):
+        for (label, fields), index in self.indexes.items():
+            entry = self._index_entry(node, label, fields)
+            if entry is not None:
+                index[entry].discard(node.id)
+
+    def _reindex(self, node: _Node):
+        for (label, fields), index in self.indexes.items():
+            entry = self._index_entry(node, label, fields)
+            if entry is not None:
+                index.setdefault(entry, set()).add(node.id)
+
+    def ensure_schema(self, scoped=False) -> int:
+        unique_keys, indexes = schema_keys(scoped)
+        with self.lock:
+            for label, fields in unique_keys + indexes:
+                self._index(label, tuple(fields))
+        return len(schema_statements(scoped))
+
+    # Writes
+
+    def _match(self, label: str, key: Dict[str, Any]) -> List[_Node]:
+        if any(value is None for value in key.values()):
+            return []
+        fields = tuple(key)
+        ids = self._index(label, fields).get(tuple(_freeze(key[field]) for field in fields), ())
+        return [self.nodes[node_id] for node_id in sorted(ids)]
+
+    def _merge(self, label: str, key: Dict[str, Any]) -> List[_Node]:
+        matched = self._match(label, key)
+        if matched:
+            return matched
+        if any(value is None for value in key.values()):
+            raise ValueError(f"Cannot merge {label or 'node'} on a null key {key}")
+        node = _Node(self.next_id, [label] if label else [], dict(key))
+        self.next_id += 1
+        self.nodes[node.id] = node
+        self._reindex(node)
+        self.dirty_nodes.add(node.id)
+        return [node]
+
+    def _update(self, node: _Node, props: Dict[str, Any] = None, add_labels: Iterable[str] = (),
+                remove_labels: Iterable[str] = (), remove_props: Iterable[str] = ()):
+        """SET n += props / SET n:Label / REMOVE n:Label / SET n.prop = null"""
+        self._unindex(node)
+        for name, value in (props or {}).items():
+            if value is None:
+                node.props.pop(name, None)
+            else:
+                node.props[name] = value
+        for name in remove_props:
+            node.props.pop(name, None)
+        for label in add_labels:
+            if label not in node.labels:
+                node.labels.append(label)
+        removed = set(remove_labels)
+        node.labels = [label for label in node.labels if label not in removed]
+        self._reindex(node)
+        self.dirty_nodes.add(node.id)
+
+    def _delete_node(self, node: _Node):
+        """DETACH DELETE"""
+        for rel_type, end in list(self.out_edges.get(node.id, {})):
+            self._delete_edge(node.id, rel_type, end)
+        for rel_type, start in list(self.in_edges.get(node.id, ())):
+            self._delete_edge(start, rel_type, node.id)
+        self._unindex(node)
+        del self.nodes[node.id]
+        self.out_edges.pop(node.id, None)
+        self.in_edges.pop(node.id, None)
+        self.dirty_nodes.add(node.id)
+
+    def _merge_edge(self, start: int, rel_type: str, end: int, props: Dict[str, Any]):
+        edge = self.out_edges.setdefault(start, {}).setdefault((rel_type, end), {})
+        self.in_edges.setdefault(end, set()).add((rel_type, start))
+        for name, value in props.items():
+            if value is None:
+                edge.pop(name, None)
+            else:
+                edge[name] = value
+        self.dirty_edges[(start, rel_type, end)] = None
+
+    def _delete_edge(self, start: int, rel_type: str, end: int):
+        if self.out_edges.get(start, {}).pop((rel_type, end), None) is not None:
+            self.in_edges.get(end, set()).discard((rel_type, start))
+            self.dirty_edges[(start, rel_type, end)] = None
+
+    def _endpoints(self, label: str, key: Dict[str, Any], props: Dict[str, Any], merge: bool) -> List[_Node]:
+        nodes = self._merge(label, key) if merge else self._match(label, key)
+        for node in nodes:
+            self._update(node, props)
+        return nodes
+
+    def _apply(self, group: tuple, row: Dict[str, Any]):
+        """Apply one writer row with the semantics of the Cypher build_query(group) produces"""
+        kind = group[0]
+        if kind == "node":
+            _, label, _, labels = group
+            for node in self._merge(label, row["key"]):
+                self._update(node, row["props"], add_labels=labels)
+        elif kind == "edge":
+            _, start_label, _, start_merge, rel_type, end_label, _, end_merge = group
+            for start in self._endpoints(start_label, row["start"], row["start_props"], start_merge):
+                for end in self._endpoints(end_label, row["end"], row["end_props"], end_merge):
+                    self._merge_edge(start.id, rel_type, end.id, row["props"])
+        elif kind == "delete_node":
+            _, label, _ = group
+            for node in self._match(label, row["key"]):
+                # Same guard as the Cypher delete: keep nodes other files typed further
+                if len(node.labels) == (1 if label else 0):
+                    self._delete_node(node)
+        elif kind == "strip_node":
+            _, label, _, labels, properties = group
+            for node in self._match(label, row["key"]):
+                self._update(node, remove_labels=labels, remove_props=properties)
+        elif kind == "delete_edge":
+            _, start_label, _, rel_type, end_label, _ = group
+            ends = {node.id for node in self._match(end_label, row["end"])}
+            for start in self._match(start_label, row["start"]):
+                for edge_type, end in list(self.out_edges.get(start.id, {})):
+                    if edge_type == rel_type and end in ends:
+                        self._delete_edge(start.id, rel_type, end)
+        else:
+            raise ValueError(f"Unknown write group {group}")
+
+    def _write(self, batches, batch_size):
+        with self.lock:
+            # Rows are idempotent merges and deletes, so a failed
+            # transaction can be retried group by group like on Neo4j;
+            # whatever it applied is persisted with the next one
+            for group, rows in batches:
+                for row in rows:
+                    self._apply(group, row)
+            self._persist()
+            self.dirty_nodes = set()
+            self.dirty_edges = {}
+
+    # Reads
+
+    def _in_scope(self, node: _Node) -> bool:
+        return self.scope is None or node.props.get(PROJECT_KEY) == self.scope
+
+    def _labelled(self, *labels: str) -> List[_Node]:
+        """Nodes of the read's project carrying any of the labels, in creation order"""
+        return [node for node in self.nodes.values()
+                if any(label in node.labels for label in labels) and self._in_scope(node)]
+
+    def _out(self, node: _Node, rel_type: Optional[str] = None, label: Optional[str] = None) -> List[Tuple[str, _Node]]:
+        related = []
+        for (edge_type, end), _ in self.out_edges.get(node.id, {}).items():
+            target = self.nodes[end]
+            if (rel_type is None or edge_type == rel_type) and (label is None or label in target.labels):
+                related.append((edge_type, target))
+        return related
+
+    def _in(self, node: _Node, rel_type: str, label: str) -> List[_Node]:
+        starts = sorted(start for edge_type, start in self.in_edges.get(node.id, ()) if edge_type == rel_type)
+        return [self.nodes[start] for start in starts if label in self.nodes[start].labels]
+
+    @staticmethod
+    def _grouped(rows: Iterable[Tuple[tuple, Any]]) -> Dict[tuple, List]:
+        """Implicit Cypher grouping: the non-aggregated columns are the key"""
+        groups: Dict[tuple, List] = {}
+        for key, value in rows:
+            groups.setdefault(key, []).append(value)
+        return groups
+
+    def _read_component_summary(self):
+        rows = []
+        for node in self._labelled("Controller", "Service", "Repository", "Model", "Entity"):
+            roles = tuple(label for label in node.labels if label != "Component")
+            rows.append(((node.props.get("name"), roles, node.props.get("package")), (node, self._out(node))))
+        return [{
+            "name": name, "roles": list(roles), "package": package,
+            "count": len({node.id for node, _ in matches}),
+            "relationships": _distinct(rel_type for _, related in matches for rel_type, _ in related),
+            "dependencies": _distinct(_prop(target, "name") for _, related in matches for _, target in related),
+            "columns": [{"name": _prop(column, "name"), "type": _prop(column, "type"),
+                         "constraints": _prop(column, "constraints") or []}
+                        for _, related in matches for rel_type, column in related
+                        if rel_type == "HAS_COLUMN" and "Column" in column.labels]
+        } for (name, roles, package), matches in self._grouped(rows).items()]
+
+    def _read_database_info(self):
+        return [{"type": node.props.get("type"), "config": node.props.get("configFile")}
+                for node in self._labelled("Database")[:1]]
+
+    def _read_table_columns(self):
+        rows = []
+        for table in self._labelled("Table"):
+            columns = [column for _, column in self._out(table, "HAS_COLUMN", "Column")] or [None]
+            rows += [((table.props.get("name"),), column) for column in columns]
+        return [{
+            "table": name,
+            "columns": [{"name": _prop(column, "name"), "type": _prop(column, "type"),
+                         "constraints": _prop(column, "constraints")} for column in columns]
+        } for (name,), columns in self._grouped(rows).items()]
+
+    def _read_entity_details(self):
+        return [{"name": node.props.get("name"), "variables": node.props.get("variables"),
+                 "methods": node.props.get("methods")} for node in self._labelled("Entity")]
+
+    def _read_page_templates(self):
+        rows = []
+        for page in self._labelled("Page"):
+            key = (page.props.get("name"), page.props.get("filePath"), page.props.get("templateType"))
+            rows.append((key, (page, self._out(page, "USES_TEMPLATE", "Template"))))
+        return [{"page": name, "path": path, "type": template_type,
+                 "count": len({page.id for page, _ in matches}),
+                 "templates": _distinct(_prop(template, "name") for _, related in matches for _, template in related)}
+                for (name, path, template_type), matches in self._grouped(rows).items()]
+
+    def _read_page_forms(self):
+        rows = []
+        for page in self._labelled("Page"):
+            for _, form in self._out(page, "CONTAINS", "Form"):
+                key = (page.props.get("name"), form.props.get("id"), form.props.get("action"), form.props.get("method"))
+                fields = [field for _, field in self._out(form, "HAS_FIELD", "FormField")] or [None]
+                rows += [(key, field) for field in fields]
+        return [{
+            "page": page, "form_id": form_id, "action": action, "method": method,
+            "fields": [{"name": _prop(field, "name"), "type": _prop(field, "type"),
+                        "validation": _prop(field, "validation")} for field in fields]
+        } for (page, form_id, action, method), fields in self._grouped(rows).items()]
+
+    def _read_resource_usage(self):
+        rows = []
+        for page in self._labelled("Page"):
+            rows += [((resource.props.get("type"),), {"path": resource.props.get("path"), "page": page.props.get("name")})
+                     for _, resource in self._out(page, "DEPENDS_ON", "Resource")]
+        return [{"type": resource_type, "count": len(usages), "resources": _distinct(usages)}
+                for (resource_type,), usages in self._grouped(rows).items()]
+
+    def _read_file_metadata(self, file_path):
+        rows = []
+        for node in self._match("Component", {"filePath": file_path}):
+            if not any(label in node.labels for label in ("Model", "Controller", "Service")) or not self._in_scope(node):
+                continue
+            key = (_role(node),)
+            rows += [(key, (rel_type, target)) for rel_type, target in self._out(node)] or [(key, (None, None))]
+        return [{
+            "type": role,
+            "relationships": _distinct({"type": rel_type, "target": _prop(target, "filePath"), "targetType": _role(target)}
+                                       for rel_type, target in matches)
+        } for (role,), matches in self._grouped(rows).items()]
+
+    def _read_service_details(self, service_name):
+        rows = []
+        for service in self._labelled("Service"):
+            if service_name not in (service.props.get("name") or ""):
+                continue
+            key = (service.props.get("name"), service.props.get("package"))
+            controllers = self._in(service, "DEPENDS_ON", "Controller") or [None]
+            repositories = [repository for _, repository in self._out(service, "DEPENDS_ON", "Repository")] or [None]
+            for controller in controllers:
+                actions = [action for _, action in self._out(controller, "HAS_ACTION", "Action")] if controller else []
+                for repository in repositories:
+                    rows += [(key, (controller, repository, action)) for action in actions or [None]]
+        return [{
+            "name": name, "package": package,
+            "controllers": _distinct(_prop(controller, "name") for controller, _, _ in matches),
+            "repositories": _distinct(_prop(repository, "name") for _, repository, _ in matches),
+            "actions": _distinct({"method": _prop(action, "httpMethod"), "path": _prop(action, "path"),
+                                  "name": _prop(action, "name")} for _, _, action in matches)
+        } for (name, package), matches in self._grouped(rows).items()]
+
+    def iter_nodes(self):
+        with self.lock:
+            nodes = [(node.id, list(node.labels), dict(node.props)) for node in self.nodes.values()]
+        return iter(nodes)
+
+    def iter_edges(self):
+        with self.lock:
+            edges = [(start, rel_type, end, dict(props))
+                     for start, related in self.out_edges.items() for (rel_type, end), props in related.items()]
+        return iter(edges)
+
+    def _read(self, name, params):
+        reader = getattr(self, f"_read_{name}", None)
+        if reader is None:
+            raise ValueError(f"Unknown graph read '{name}', expected one of {', '.join(CYPHER_READS)}")
+        params = dict(params)
+        with self.lock:
+            # Reads hold the lock, so the scope is never seen by another read
+            self.scope = params.pop("project", None)
+            try:
+                return reader(**params)
+            finally:
+                self.scope = None
+
+    def close(self):
+        if self.conn is not None:
+            self.conn.close()
+            self.conn = None
+
+class _SharedEmbeddedStore(GraphStore):
+    """Reference to an embedded store shared by every component of a process that opens its URI"""
+
+    embedded = True
+
+    def __init__(self, uri: str, store: EmbeddedGraphStore):
+        self.uri = uri
+        self.store = store
+        self.closed = False
+
+    def ensure_schema(self, scoped=False):
+        return self.store.ensure_schema(scoped)
+
+    def _write(self, batches, batch_size):
+        self.store._write(batches, batch_size)
+
+    def _read(self, name, params):
+        return self.store._read(name, params)
+
+    def iter_nodes(self):
+        return self.store.iter_nodes()
+
+    def iter_edges(self):
+        return self.store.iter_edges()
+
+    def close(self):
+        if self.closed:
+            return
+        self.closed = True
+        with _EMBEDDED_LOCK:
+            self.store.refs -= 1
+            if self.store.refs == 0:
+                _EMBEDDED_STORES.pop(self.uri, None)
+                self.store.close()
+
+_EMBEDDED_STORES: Dict[str, EmbeddedGraphStore] = {}
+_EMBEDDED_LOCK = threading.Lock()
+
+def open_graph_store(uri: str, user: Optional[str] = None, password: Optional[str] = None) -> GraphStore:
+    """Open the graph store a URI names.
+
+    `memory://[name]` is an embedded store living as long as something in
+    the process holds it open; `sqlite:///path/graph.db` (or
+    `sqlite://relative.db`) is an embedded store persisted to that file.
+    Extractors, planner and query tool opening the same embedded URI in
+    one process share one store. Any other URI (bolt://, neo4j://, ...)
+    connects to Neo4j.
+    """
+    if not uri.startswith(EMBEDDED_SCHEMES):
+        return Neo4jGraphStore(uri, user, password)
+
+    with _EMBEDDED_LOCK:
+        store = _EMBEDDED_STORES.get(uri)
+        if store is None:
+            path = uri[len("sqlite://"):] if uri.startswith("sqlite://") else None
+            if path:
+                os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+            store = _EMBEDDED_STORES[uri] = EmbeddedGraphStore(path)
+        store.refs += 1
+    return _SharedEmbeddedStore(uri, store)
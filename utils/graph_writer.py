@@ -0,0 +1,330 @@
+import json
+import os
+import time
+from contextlib import contextmanager
+from functools import lru_cache
+from typing import Any, Dict, List, NamedTuple, Optional, Tuple
+
+DEFAULT_BATCH_SIZE = int(os.getenv("GRAPH_BATCH_SIZE", "1000"))
+DEFAULT_FLUSH_INTERVAL = float(os.getenv("GRAPH_FLUSH_INTERVAL", "5"))
+
+class NodeRef(NamedTuple):
+    """A node identified by label and key properties.
+
+    An empty label addresses any node with the key. With merge=False the
+    node is only matched, so a relationship to it is written only if the
+    node already exists.
+    """
+    label: str
+    key: Dict[str, Any]
+    properties: Optional[Dict[str, Any]] = None
+    merge: bool = True
+
+def _key_pattern(variable: str, label: str, key_fields: Tuple[str, ...], row_field: str) -> str:
+    keys = ", ".join(f"{field}: row.{row_field}.{field}" for field in key_fields)
+    # An empty label matches any node with the key
+    label = f":{label}" if label else ""
+    return f"({variable}{label} {{{keys}}})"
+
+def build_node_query(label: str, key_fields: Tuple[str, ...], labels: Tuple[str, ...] = ()) -> str:
+    lines = ["UNWIND $rows AS row", f"MERGE {_key_pattern('n', label, key_fields, 'key')}"]
+    if labels:
+        lines.append(f"SET n:{':'.join(labels)}")
+    lines.append("SET n += row.props")
+    return "\n".join(lines)
+
+def build_edge_query(start_label, start_fields, start_merge, rel_type, end_label, end_fields, end_merge) -> str:
+    lines = [
+        "UNWIND $rows AS row",
+        f"{'MERGE' if start_merge else 'MATCH'} {_key_pattern('a', start_label, start_fields, 'start')}",
+        "SET a += row.start_props",
+    ]
+    if not end_merge:
+        # Cypher does not allow a MATCH straight after a SET
+        lines.append("WITH a, row")
+    lines += [
+        f"{'MERGE' if end_merge else 'MATCH'} {_key_pattern('b', end_label, end_fields, 'end')}",
+        "SET b += row.end_props",
+        f"MERGE (a)-[r:{rel_type}]->(b)",
+        "SET r += row.props",
+    ]
+    return "\n".join(lines)
+
+def build_node_delete_query(label: str, key_fields: Tuple[str, ...]) -> str:
+    return "\n".join([
+        "UNWIND $rows AS row",
+        f"MATCH {_key_pattern('n', label, key_fields, 'key')}",
+        # Never remove a node that still carries labels beyond the one it was
+        # addressed by, e.g. a Component that another file typed as a Service
+        f"WHERE size(labels(n)) = {1 if label else 0}",
+        "DETACH DELETE n",
+    ])
+
+def build_node_strip_query(label: str, key_fields: Tuple[str, ...], labels: Tuple[str, ...],
+                           properties: Tuple[str, ...]) -> str:
+    lines = [
+        "UNWIND $rows AS row",
+        f"MATCH {_key_pattern('n', label, key_fields, 'key')}",
+        f"REMOVE n:{':'.join(labels)}",
+    ]
+    if properties:
+        lines.append("SET " + ", ".join(f"n.{name} = null" for name in properties))
+    return "\n".join(lines)
+
+def build_edge_delete_query(start_label, start_fields, rel_type, end_label, end_fields) -> str:
+    return "\n".join([
+        "UNWIND $rows AS row",
+        f"MATCH {_key_pattern('a', start_label, start_fields, 'start')}"
+        f"-[r:{rel_type}]->{_key_pattern('b', end_label, end_fields, 'end')}",
+        "DELETE r",
+    ])
+
+QUERY_BUILDERS = {
+    "node": build_node_query,
+    "edge": build_edge_query,
+    "delete_node": build_node_delete_query,
+    "strip_node": build_node_strip_query,
+    "delete_edge": build_edge_delete_query,
+}
+
+@lru_cache(maxsize=None)
+def build_query(group: tuple) -> str:
+    """Cypher for a writer group: its kind followed by the builder's arguments"""
+    return QUERY_BUILDERS[group[0]](*group[1:])
+
+class BatchGraphWriter:
+    """Buffers node and relationship merges and writes them in batches.
+
+    Rows are grouped by kind (label and key fields for nodes, endpoint
+    labels and relationship type for edges). Flushed batches are (group,
+    rows) pairs that the graph store (see utils.graph_store) applies in
+    one transaction; on Neo4j each group becomes one parameterised UNWIND
+    statement (see build_query). Nodes are flushed before relationships so
+    that matched endpoints exist, and deletes are flushed last.
+
+    If a tracker is set, every merged node and relationship is reported to
+    it so callers can tell which elements a source file produced. If a sink
+    is set (see utils.graph_pipeline), flushed batches are handed to it to
+    be written asynchronously instead of being written by the caller. If a
+    project is set, it is added to the key of every node written or deleted
+    and to the properties of every relationship, so projects sharing a graph
+    never merge into each other's nodes.
+    """
+
+    def __init__(self, store, batch_size: Optional[int] = None, flush_interval: Optional[float] = None):
+        self.store = store
+        self.batch_size = batch_size or DEFAULT_BATCH_SIZE
+        self.flush_interval = DEFAULT_FLUSH_INTERVAL if flush_interval is None else flush_interval
+        self.node_groups: Dict[tuple, List[Dict]] = {}
+        self.edge_groups: Dict[tuple, List[Dict]] = {}
+        self.delete_groups: Dict[tuple, List[Dict]] = {}
+        self.pending = 0
+        self.last_flush = time.monotonic()
+        self.tracker = None
+        self.sink = None
+        self.project = None
+        self.held = 0
+
+        # Statistics
+        self.rows_written = 0
+        self.rows_failed = 0
+        self.transactions = 0
+        self.write_seconds = 0.0
+
+    def merge_node(self, label: str, key: Dict[str, Any], properties: Optional[Dict[str, Any]] = None,
+                   labels: Tuple[str, ...] = ()):
+        """Queue a MERGE of a node on its key, then SET its extra labels and properties"""
+        key = self._scoped(key)
+        group = ("node", label, tuple(key), tuple(labels))
+        self.node_groups.setdefault(group, []).append({"key": key, "props": properties or {}})
+        if self.tracker is not None:
+            self.tracker.record(node_element(label, key, labels, tuple(properties or ())))
+        self._row_added()
+
+    def merge_edge(self, start: NodeRef, rel_type: str, end: NodeRef, properties: Optional[Dict[str, Any]] = None):
+        """Queue a relationship MERGE between two nodes"""
+        start, end = self._scoped_ref(start), self._scoped_ref(end)
+        if self.project is not None:
+            properties = dict(properties or {}, project=self.project)
+        group = ("edge", start.label, tuple(start.key), start.merge, rel_type, end.label, tuple(end.key), end.merge)
+        self.edge_groups.setdefault(group, []).append({
+            "start": start.key,
+            "start_props": start.properties or {},
+            "end": end.key,
+            "end_props": end.properties or {},
+            "props": properties or {}
+        })
+        if self.tracker is not None:
+            self.tracker.record(edge_element(start, rel_type, end))
+            for endpoint in (start, end):
+                if endpoint.merge:
+                    self.tracker.record(node_element(endpoint.label, endpoint.key))
+        self._row_added()
+
+    def delete_node(self, label: str, key: Dict[str, Any]):
+        """Queue a DETACH DELETE of the node with the given key"""
+        key = self._scoped(key)
+        group = ("delete_node", label, tuple(key))
+        self.delete_groups.setdefault(group, []).append({"key": key})
+        self._row_added()
+
+    def strip_node(self, label: str, key: Dict[str, Any], labels: Tuple[str, ...], properties: Tuple[str, ...]):
+        """Queue removal of extra labels and properties from a node, keeping the node"""
+        key = self._scoped(key)
+        group = ("strip_node", label, tuple(key), tuple(labels), tuple(properties))
+        self.delete_groups.setdefault(group, []).append({"key": key})
+        self._row_added()
+
+    def delete_edge(self, start: NodeRef, rel_type: str, end: NodeRef):
+        """Queue a delete of the relationship between two keyed nodes"""
+        start, end = self._scoped_ref(start), self._scoped_ref(end)
+        group = ("delete_edge", start.label, tuple(start.key), rel_type, end.label, tuple(end.key))
+        self.delete_groups.setdefault(group, []).append({"start": start.key, "end": end.key})
+        self._row_added()
+
+    def _scoped(self, key: Dict[str, Any]) -> Dict[str, Any]:
+        # Keys recorded by the tracker are already scoped; re-scoping them changes nothing
+        if self.project is None:
+            return key
+        return {"project": self.project, **key}
+
+    def _scoped_ref(self, ref: NodeRef) -> NodeRef:
+        if self.project is None:
+            return ref
+        return ref._replace(key=self._scoped(ref.key))
+
+    @contextmanager
+    def transaction(self):
+        """Keep the rows queued inside the block together in one flush.
+
+        Automatic flushes are held back until the block ends, so a unit of
+        work (e.g. one page) is never split across transactions. Blocks
+        may nest.
+        """
+        self.held += 1
+        try:
+            yield self
+        finally:
+            self.held -= 1
+        self._maybe_flush()
+
+    def _row_added(self):
+        self.pending += 1
+        self._maybe_flush()
+
+    def _maybe_flush(self):
+        if self.held:
+            return
+        if self.pending >= self.batch_size or time.monotonic() - self.last_flush >= self.flush_interval:
+            self.flush()
+
+    def flush(self):
+        """Write all buffered rows"""
+        batches = list(self.node_groups.items())
+        batches += list(self.edge_groups.items())
+        # Relationships go first, then label strips, so that a node delete sees its final labels
+        delete_order = {"delete_edge": 0, "strip_node": 1, "delete_node": 2}
+        deletes = sorted(self.delete_groups.items(), key=lambda item: delete_order[item[0][0]])
+        batches += deletes
+        self.node_groups = {}
+        self.edge_groups = {}
+        self.delete_groups = {}
+        self.pending = 0
+        self.last_flush = time.monotonic()
+        if not batches:
+            return
+        if self.sink is not None:
+            self.sink.submit(self, batches)
+            return
+
+        start = time.perf_counter()
+        try:
+            self._write(batches)
+        except Exception as e:
+            print(f"⚠️  Batch write failed ({str(e)}), retrying statement by statement")
+            self._write_isolated(batches)
+        else:
+            self.record_write(sum(len(rows) for _, rows in batches), 0, 1)
+        self.write_seconds += time.perf_counter() - start
+
+    def _write(self, batches):
+        self.store.write(batches, self.batch_size)
+
+    def _write_isolated(self, batches):
+        """Fallback after a failed flush: one transaction per group, then per row"""
+        for group, rows in batches:
+            try:
+                self._write([(group, rows)])
+                self.record_write(len(rows), 0, 1)
+                continue
+            except Exception:
+                pass
+
+            for row in rows:
+                try:
+                    self._write([(group, [row])])
+                    self.record_write(1, 0, 1)
+                except Exception as e:
+                    self.record_write(0, 1, 0)
+                    print(f"⚠️  Failed to write row {row}: {str(e)}")
+
+    def record_write(self, rows_written: int, rows_failed: int, transactions: int, seconds: float = 0.0):
+        """Add the outcome of a write to the statistics"""
+        self.rows_written += rows_written
+        self.rows_failed += rows_failed
+        self.transactions += transactions
+        self.write_seconds += seconds
+
+    def stats(self) -> Dict[str, Any]:
+        rate = self.rows_written / self.write_seconds if self.write_seconds else 0.0
+        return {
+            "rows_written": self.rows_written,
+            "rows_failed": self.rows_failed,
+            "transactions": self.transactions,
+            "write_seconds": round(self.write_seconds, 3),
+            "rows_per_second": round(rate, 1)
+        }
+
+    def report(self) -> str:
+        stats = self.stats()
+        report = (f"{stats['rows_written']} rows in {stats['transactions']} transactions, "
+                  f"{stats['write_seconds']}s ({stats['rows_per_second']} rows/s)")
+        if stats["rows_failed"]:
+            report += f", {stats['rows_failed']} rows failed"
+        return report
+
+    def close(self):
+        """Flush remaining rows"""
+        self.flush()
+
+def node_element(label: str, key: Dict[str, Any], labels: Tuple[str, ...] = (), properties: Tuple[str, ...] = ()) -> str:
+    """Stable string id of a node, used to track which file produced it.
+
+    A node merged with extra labels is a separate element: removing it
+    strips those labels and properties but keeps the node for other files.
+    """
+    if labels:
+        return json.dumps(["node", label, key, sorted(labels), sorted(properties)], sort_keys=True)
+    return json.dumps(["node", label, key], sort_keys=True)
+
+def edge_element(start: NodeRef, rel_type: str, end: NodeRef) -> str:
+    """Stable string id of a relationship between two keyed nodes"""
+    return json.dumps(["edge", start.label, start.key, rel_type, end.label, end.key], sort_keys=True)
+
+def delete_element(writer: BatchGraphWriter, element: str):
+    """Queue the delete of an element id produced by node_element or edge_element"""
+    kind, *parts = json.loads(element)
+    if kind == "node" and len(parts) == 4:
+        label, key, labels, properties = parts
+        writer.strip_node(label, key, tuple(labels), tuple(properties))
+    elif kind == "node":
+        label, key = parts
+        writer.delete_node(label, key)
+    else:
+        start_label, start_key, rel_type, end_label, end_key = parts
+        writer.delete_edge(NodeRef(start_label, start_key), rel_type, NodeRef(end_label, end_key))
+
+def _run_batches(tx, batches, batch_size):
+    for query, rows in batches:
+        for i in range(0, len(rows), batch_size):
+            tx.run(query, rows=rows[i:i + batch_size]).consume()
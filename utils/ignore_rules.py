@@ -0,0 +1,224 @@
+import os
+import re
+from typing import Iterator, List, NamedTuple, Optional, Pattern, Tuple, Union
+
+# gitignore-style patterns read from the root of the source tree
+IGNORE_FILE = ".migratorignore"
+
+# Build output directories of Maven, Gradle and IDEs, at the root or in
+# any module. Java packages may share these names (com/acme/build/), so
+# they are not applied below a src/ directory.
+BUILD_OUTPUT_DIRS = ["target", "build", "out"]
+
+# Dependencies, VCS metadata and generated code, applied after the build
+# output directories. A .migratorignore can re-include any of them with a
+# negated pattern, e.g. `!build/`.
+DEFAULT_PATTERNS = [
+    "node_modules/",
+    "bower_components/",
+    ".git/",
+    ".svn/",
+    ".hg/",
+    ".idea/",
+    ".gradle/",
+    ".settings/",
+    "__pycache__/",
+    "generated-sources/",
+    "generated-test-sources/",
+]
+
+# Set MIGRATOR_IGNORE_DEFAULTS=0 to only apply the patterns of .migratorignore
+USE_DEFAULTS = os.getenv("MIGRATOR_IGNORE_DEFAULTS", "1") != "0"
+# Set MIGRATOR_IGNORE_MEASURE=1 to also count the files and bytes under
+# pruned directories. Off by default: it walks everything pruning skips.
+MEASURE_PRUNED = os.getenv("MIGRATOR_IGNORE_MEASURE", "0") == "1"
+
+class IgnoreRule(NamedTuple):
+    pattern: str
+    regex: Pattern[str]
+    negate: bool
+    dir_only: bool
+
+def _translate(glob: str) -> str:
+    """Regex for a gitignore glob: `*` and `?` stay within a path segment, `**` spans segments"""
+    parts = []
+    i = 0
+    while i < len(glob):
+        if glob.startswith("**/", i):
+            parts.append("(?:.*/)?")
+            i += 3
+        elif glob.startswith("**", i):
+            parts.append(".*")
+            i += 2
+        elif glob[i] == "*":
+            parts.append("[^/]*")
+            i += 1
+        elif glob[i] == "?":
+            parts.append("[^/]")
+            i += 1
+        elif glob[i] == "[" and "]" in glob[i + 2:]:
+            end = glob.index("]", i + 2)
+            body = glob[i + 1:end]
+            if body.startswith("!"):
+                body = "^" + body[1:]
+            parts.append(f"[{body}]")
+            i = end + 1
+        elif glob[i] == "\\" and i + 1 < len(glob):
+            parts.append(re.escape(glob[i + 1]))
+            i += 2
+        else:
+            parts.append(re.escape(glob[i]))
+            i += 1
+    return "".join(parts)
+
+def compile_pattern(line: str) -> Optional[IgnoreRule]:
+    """Compile one line of an ignore file, or None for blank lines and comments.
+
+    As in .gitignore: `!` negates, a trailing `/` matches directories only,
+    and a pattern containing a `/` (other than a trailing one) is anchored
+    to the root; otherwise it matches a name at any depth.
+    """
+    pattern = line.rstrip("\n")
+    if not pattern.endswith("\\ "):
+        pattern = pattern.rstrip()
+    if not pattern or pattern.startswith("#"):
+        return None
+
+    glob = pattern
+    negate = glob.startswith("!")
+    if negate:
+        glob = glob[1:]
+    elif glob.startswith("\\"):
+        glob = glob[1:]
+    dir_only = glob.endswith("/")
+    glob = glob.rstrip("/")
+    if not glob:
+        return None
+
+    anchored = "/" in glob
+    regex = _translate(glob.lstrip("/"))
+    if not anchored:
+        regex = "(?:.*/)?" + regex
+    return IgnoreRule(pattern, re.compile(regex + r"\Z"), negate, dir_only)
+
+def build_output_rule(name: str) -> IgnoreRule:
+    """Rule for a build output directory at any depth that is not inside a src/ directory"""
+    regex = re.compile(r"(?:(?!src/)[^/]*/)*" + re.escape(name) + r"\Z")
+    return IgnoreRule(f"{name}/", regex, negate=False, dir_only=True)
+
+class IgnoreRules:
+    """Ordered ignore patterns or compiled rules; the last one matching a path decides"""
+
+    def __init__(self, patterns: List[Union[str, IgnoreRule]]):
+        rules = (pattern if isinstance(pattern, IgnoreRule) else compile_pattern(pattern) for pattern in patterns)
+        self.rules = [rule for rule in rules if rule]
+
+    @classmethod
+    def for_root(cls, root: str, use_defaults: bool = USE_DEFAULTS) -> "IgnoreRules":
+        """The default rules followed by the patterns of the root's .migratorignore, if any"""
+        patterns: List[Union[str, IgnoreRule]] = []
+        if use_defaults:
+            patterns += [build_output_rule(name) for name in BUILD_OUTPUT_DIRS]
+            patterns += DEFAULT_PATTERNS
+        try:
+            with open(os.path.join(root, IGNORE_FILE), "r", encoding="utf-8") as f:
+                patterns.extend(f.read().splitlines())
+        except FileNotFoundError:
+            pass
+        except OSError as e:
+            print(f"⚠️  Cannot read {IGNORE_FILE}: {str(e)}")
+        return cls(patterns)
+
+    def ignored(self, rel_path: str, is_dir: bool = False) -> bool:
+        """Whether a path relative to the root, with `/` separators, is ignored"""
+        for rule in reversed(self.rules):
+            if rule.dir_only and not is_dir:
+                continue
+            if rule.regex.match(rel_path):
+                return not rule.negate
+        return False
+
+class IgnoreStats:
+    """What a walk skipped: pruned directories, and the files and bytes under them or ignored on their own"""
+
+    def __init__(self, measure: bool = MEASURE_PRUNED):
+        self.measure = measure
+        self.dirs = 0
+        self.files = 0
+        self.bytes = 0
+
+    def add_dir(self, path: str):
+        self.dirs += 1
+        if self.measure:
+            files, size = measure_tree(path)
+            self.files += files
+            self.bytes += size
+
+    def add_file(self, size: int):
+        self.files += 1
+        self.bytes += size
+
+    def report(self) -> str:
+        report = f"{self.dirs} directories pruned"
+        if self.measure or self.files:
+            report += f", {self.files} files ({self.bytes / (1024 * 1024):.2f} MB) skipped"
+        return report
+
+def measure_tree(directory: str) -> Tuple[int, int]:
+    """Count the files and bytes under a directory without opening any file"""
+    files = size = 0
+    pending = [directory]
+    while pending:
+        try:
+            entries = list(os.scandir(pending.pop()))
+        except OSError:
+            continue
+        for entry in entries:
+            try:
+                if entry.is_dir(follow_symlinks=False):
+                    pending.append(entry.path)
+                else:
+                    files += 1
+                    size += entry.stat(follow_symlinks=False).st_size
+            except OSError:
+                continue
+    return files, size
+
+def _rel_child(rel_dir: str, name: str) -> str:
+    return f"{rel_dir}/{name}" if rel_dir else name
+
+def walk_tree(directory: str, rules: Optional[IgnoreRules] = None,
+              stats: Optional[IgnoreStats] = None) -> Iterator[Tuple[str, List[str], List[str]]]:
+    """os.walk that prunes ignored directories before descending and leaves out ignored files.
+
+    Rules default to those of the directory's .migratorignore and the
+    defaults; pass an IgnoreStats to learn what was skipped.
+    """
+    if rules is None:
+        rules = IgnoreRules.for_root(directory)
+    if stats is None:
+        stats = IgnoreStats(measure=False)
+
+    for root, dirs, files in os.walk(directory):
+        rel_dir = os.path.relpath(root, directory).replace(os.sep, "/")
+        if rel_dir == ".":
+            rel_dir = ""
+        kept = []
+        for name in dirs:
+            if rules.ignored(_rel_child(rel_dir, name), is_dir=True):
+                stats.add_dir(os.path.join(root, name))
+            else:
+                kept.append(name)
+        # Pruning in place keeps os.walk from descending into them
+        dirs[:] = kept
+
+        kept_files = []
+        for name in files:
+            if rules.ignored(_rel_child(rel_dir, name)):
+                try:
+                    stats.add_file(os.path.getsize(os.path.join(root, name)))
+                except OSError:
+                    stats.add_file(0)
+            else:
+                kept_files.append(name)
+        yield root, dirs, kept_files
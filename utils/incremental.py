@@ -0,0 +1,143 @@
+import hashlib
+import json
+import os
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+from utils.source_scanner import SourceFile
+
+MANIFEST_PATH = os.getenv("EXTRACTION_MANIFEST", "extraction_manifest.json")
+MANIFEST_VERSION = 1
+
+def file_hash(file_path: str) -> str:
+    """SHA-1 of a file's content"""
+    digest = hashlib.sha1()
+    with open(file_path, "rb") as f:
+        for block in iter(lambda: f.read(1 << 20), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+class ElementTracker:
+    """Records the graph elements produced while each source file is extracted"""
+
+    def __init__(self):
+        self.current: Optional[str] = None
+        self.elements: Dict[str, Set[str]] = {}
+
+    def start_file(self, file_path: str):
+        self.current = file_path
+        self.elements.setdefault(file_path, set())
+
+    def record(self, element: str):
+        if self.current is not None:
+            self.elements[self.current].add(element)
+
+class ExtractionManifest:
+    """Persisted map of source file to content hash and the graph elements it produced.
+
+    Lets a re-run extract only added or changed files and delete the
+    elements that removed or changed files no longer produce. The versions
+    of the extractors that produced the elements are recorded with them;
+    after an extractor changes, every file counts as changed.
+    """
+
+    def __init__(self, root: str, files: Optional[Dict[str, Dict]] = None,
+                 versions: Optional[Dict[str, str]] = None):
+        self.root = root
+        self.files: Dict[str, Dict] = files or {}
+        self.versions: Dict[str, str] = versions or {}
+        # Set when the files were extracted by other extractor versions
+        self.outdated = False
+
+    @classmethod
+    def load(cls, path: str, root: str, versions: Optional[Dict[str, str]] = None) -> "ExtractionManifest":
+        """Load the manifest of `root`, or an empty one if none matches.
+
+        If the files were extracted by other `versions` of the extractors,
+        their elements are kept so that the ones no longer produced are
+        removed, but every file is extracted again.
+        """
+        if not os.path.exists(path):
+            return cls(root, versions=versions)
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+        except (OSError, ValueError) as e:
+            print(f"⚠️  Ignoring unreadable extraction manifest {path}: {str(e)}")
+            return cls(root, versions=versions)
+
+        if data.get("version") != MANIFEST_VERSION or data.get("root") != os.path.abspath(root):
+            return cls(root, versions=versions)
+        manifest = cls(root, data.get("files", {}), versions if versions is not None else data.get("versions"))
+        if versions is not None and data.get("versions") != versions:
+            print("ℹ️ Extractors changed since the last run; extracting every file again")
+            manifest.outdated = True
+        return manifest
+
+    def save(self, path: str):
+        data = {"version": MANIFEST_VERSION, "root": os.path.abspath(self.root), "versions": self.versions,
+                "files": self.files}
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(data, f)
+        os.replace(tmp_path, path)
+
+    def diff(self, source_files: Iterable[SourceFile]) -> Tuple[List[SourceFile], List[str], Dict[str, str]]:
+        """Compare the current files with the manifest.
+
+        Returns the files to extract (added or changed), the paths that were
+        removed, and the content hash of every current file. Files whose size
+        and mtime are unchanged are not re-hashed. All files are extracted
+        if the manifest is outdated.
+        """
+        to_extract = []
+        hashes = {}
+        seen = set()
+
+        for source_file in source_files:
+            seen.add(source_file.path)
+            entry = self.files.get(source_file.path)
+            if entry and entry["size"] == source_file.size and entry["mtime"] == source_file.mtime:
+                hashes[source_file.path] = entry["hash"]
+                if self.outdated:
+                    to_extract.append(source_file)
+                continue
+
+            content_hash = file_hash(source_file.path)
+            hashes[source_file.path] = content_hash
+            if entry and entry["hash"] == content_hash and not self.outdated:
+                # Touched but not modified
+                entry["size"], entry["mtime"] = source_file.size, source_file.mtime
+                continue
+            to_extract.append(source_file)
+
+        removed = [path for path in self.files if path not in seen]
+        return to_extract, removed, hashes
+
+    def update(self, extracted: Iterable[SourceFile], removed: Iterable[str], hashes: Dict[str, str],
+               elements: Dict[str, Set[str]]) -> Set[str]:
+        """Record a run and return the stale elements.
+
+        Stale elements were produced by an extracted or removed file before
+        this run and are no longer produced by any file.
+        """
+        previous = set()
+        for path in removed:
+            previous.update(self.files.pop(path)["elements"])
+
+        for source_file in extracted:
+            old_entry = self.files.get(source_file.path)
+            if old_entry:
+                previous.update(old_entry["elements"])
+            self.files[source_file.path] = {
+                "hash": hashes[source_file.path],
+                "size": source_file.size,
+                "mtime": source_file.mtime,
+                "elements": sorted(elements.get(source_file.path, ()))
+            }
+
+        if not previous:
+            return set()
+
+        produced = set()
+        for entry in self.files.values():
+            produced.update(entry["elements"])
+        return previous - produced
@@ -0,0 +1,185 @@
+import os
+import signal
+import threading
+import time
+import javalang
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Tuple, Type, Union
+from utils.source_scanner import SourceFile
+from utils.java_prefilter import JavaPrefilter
+from utils.java_visitor import JavaNodeVisitor, walk_compilation_unit
+
+DEFAULT_WORKERS = int(os.getenv("JAVA_PARSE_WORKERS", "0")) or os.cpu_count() or 1
+DEFAULT_TIMEOUT = float(os.getenv("JAVA_PARSE_TIMEOUT", "30"))
+
+# A visitor receives the path and the parsed compilation unit of one Java file
+JavaVisitor = Callable[[str, javalang.tree.CompilationUnit], None]
+
+# A collector turns a parsed file into a picklable record. It is either a
+# function of the path and tree, or a JavaNodeVisitor subclass; all visitor
+# collectors of a file share one walk of its tree.
+JavaCollector = Union[Callable[[str, javalang.tree.CompilationUnit], Any], Type[JavaNodeVisitor]]
+
+class ParseTimeout(TimeoutError):
+    """Raised when a file exceeds its parse time budget"""
+
+def parse_compilation_unit(file_path: str) -> Optional[javalang.tree.CompilationUnit]:
+    """Read and parse a single Java file, returning None if it cannot be parsed"""
+    try:
+        with open(file_path, "r", encoding="utf-8") as f:
+            source_code = f.read()
+        return javalang.parse.parse(source_code)
+    except ParseTimeout:
+        raise
+    except javalang.parser.JavaSyntaxError:
+        print(f"⚠️ Syntax error in {file_path}, skipping...")
+    except Exception as e:
+        print(f"Failed to parse {file_path}: {str(e)}")
+    return None
+
+def iter_compilation_units(java_files: Iterable[SourceFile]) -> Iterator[Tuple[str, javalang.tree.CompilationUnit]]:
+    """Yield (file_path, tree) for every Java file that parses"""
+    for source_file in java_files:
+        tree = parse_compilation_unit(source_file.path)
+        if tree is not None:
+            yield source_file.path, tree
+
+def visit_compilation_units(java_files: Iterable[SourceFile], visitors: List[JavaVisitor]) -> int:
+    """Parse each Java file once and hand its tree to every visitor.
+
+    Trees are dropped as soon as all visitors have seen them, so memory
+    does not grow with the number of files. Returns the number of
+    compilation units visited.
+    """
+    visited = 0
+    for file_path, tree in iter_compilation_units(java_files):
+        for visitor in visitors:
+            visitor(file_path, tree)
+        visited += 1
+    return visited
+
+def _raise_timeout(signum, frame):
+    raise ParseTimeout()
+
+def _can_use_alarm() -> bool:
+    # SIGALRM only exists on Unix and can only be handled in the main thread
+    return hasattr(signal, "setitimer") and threading.current_thread() is threading.main_thread()
+
+def collect_file(file_path: str, collectors: Dict[str, JavaCollector], timeout: Optional[float],
+                 selected: Optional[Iterable[str]] = None) -> Optional[Dict[str, Any]]:
+    """Parse one file within its time budget and run the collectors over the tree.
+
+    Returns a dict of collector name to record, or None if the file could
+    not be parsed in time. A failing collector, or one not in `selected`
+    (default: all), yields None for its record without affecting the
+    others.
+    """
+    selected = set(collectors if selected is None else selected)
+    budget = timeout if timeout and _can_use_alarm() else None
+    if budget:
+        previous_handler = signal.signal(signal.SIGALRM, _raise_timeout)
+        signal.setitimer(signal.ITIMER_REAL, budget)
+
+    try:
+        tree = parse_compilation_unit(file_path)
+        if tree is None:
+            return None
+
+        records = {name: None for name in collectors}
+        visitors = {}
+        for name, collector in collectors.items():
+            if name not in selected:
+                continue
+            if isinstance(collector, type) and issubclass(collector, JavaNodeVisitor):
+                visitors[name] = collector(file_path)
+                continue
+            try:
+                records[name] = collector(file_path, tree)
+            except ParseTimeout:
+                raise
+            except Exception as e:
+                print(f"Failed to collect {name} from {file_path}: {str(e)}")
+                records[name] = None
+
+        failed = walk_compilation_unit(tree, list(visitors.values())) if visitors else {}
+        for name, visitor in visitors.items():
+            try:
+                if visitor in failed:
+                    raise failed[visitor]
+                records[name] = visitor.record()
+            except Exception as e:
+                print(f"Failed to collect {name} from {file_path}: {str(e)}")
+                records[name] = None
+        return records
+    except ParseTimeout:
+        print(f"⏱️  {file_path} exceeded the {budget}s parse budget, skipping...")
+        return None
+    finally:
+        if budget:
+            signal.setitimer(signal.ITIMER_REAL, 0)
+            signal.signal(signal.SIGALRM, previous_handler)
+
+# Collectors and budget of a pool worker, set once by the pool initializer
+_worker_collectors: Dict[str, JavaCollector] = {}
+_worker_timeout: Optional[float] = None
+
+def _init_worker(collectors: Dict[str, JavaCollector], timeout: Optional[float]):
+    global _worker_collectors, _worker_timeout
+    _worker_collectors = collectors
+    _worker_timeout = timeout
+
+def _timed_collect(file_path: str, collectors: Dict[str, JavaCollector], timeout: Optional[float],
+                   selected: Iterable[str]) -> Tuple[str, Optional[Dict[str, Any]], float]:
+    start = time.perf_counter()
+    records = collect_file(file_path, collectors, timeout, selected)
+    return file_path, records, time.perf_counter() - start
+
+def _collect_chunk_in_worker(items: List[Tuple[str, Tuple[str, ...]]]) -> List[Tuple[str, Optional[Dict[str, Any]], float]]:
+    return [_timed_collect(file_path, _worker_collectors, _worker_timeout, selected) for file_path, selected in items]
+
+def extract_java_records(java_files: Iterable[SourceFile], collectors: Dict[str, JavaCollector],
+                         workers: Optional[int] = None, timeout: Optional[float] = None,
+                         prefilter: Optional[JavaPrefilter] = None, metrics=None) -> Iterator[Tuple[str, Dict[str, Any]]]:
+    """Parse Java files in a process pool and yield (file_path, records) in file order.
+
+    Workers only send back the compact records built by the collectors,
+    never the trees, so graph writes stay in the calling process. At most
+    a few chunks per worker are in flight, so a slow consumer holds back
+    parsing instead of letting finished records pile up. Each file gets
+    `timeout` seconds of parsing before it is skipped. With one worker,
+    files are parsed in the calling process.
+
+    With a prefilter, each file is only parsed for the collectors it
+    selects, and files no collector needs are not parsed or yielded.
+    With metrics (see utils.metrics), each file's parse time is recorded.
+    """
+    items = []
+    for source_file in java_files:
+        selected = tuple(collectors) if prefilter is None else tuple(prefilter.select(source_file.path))
+        if selected:
+            items.append((source_file.path, selected))
+    workers = DEFAULT_WORKERS if workers is None else workers
+    timeout = DEFAULT_TIMEOUT if timeout is None else timeout
+
+    if workers <= 1 or len(items) < 2:
+        for file_path, selected in items:
+            file_path, records, seconds = _timed_collect(file_path, collectors, timeout, selected)
+            if metrics is not None:
+                metrics.file_parsed("java", file_path, seconds, ok=records is not None)
+            if records is not None:
+                yield file_path, records
+        return
+
+    chunksize = max(1, min(32, len(items) // (workers * 8)))
+    max_in_flight = workers * 2
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker, initargs=(collectors, timeout)) as pool:
+        in_flight = deque()
+        for i in range(0, len(items), chunksize):
+            in_flight.append(pool.submit(_collect_chunk_in_worker, items[i:i + chunksize]))
+            while len(in_flight) >= max_in_flight or (in_flight and i + chunksize >= len(items)):
+                for file_path, records, seconds in in_flight.popleft().result():
+                    if metrics is not None:
+                        metrics.file_parsed("java", file_path, seconds, ok=records is not None)
+                    if records is not None:
+                        yield file_path, records
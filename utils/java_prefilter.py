@@ -0,0 +1,66 @@
+import os
+import re
+from typing import Dict, Iterable, List, Optional, Pattern, Set
+from utils.source_scanner import SourceFile
+
+PREFILTER_ENABLED = os.getenv("JAVA_PREFILTER", "1") != "0"
+
+def annotation_pattern(names: Iterable[str]) -> Pattern[bytes]:
+    """Byte pattern matching a use of any of the given annotations, e.g. `@Entity` or `@ Path(`"""
+    alternatives = b"|".join(re.escape(name.encode()) for name in sorted(names))
+    return re.compile(rb"@\s*(?:" + alternatives + rb")\b")
+
+class JavaPrefilter:
+    """Byte-level pre-scan deciding which collectors a Java file needs a full parse for.
+
+    Each collector with `relevant_annotations` gets a pattern; a file is
+    only parsed for the collectors whose annotations appear somewhere in
+    its bytes. The match may be a false positive (e.g. inside a comment),
+    in which case the collector simply finds nothing, but a file with no
+    match cannot produce anything for that collector.
+    """
+
+    def __init__(self, patterns: Dict[str, Optional[Pattern[bytes]]]):
+        # A collector without a pattern needs every file
+        self.patterns = patterns
+        self.scanned = 0
+        self.pruned = 0
+        self.selected = {name: 0 for name in patterns}
+
+    @classmethod
+    def for_collectors(cls, collectors: Dict[str, object], enabled: bool = PREFILTER_ENABLED) -> "JavaPrefilter":
+        """Build the patterns from the collectors' `relevant_annotations`; disabled, every file is selected"""
+        patterns = {}
+        for name, collector in collectors.items():
+            annotations = getattr(collector, "relevant_annotations", None) if enabled else None
+            patterns[name] = annotation_pattern(annotations) if annotations else None
+        return cls(patterns)
+
+    def select(self, file_path: str) -> Set[str]:
+        """Names of the collectors that need a full parse of the file"""
+        self.scanned += 1
+        if all(pattern is None for pattern in self.patterns.values()):
+            names = set(self.patterns)
+        else:
+            try:
+                with open(file_path, "rb") as f:
+                    content = f.read()
+            except OSError:
+                # Let the parser report the unreadable file
+                content = None
+            names = {name for name, pattern in self.patterns.items()
+                     if content is None or pattern is None or pattern.search(content)}
+
+        if not names:
+            self.pruned += 1
+        for name in names:
+            self.selected[name] += 1
+        return names
+
+    def filter(self, java_files: Iterable[SourceFile]) -> List[SourceFile]:
+        """The files that at least one collector needs"""
+        return [source_file for source_file in java_files if self.select(source_file.path)]
+
+    def report(self) -> str:
+        selected = ", ".join(f"{count} for {name}" for name, count in self.selected.items())
+        return f"pruned {self.pruned} of {self.scanned} Java files before parsing ({selected})"
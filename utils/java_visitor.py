@@ -0,0 +1,88 @@
+import javalang
+from typing import Any, Callable, Dict, List, Optional, Sequence, Set, Type
+
+class JavaNodeVisitor:
+    """Collects facts about one Java file during a shared walk of its AST.
+
+    Subclasses define `visit_<NodeType>(node)` methods for the javalang
+    node types they need (e.g. `visit_MethodDeclaration`); a handler for a
+    base class also receives its subclasses. Any number of visitors share
+    a single walk of each compilation unit, so a new fact is a new visitor
+    or handler rather than another pass over the tree. `record()` returns
+    the collected facts as plain, picklable data.
+
+    `relevant_annotations` lists the annotation names without which the
+    visitor cannot produce anything, so files lacking all of them need not
+    be parsed for it (see utils.java_prefilter). None means every file is
+    relevant.
+    """
+
+    relevant_annotations: Optional[Set[str]] = None
+
+    def __init__(self, file_path: str):
+        self.file_path = file_path
+
+    def record(self) -> Any:
+        raise NotImplementedError
+
+def _handlers_for(node_type: type, visitors: Sequence[JavaNodeVisitor]) -> List[Callable]:
+    handlers = []
+    for visitor in visitors:
+        for cls in node_type.__mro__:
+            handler = getattr(visitor, f"visit_{cls.__name__}", None)
+            if handler is not None:
+                handlers.append(handler)
+                break
+    return handlers
+
+def walk_compilation_unit(tree: javalang.tree.CompilationUnit, visitors: Sequence[JavaNodeVisitor]) -> Dict[JavaNodeVisitor, Exception]:
+    """Walk the tree once, in the same pre-order as iterating it, calling every visitor's handlers.
+
+    A visitor whose handler raises is dropped from the rest of the walk;
+    the failed visitors are returned with their exception. Timeouts are
+    not caught.
+    """
+    active = list(visitors)
+    failed: Dict[JavaNodeVisitor, Exception] = {}
+    dispatch: Dict[type, List[Callable]] = {}
+    stack: List[Any] = [tree]
+
+    while stack:
+        item = stack.pop()
+        if isinstance(item, javalang.ast.Node):
+            node_type = type(item)
+            handlers = dispatch.get(node_type)
+            if handlers is None:
+                handlers = dispatch[node_type] = _handlers_for(node_type, active)
+            dropped = False
+            for handler in handlers:
+                try:
+                    handler(item)
+                except TimeoutError:
+                    raise
+                except Exception as e:
+                    visitor = handler.__self__
+                    failed[visitor] = e
+                    active.remove(visitor)
+                    dropped = True
+            if dropped:
+                # Dispatch again without the failed visitors
+                dispatch = {}
+            children = item.children
+        else:
+            children = item
+
+        # Push in reverse so children are visited first to last
+        for child in reversed(children):
+            if isinstance(child, (javalang.ast.Node, list, tuple)):
+                stack.append(child)
+
+    return failed
+
+def collect_with_visitor(file_path: str, tree: javalang.tree.CompilationUnit, visitor_class: Type[JavaNodeVisitor]) -> Any:
+    """Run one visitor over a tree and return its record, raising its error if it failed"""
+    visitor = visitor_class(file_path)
+    failed = walk_compilation_unit(tree, [visitor])
+    if visitor in failed:
+        raise failed[visitor]
+    return visitor.record()
@@ -0,0 +1,253 @@
+import heapq
+import json
+import os
+import threading
+import time
+from typing import Any, Dict, List, Optional, Tuple
+
+METRICS_PATH = os.getenv("EXTRACTION_METRICS", "extraction_metrics.json")
+PROMETHEUS_PATH = os.getenv("EXTRACTION_METRICS_PROM", "")
+SLOWEST_FILES = int(os.getenv("EXTRACTION_SLOWEST_FILES", "10"))
+
+# Upper bounds (seconds) of the graph query latency histogram buckets
+LATENCY_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+PROMETHEUS_PREFIX = "code_migrator_extraction"
+
+class LatencyHistogram:
+    """Count, sum and bucketed distribution of durations, Prometheus style"""
+
+    def __init__(self, buckets: Tuple[float, ...] = LATENCY_BUCKETS):
+        self.buckets = buckets
+        self.counts = [0] * len(buckets)
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+
+    def observe(self, seconds: float):
+        self.count += 1
+        self.total += seconds
+        self.max = max(self.max, seconds)
+        for i, bound in enumerate(self.buckets):
+            if seconds <= bound:
+                self.counts[i] += 1
+                break
+
+    def cumulative(self) -> List[Tuple[float, int]]:
+        running = 0
+        result = []
+        for bound, count in zip(self.buckets, self.counts):
+            running += count
+            result.append((bound, running))
+        return result
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "count": self.count,
+            "sum_seconds": round(self.total, 6),
+            "mean_seconds": round(self.total / self.count, 6) if self.count else 0.0,
+            "max_seconds": round(self.max, 6),
+            "buckets": {str(bound): count for bound, count in self.cumulative()}
+        }
+
+class ExtractionMetrics:
+    """Timings and counters of one extraction run.
+
+    Stages are timed back to back: `stage(name)` ends the running stage
+    and starts the next, recording wall and CPU time of this process
+    (Java parsing in worker processes shows up as per-file parse time
+    instead). Graph stores and the async sink report every write
+    transaction to `observe_write`, which also counts the rows written
+    per node label or relationship type, and every named read to
+    `observe_query`.
+    Only the `top_n` slowest files of each kind are kept.
+
+    Observations may come from the async writer thread, so they are
+    guarded by a lock.
+    """
+
+    def __init__(self, top_n: Optional[int] = None):
+        self.top_n = SLOWEST_FILES if top_n is None else top_n
+        self.lock = threading.Lock()
+        self.started = time.time()
+        self.start_wall = time.perf_counter()
+        self.start_cpu = time.process_time()
+        self.stages: Dict[str, Dict[str, float]] = {}
+        self.current: Optional[Tuple[str, float, float]] = None
+        self.files: Dict[str, Dict[str, Any]] = {}
+        self.slowest: Dict[str, List[Tuple[float, str]]] = {}
+        self.queries: Dict[Tuple[str, str], LatencyHistogram] = {}
+        self.query_failures: Dict[Tuple[str, str], int] = {}
+        self.rows: Dict[str, int] = {}
+        self.info: Dict[str, Any] = {}
+        self.finished: Optional[Tuple[float, float]] = None
+
+    # Stages
+
+    def stage(self, name: str):
+        """End the running stage, if any, and start timing `name`"""
+        self.end_stage()
+        self.current = (name, time.perf_counter(), time.process_time())
+
+    def end_stage(self):
+        if self.current is None:
+            return
+        name, wall, cpu = self.current
+        self.current = None
+        totals = self.stages.setdefault(name, {"wall_seconds": 0.0, "cpu_seconds": 0.0})
+        totals["wall_seconds"] += time.perf_counter() - wall
+        totals["cpu_seconds"] += time.process_time() - cpu
+
+    def finish(self):
+        """End the last stage and fix the run's total wall and CPU time"""
+        self.end_stage()
+        if self.finished is None:
+            self.finished = (time.perf_counter() - self.start_wall, time.process_time() - self.start_cpu)
+
+    # Observations
+
+    def file_parsed(self, kind: str, file_path: str, seconds: float, ok: bool = True):
+        with self.lock:
+            totals = self.files.setdefault(kind, {"files": 0, "failed": 0, "seconds": 0.0})
+            totals["files"] += 1
+            totals["failed"] += 0 if ok else 1
+            totals["seconds"] += seconds
+            heap = self.slowest.setdefault(kind, [])
+            if len(heap) < self.top_n:
+                heapq.heappush(heap, (seconds, file_path))
+            elif self.top_n and seconds > heap[0][0]:
+                heapq.heapreplace(heap, (seconds, file_path))
+
+    def observe_query(self, kind: str, name: str, seconds: float, ok: bool = True):
+        """Record one graph transaction ("write") or named read ("read")"""
+        with self.lock:
+            key = (kind, name)
+            if key not in self.queries:
+                self.queries[key] = LatencyHistogram()
+            self.queries[key].observe(seconds)
+            if not ok:
+                self.query_failures[key] = self.query_failures.get(key, 0) + 1
+
+    def observe_write(self, batches: List[Tuple[tuple, List]], seconds: float, ok: bool = True):
+        """Record a write transaction of BatchGraphWriter batches and, if it succeeded, its rows per label"""
+        self.observe_query("write", "batch", seconds, ok)
+        if not ok:
+            return
+        with self.lock:
+            for group, rows in batches:
+                label = write_group_label(group)
+                self.rows[label] = self.rows.get(label, 0) + len(rows)
+
+    def set_info(self, name: str, value: Any):
+        """Attach other statistics (e.g. cache or writer stats) to the report"""
+        self.info[name] = value
+
+    # Reports
+
+    def report(self) -> Dict[str, Any]:
+        wall, cpu = self.finished or (time.perf_counter() - self.start_wall, time.process_time() - self.start_cpu)
+        with self.lock:
+            return {
+                "started": self.started,
+                "wall_seconds": round(wall, 3),
+                "cpu_seconds": round(cpu, 3),
+                "stages": {name: {key: round(value, 3) for key, value in totals.items()}
+                           for name, totals in self.stages.items()},
+                "files": {kind: dict(totals, seconds=round(totals["seconds"], 3), slowest=[
+                    {"path": file_path, "seconds": round(seconds, 4)}
+                    for seconds, file_path in sorted(self.slowest.get(kind, []), reverse=True)
+                ]) for kind, totals in self.files.items()},
+                "graph_queries": [dict(kind=kind, name=name, failed=self.query_failures.get((kind, name), 0),
+                                       **histogram.to_dict())
+                                  for (kind, name), histogram in self.queries.items()],
+                "rows_written": dict(sorted(self.rows.items())),
+                "info": self.info
+            }
+
+    def summary(self) -> str:
+        report = self.report()
+        stages = ", ".join(f"{name} {totals['wall_seconds']}s" for name, totals in report["stages"].items())
+        queries = sum(query["count"] for query in report["graph_queries"])
+        return f"{report['wall_seconds']}s wall, {report['cpu_seconds']}s CPU ({stages}); {queries} graph queries"
+
+    def write_json(self, path: str):
+        _write_atomically(path, json.dumps(self.report(), indent=2))
+
+    def prometheus_lines(self) -> List[str]:
+        report = self.report()
+        prefix = PROMETHEUS_PREFIX
+        lines = [
+            f"# HELP {prefix}_run_timestamp_seconds Start time of the extraction run.",
+            f"# TYPE {prefix}_run_timestamp_seconds gauge",
+            f"{prefix}_run_timestamp_seconds {report['started']:.3f}",
+            f"# HELP {prefix}_run_seconds Wall and CPU time of the extraction run.",
+            f"# TYPE {prefix}_run_seconds gauge",
+            f'{prefix}_run_seconds{{clock="wall"}} {report["wall_seconds"]}',
+            f'{prefix}_run_seconds{{clock="cpu"}} {report["cpu_seconds"]}',
+            f"# HELP {prefix}_stage_seconds Wall and CPU time per extraction stage.",
+            f"# TYPE {prefix}_stage_seconds gauge",
+        ]
+        for name, totals in report["stages"].items():
+            lines.append(f'{prefix}_stage_seconds{{stage="{_escape(name)}",clock="wall"}} {totals["wall_seconds"]}')
+            lines.append(f'{prefix}_stage_seconds{{stage="{_escape(name)}",clock="cpu"}} {totals["cpu_seconds"]}')
+
+        lines += [
+            f"# HELP {prefix}_files_parsed Files parsed per kind, and how many failed.",
+            f"# TYPE {prefix}_files_parsed gauge",
+        ]
+        for kind, totals in report["files"].items():
+            lines.append(f'{prefix}_files_parsed{{kind="{_escape(kind)}",status="ok"}} {totals["files"] - totals["failed"]}')
+            lines.append(f'{prefix}_files_parsed{{kind="{_escape(kind)}",status="failed"}} {totals["failed"]}')
+        lines += [
+            f"# HELP {prefix}_parse_seconds Total parse time per kind of file.",
+            f"# TYPE {prefix}_parse_seconds gauge",
+        ]
+        lines += [f'{prefix}_parse_seconds{{kind="{_escape(kind)}"}} {totals["seconds"]}'
+                  for kind, totals in report["files"].items()]
+
+        lines += [
+            f"# HELP {prefix}_graph_query_seconds Latency of graph write transactions and named reads.",
+            f"# TYPE {prefix}_graph_query_seconds histogram",
+        ]
+        with self.lock:
+            queries = list(self.queries.items())
+        for (kind, name), histogram in queries:
+            labels = f'kind="{_escape(kind)}",name="{_escape(name)}"'
+            for bound, count in histogram.cumulative():
+                lines.append(f'{prefix}_graph_query_seconds_bucket{{{labels},le="{bound}"}} {count}')
+            lines.append(f'{prefix}_graph_query_seconds_bucket{{{labels},le="+Inf"}} {histogram.count}')
+            lines.append(f"{prefix}_graph_query_seconds_sum{{{labels}}} {histogram.total:.6f}")
+            lines.append(f"{prefix}_graph_query_seconds_count{{{labels}}} {histogram.count}")
+
+        lines += [
+            f"# HELP {prefix}_graph_rows_written Rows written per node label or relationship type.",
+            f"# TYPE {prefix}_graph_rows_written gauge",
+        ]
+        lines += [f'{prefix}_graph_rows_written{{label="{_escape(label)}"}} {count}'
+                  for label, count in report["rows_written"].items()]
+        return lines
+
+    def write_prometheus(self, path: str):
+        """Write the metrics in the Prometheus text format, e.g. for node exporter's textfile collector"""
+        _write_atomically(path, "\n".join(self.prometheus_lines()) + "\n")
+
+def write_group_label(group: tuple) -> str:
+    """Node label or relationship type a BatchGraphWriter group writes; deletes count as "-<label>" """
+    kind = group[0]
+    if kind == "edge":
+        return group[4]
+    if kind == "delete_edge":
+        return f"-{group[3]}"
+    if kind in ("delete_node", "strip_node"):
+        return f"-{group[1] or 'node'}"
+    return group[1] or "node"
+
+def _escape(value: str) -> str:
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+def _write_atomically(path: str, content: str):
+    # Collectors such as node exporter must never read a half-written file
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        f.write(content)
+    os.replace(tmp_path, path)
@@ -0,0 +1,176 @@
+import os
+from html.parser import HTMLParser
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+DEFAULT_PAGE_PARSER = os.getenv("FRONTEND_PARSER", "stdlib")
+
+FIELD_TAGS = ('input', 'select', 'textarea')
+
+# Elements that never have content; they are closed as soon as they open
+VOID_TAGS = frozenset((
+    'area', 'base', 'br', 'col', 'embed', 'hr', 'img', 'input', 'keygen', 'link',
+    'menuitem', 'meta', 'param', 'source', 'track', 'wbr'
+))
+
+class PageCollector:
+    """Collects the forms, fields, templates and resources of a page from start/end tag events.
+
+    Any parser backend that reports tags in document order can drive it,
+    so a page is read in a single streaming pass without building a tree.
+    Open elements are tracked like BeautifulSoup does: an end tag closes
+    the most recent open element with that name and everything opened
+    inside it, and a field belongs to every form that is open around it.
+    """
+
+    def __init__(self):
+        self.stack: List[Tuple[str, Optional[Dict]]] = []
+        self.forms: List[Dict] = []
+        self.templates: List[str] = []
+        self.resources: Dict[str, List[Tuple[str, str]]] = {'css': [], 'javascript': [], 'image': []}
+
+    def start(self, tag: str, attrs: Dict[str, str]):
+        form = None
+        if tag == 'form':
+            form = {
+                "id": attrs.get('id', 'unnamed_form'),
+                "action": attrs.get('action', ''),
+                "method": attrs.get('method', 'get'),
+                "fields": []
+            }
+            self.forms.append(form)
+        elif tag in FIELD_TAGS and attrs.get('name'):
+            for _, open_form in self.stack:
+                if open_form is not None:
+                    open_form["fields"].append(self._field(tag, attrs))
+
+        # Template relationships
+        if attrs.get('template'):
+            self.templates.append(attrs['template'])
+
+        # Resource dependencies
+        if tag == 'link' and 'stylesheet' in attrs.get('rel', '').split() and attrs.get('href'):
+            self.resources['css'].append(('css', attrs['href']))
+        elif tag == 'script' and attrs.get('src'):
+            self.resources['javascript'].append(('javascript', attrs['src']))
+        elif tag == 'img' and attrs.get('src'):
+            self.resources['image'].append(('image', attrs['src']))
+
+        if tag not in VOID_TAGS:
+            self.stack.append((tag, form))
+
+    def end(self, tag: str):
+        for i in range(len(self.stack) - 1, -1, -1):
+            if self.stack[i][0] == tag:
+                del self.stack[i:]
+                return
+
+    @staticmethod
+    def _field(tag: str, attrs: Dict[str, str]) -> Dict[str, Any]:
+        return {
+            "name": attrs['name'],
+            "type": attrs.get('type', tag),
+            "validation": {
+                'required': 'required' in attrs,
+                'pattern': attrs.get('pattern'),
+                'minlength': attrs.get('minlength'),
+                'maxlength': attrs.get('maxlength')
+            }
+        }
+
+    def record(self) -> Dict[str, List]:
+        return {
+            "forms": self.forms,
+            "templates": self.templates,
+            # Grouped by type, stylesheets first, like the page record always was
+            "resources": self.resources['css'] + self.resources['javascript'] + self.resources['image']
+        }
+
+class _EventParser(HTMLParser):
+    """html.parser tokenizer feeding tag events straight to a collector"""
+
+    def __init__(self, collector: PageCollector):
+        super().__init__(convert_charrefs=True)
+        self.collector = collector
+
+    def handle_starttag(self, tag, attrs):
+        # Valueless attributes (e.g. `required`) read as empty strings
+        self.collector.start(tag, {name: '' if value is None else value for name, value in attrs})
+
+    def handle_endtag(self, tag):
+        self.collector.end(tag)
+
+def _parse_stdlib(content: str, collector: PageCollector):
+    parser = _EventParser(collector)
+    parser.feed(content)
+    parser.close()
+
+class _LxmlTarget:
+    """lxml parser target forwarding tag events to a collector"""
+
+    def __init__(self, collector: PageCollector):
+        self.collector = collector
+
+    def start(self, tag, attrib):
+        self.collector.start(tag, dict(attrib))
+
+    def end(self, tag):
+        self.collector.end(tag)
+
+    def data(self, data):
+        pass
+
+    def close(self):
+        return None
+
+def _parse_lxml(content: str, collector: PageCollector):
+    from lxml import etree
+
+    # libxml2's HTML parser applies HTML's implied end tags, so malformed
+    # markup (e.g. nested forms) can be grouped differently than stdlib
+    parser = etree.HTMLParser(target=_LxmlTarget(collector))
+    parser.feed(content)
+    parser.close()
+
+def _parse_bs4(content: str, collector: PageCollector):
+    from bs4 import BeautifulSoup, Tag
+
+    # Builds the full tree first; kept as the reference backend
+    soup = BeautifulSoup(content, 'html.parser')
+    stack = [(child, False) for child in reversed(soup.contents)]
+    while stack:
+        element, closing = stack.pop()
+        if closing:
+            collector.end(element.name)
+            continue
+        if not isinstance(element, Tag):
+            continue
+        attrs = {name: ' '.join(value) if isinstance(value, list) else value for name, value in element.attrs.items()}
+        collector.start(element.name, attrs)
+        stack.append((element, True))
+        stack.extend((child, False) for child in reversed(element.contents))
+
+PAGE_PARSERS: Dict[str, Callable[[str, PageCollector], None]] = {
+    "stdlib": _parse_stdlib,
+    "lxml": _parse_lxml,
+    "bs4": _parse_bs4,
+}
+
+def available_parsers() -> List[str]:
+    """Backends whose parser library is installed"""
+    available = ["stdlib"]
+    for name, module in (("lxml", "lxml.etree"), ("bs4", "bs4")):
+        try:
+            __import__(module)
+            available.append(name)
+        except ImportError:
+            pass
+    return available
+
+def collect_page(content: str, parser: Optional[str] = None) -> Dict[str, List]:
+    """Collect a page record in one pass with the given backend (default: FRONTEND_PARSER)"""
+    parser = parser or DEFAULT_PAGE_PARSER
+    if parser not in PAGE_PARSERS:
+        raise ValueError(f"Unknown page parser '{parser}', expected one of {', '.join(PAGE_PARSERS)}")
+    collector = PageCollector()
+    PAGE_PARSERS[parser](content, collector)
+    return collector.record()
@@ -1,7 +1,8 @@
 import os
 import shutil
 import re
-from typing import Dict
+from typing import Dict, Optional
+from utils.ignore_rules import IgnoreRules, walk_tree
 
 def determine_file_type(file_path: str) -> str:
     """Determine the type of file based on path and content"""
@@ -30,7 +31,7 @@ def convert_path(path: str) -> str:
         return os.path.join('src/main/resources/templates', path.replace('webapp/', ''))
     return path
 
-def copy_static_resources(source_dir: str, target_dir: str) -> Dict[str, int]:
+def copy_static_resources(source_dir: str, target_dir: str, rules: Optional[IgnoreRules] = None) -> Dict[str, int]:
     stats = {
         'copied': 0,
         'failed': 0
@@ -41,7 +42,8 @@ def copy_static_resources(source_dir: str, target_dir: str) -> Dict[str, int]:
         '.svg', '.ico', '.woff', '.woff2', '.ttf', '.eot'
     }
     
-    for root, _, files in os.walk(source_dir):
+    # Ignored directories (build output, node_modules, ...) are never entered
+    for root, _, files in walk_tree(source_dir, rules):
         for file in files:
             if any(file.lower().endswith(ext) for ext in static_extensions):
                 source_path = os.path.join(root, file)
@@ -0,0 +1,138 @@
+import os
+from typing import Dict, List, NamedTuple, Optional, Set
+from utils.ignore_rules import IgnoreRules, IgnoreStats
+
+# File categories the extractors consume
+JAVA = "java"
+PERSISTENCE_XML = "persistence_xml"
+PAGE = "page"
+DOCUMENT = "document"
+STATIC = "static"
+
+CATEGORIES = (JAVA, PERSISTENCE_XML, PAGE, DOCUMENT, STATIC)
+
+STATIC_EXTENSIONS = (
+    '.css', '.js', '.jpg', '.jpeg', '.png', '.gif',
+    '.svg', '.ico', '.woff', '.woff2', '.ttf', '.eot'
+)
+
+class SourceFile(NamedTuple):
+    path: str
+    size: int
+    mtime: float
+
+def classify_file(file_name: str) -> Optional[str]:
+    """Return the manifest category of a file name, or None if no extractor uses it"""
+    if file_name.endswith('.java'):
+        return JAVA
+    if file_name == 'persistence.xml':
+        return PERSISTENCE_XML
+    if file_name.endswith(('.xhtml', '.html')):
+        return PAGE
+    if file_name.endswith(('.docx', '.md')):
+        return DOCUMENT
+    if file_name.lower().endswith(STATIC_EXTENSIONS):
+        return STATIC
+    return None
+
+class SourceManifest:
+    """Classified list of the files found in one walk of a source tree"""
+
+    def __init__(self, root: str):
+        self.root = root
+        self.files: Dict[str, List[SourceFile]] = {category: [] for category in CATEGORIES}
+        self.total_files = 0
+        self.ignored = IgnoreStats()
+
+    def add(self, category: str, source_file: SourceFile):
+        self.files[category].append(source_file)
+
+    @property
+    def java_files(self) -> List[SourceFile]:
+        return self.files[JAVA]
+
+    @property
+    def persistence_files(self) -> List[SourceFile]:
+        return self.files[PERSISTENCE_XML]
+
+    @property
+    def pages(self) -> List[SourceFile]:
+        return self.files[PAGE]
+
+    @property
+    def documents(self) -> List[SourceFile]:
+        return self.files[DOCUMENT]
+
+    @property
+    def static_assets(self) -> List[SourceFile]:
+        return self.files[STATIC]
+
+    def filtered(self, paths: Set[str]) -> "SourceManifest":
+        """A manifest holding only the given paths"""
+        manifest = SourceManifest(self.root)
+        manifest.total_files = len(paths)
+        for category, files in self.files.items():
+            manifest.files[category] = [f for f in files if f.path in paths]
+        return manifest
+
+    def summary(self) -> str:
+        counts = ", ".join(f"{len(self.files[category])} {category}" for category in CATEGORIES)
+        summary = f"{self.total_files} files scanned ({counts})"
+        if self.ignored.dirs or self.ignored.files:
+            summary += f"; ignored: {self.ignored.report()}"
+        return summary
+
+def scan_source_tree(directory: str, rules: Optional[IgnoreRules] = None) -> SourceManifest:
+    """Walk the source tree once and classify every file the extractors care about.
+
+    Directories matching the ignore rules (by default those of the tree's
+    .migratorignore plus build output and VCS directories) are pruned
+    without being entered; what they held is counted in `manifest.ignored`.
+    """
+    manifest = SourceManifest(directory)
+    if rules is None:
+        rules = IgnoreRules.for_root(directory)
+    pending = [(directory, "")]
+
+    while pending:
+        current, rel_dir = pending.pop()
+        try:
+            entries = list(os.scandir(current))
+        except OSError as e:
+            print(f"⚠️  Cannot read directory {current}: {str(e)}")
+            continue
+
+        subdirs = []
+        for entry in entries:
+            rel_path = f"{rel_dir}/{entry.name}" if rel_dir else entry.name
+            if entry.is_dir():
+                if rules.ignored(rel_path, is_dir=True):
+                    manifest.ignored.add_dir(entry.path)
+                # Like os.walk, symlinked directories are listed but not followed
+                elif not entry.is_symlink():
+                    subdirs.append((entry.path, rel_path))
+                continue
+
+            if rules.ignored(rel_path):
+                try:
+                    manifest.ignored.add_file(entry.stat().st_size)
+                except OSError:
+                    manifest.ignored.add_file(0)
+                continue
+
+            manifest.total_files += 1
+            category = classify_file(entry.name)
+            if not category:
+                continue
+
+            try:
+                stat = entry.stat()
+            except OSError as e:
+                print(f"⚠️  Cannot stat {entry.path}: {str(e)}")
+                continue
+            manifest.add(category, SourceFile(entry.path, stat.st_size, stat.st_mtime))
+
+        # Keep a top-down, depth-first order like os.walk
+        pending.extend(reversed(subdirs))
+
+    return manifest
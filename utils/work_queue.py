@@ -0,0 +1,144 @@
+import json
+import os
+import sqlite3
+import time
+from contextlib import contextmanager
+from typing import Any, Dict, List, Optional, Tuple
+
+QUEUE_PATH = os.getenv("EXTRACTION_QUEUE", "extraction_queue.db")
+# Seconds a worker may hold a task before another worker may take it over
+LEASE_SECONDS = float(os.getenv("EXTRACTION_SHARD_LEASE", "1800"))
+# Times a task is handed out before it is marked failed
+MAX_ATTEMPTS = int(os.getenv("EXTRACTION_SHARD_ATTEMPTS", "3"))
+
+PENDING = "pending"
+RUNNING = "running"
+DONE = "done"
+FAILED = "failed"
+
+class WorkQueue:
+    """Tasks in a SQLite file that any number of worker processes take one at a time.
+
+    Workers on other hosts share the queue through a shared file system.
+    A task is leased to the worker that claims it; if the worker dies,
+    the lease runs out and the next claim hands the task to another
+    worker, up to `max_attempts` times. Each call opens its own
+    connection, so a queue is safe to use from any process or thread.
+    """
+
+    def __init__(self, path: str = QUEUE_PATH, lease_seconds: float = LEASE_SECONDS,
+                 max_attempts: int = MAX_ATTEMPTS):
+        self.path = path
+        self.lease_seconds = lease_seconds
+        self.max_attempts = max_attempts
+        with self._transaction() as conn:
+            conn.execute("CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT NOT NULL)")
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS tasks (
+                    id INTEGER PRIMARY KEY,
+                    payload TEXT NOT NULL,
+                    status TEXT NOT NULL,
+                    worker TEXT,
+                    attempts INTEGER NOT NULL DEFAULT 0,
+                    leased_until REAL,
+                    result TEXT,
+                    error TEXT
+                )
+            """)
+
+    @contextmanager
+    def _transaction(self):
+        # BEGIN IMMEDIATE takes the write lock up front, so two workers
+        # never claim the same task
+        conn = sqlite3.connect(self.path, timeout=60, isolation_level=None)
+        try:
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                yield conn
+            except BaseException:
+                conn.execute("ROLLBACK")
+                raise
+            conn.execute("COMMIT")
+        finally:
+            conn.close()
+
+    def reset(self, payloads: List[Any], meta: Optional[Dict[str, Any]] = None):
+        """Replace every task and the queue's metadata"""
+        with self._transaction() as conn:
+            conn.execute("DELETE FROM tasks")
+            conn.execute("DELETE FROM meta")
+            conn.executemany("INSERT INTO tasks (id, payload, status) VALUES (?, ?, ?)",
+                             [(task_id, json.dumps(payload), PENDING) for task_id, payload in enumerate(payloads)])
+            conn.executemany("INSERT INTO meta (key, value) VALUES (?, ?)",
+                             [(key, json.dumps(value)) for key, value in (meta or {}).items()])
+
+    def meta(self) -> Dict[str, Any]:
+        with self._transaction() as conn:
+            return {key: json.loads(value) for key, value in conn.execute("SELECT key, value FROM meta")}
+
+    def claim(self, worker: str) -> Optional[Tuple[int, Any]]:
+        """Lease the next pending task, or one whose lease ran out, to a worker; None when there is none"""
+        now = time.time()
+        with self._transaction() as conn:
+            # Tasks of workers that died without reporting are given up or retried
+            conn.execute(
+                "UPDATE tasks SET status = ?, error = 'lease expired' "
+                "WHERE status = ? AND leased_until < ? AND attempts >= ?",
+                (FAILED, RUNNING, now, self.max_attempts)
+            )
+            row = conn.execute(
+                "SELECT id, payload FROM tasks WHERE status = ? OR (status = ? AND leased_until < ?) "
+                "ORDER BY attempts, id LIMIT 1",
+                (PENDING, RUNNING, now)
+            ).fetchone()
+            if row is None:
+                return None
+            task_id, payload = row
+            conn.execute(
+                "UPDATE tasks SET status = ?, worker = ?, attempts = attempts + 1, leased_until = ? WHERE id = ?",
+                (RUNNING, worker, now + self.lease_seconds, task_id)
+            )
+        return task_id, json.loads(payload)
+
+    def complete(self, task_id: int, result: Any):
+        """Record a task's result. A task finished twice, after its lease ran out, keeps the first result."""
+        with self._transaction() as conn:
+            conn.execute("UPDATE tasks SET status = ?, result = ?, error = NULL WHERE id = ? AND status != ?",
+                         (DONE, json.dumps(result), task_id, DONE))
+
+    def fail(self, task_id: int, worker: str, error: str):
+        """Return a worker's task to the queue, or mark it failed once it used up its attempts"""
+        with self._transaction() as conn:
+            conn.execute(
+                "UPDATE tasks SET status = CASE WHEN attempts >= ? THEN ? ELSE ? END, "
+                "error = ?, leased_until = NULL WHERE id = ? AND status = ? AND worker = ?",
+                (self.max_attempts, FAILED, PENDING, error, task_id, RUNNING, worker)
+            )
+
+    def tasks(self) -> List[Dict[str, Any]]:
+        """Every task with its status, worker, attempts, result and error"""
+        with self._transaction() as conn:
+            rows = conn.execute(
+                "SELECT id, status, worker, attempts, result, error FROM tasks ORDER BY id"
+            ).fetchall()
+        return [
+            {
+                "id": task_id,
+                "status": status,
+                "worker": worker,
+                "attempts": attempts,
+                "result": json.loads(result) if result else None,
+                "error": error
+            }
+            for task_id, status, worker, attempts, result, error in rows
+        ]
+
+    def counts(self) -> Dict[str, int]:
+        counts = {PENDING: 0, RUNNING: 0, DONE: 0, FAILED: 0}
+        with self._transaction() as conn:
+            for status, count in conn.execute("SELECT status, COUNT(*) FROM tasks GROUP BY status"):
+                counts[status] = count
+        return counts
+
+    def report(self) -> str:
+        return ", ".join(f"{count} {status}" for status, count in self.counts().items())